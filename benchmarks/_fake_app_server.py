@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Minimal loopback app-server used by benchmarks.
+
+Speaks newline-delimited JSON-RPC over stdin/stdout and answers every request
+immediately with an empty result (or a small canned result for the methods
+the client inspects). Replies are written in batches: all requests that are
+already readable are answered with one write.
+
+`bench/stream` with `{"count": N, "turnId": ...}` first emits N
+`item/completed` notifications for that turn, then its response.
+
+`FAKE_APP_SERVER_REPLY_DELAY_MS` delays every batch of replies, standing in
+for server-side latency.
+
+Usage:
+    python benchmarks/_fake_app_server.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from typing import Any
+
+_turn_counter = 0
+
+
+def _result_for(method: str) -> dict[str, Any]:
+    global _turn_counter
+    if method == "initialize":
+        return {"userAgent": "fake-app-server/0.0.0"}
+    if method in {"thread/start", "thread/resume", "thread/fork"}:
+        return {"thread": {"id": "thread-1"}}
+    if method == "turn/start":
+        _turn_counter += 1
+        return {"turn": {"id": f"turn-{_turn_counter}", "status": "inProgress"}}
+    return {}
+
+
+_STREAM_EVENT = (
+    b'{"jsonrpc":"2.0","method":"item/completed","params":{"threadId":"thread-1",'
+    b'"turnId":"%s","item":{"id":"cmd-%d","type":"commandExecution","command":"ls"}}}\n'
+)
+
+
+def _stream(params: dict[str, Any]) -> list[bytes]:
+    turn_id = str(params.get("turnId", "turn-1")).encode()
+    return [_STREAM_EVENT % (turn_id, seq) for seq in range(int(params.get("count", 0)))]
+
+
+def main() -> None:
+    reply_delay = float(os.environ.get("FAKE_APP_SERVER_REPLY_DELAY_MS", "0")) / 1e3
+    stdin = sys.stdin.buffer.raw  # type: ignore[attr-defined]
+    stdout = sys.stdout.buffer
+    pending = bytearray()
+    while True:
+        chunk = os.read(stdin.fileno(), 1 << 20)
+        if not chunk:
+            return
+        pending += chunk
+        *lines, rest = pending.split(b"\n")
+        pending = bytearray(rest)
+        replies: list[bytes] = []
+        for line in lines:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if "method" not in message or message.get("id") is None:
+                continue
+            if message["method"] == "bench/stream":
+                replies.extend(_stream(message.get("params") or {}))
+            result = _result_for(message["method"])
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": result}
+            replies.append(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+        if replies:
+            if reply_delay:
+                time.sleep(reply_delay)
+            stdout.write(b"".join(replies))
+            stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
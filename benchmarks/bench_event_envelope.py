@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Count allocations spent turning 10k `item/completed` events into turn state.
+
+Each event goes through the receiver-side path: envelope construction, routing
+into the turn mailbox, and application to the turn session (agent-message
+tracking plus `ConversationStep` extraction). The script reports allocated
+blocks and bytes per 10k events as seen by `tracemalloc`, and wall time.
+
+Usage:
+    python benchmarks/bench_event_envelope.py [--events 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Mapping
+from typing import Any
+
+from codex_app_server_sdk.client import CodexClient, _TurnSession
+from codex_app_server_sdk.transport import Transport
+
+
+class _NullTransport(Transport):
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        return None
+
+    async def recv(self) -> dict[str, Any]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+def _events(count: int) -> list[dict[str, Any]]:
+    output = "x" * 4096
+    events: list[dict[str, Any]] = []
+    for seq in range(count):
+        if seq % 2:
+            item: dict[str, Any] = {
+                "id": f"cmd-{seq}",
+                "type": "commandExecution",
+                "command": "pytest -q",
+                "aggregatedOutput": output,
+                "exitCode": 0,
+            }
+        else:
+            item = {"id": f"msg-{seq}", "type": "agentMessage", "text": "partial answer"}
+        events.append(
+            {
+                "jsonrpc": "2.0",
+                "method": "item/completed",
+                "params": {"threadId": "thread-1", "turnId": "turn-1", "item": item},
+            }
+        )
+    return events
+
+
+def _process(client: CodexClient, session: _TurnSession, events: list[dict[str, Any]]) -> None:
+    for event in events:
+        client._route_notification(client._make_envelope(event, "item/completed"))
+        client._apply_event_to_session(session, session.mailbox.get_nowait())
+
+
+def main(count: int) -> None:
+    client = CodexClient(_NullTransport())
+    events = _events(count)
+
+    session = _TurnSession(thread_id="thread-1", turn_id="turn-1")
+    client._register_turn_session(session)
+    started = time.perf_counter()
+    _process(client, session, events)
+    elapsed = time.perf_counter() - started
+
+    session = _TurnSession(thread_id="thread-1", turn_id="turn-2")
+    client._turn_sessions.clear()
+    client._register_turn_session(session)
+    for event in events:
+        event["params"]["turnId"] = "turn-2"
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    _process(client, session, events)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    scale = 10_000 / count
+    print(f"events:             {count}")
+    print(f"retained blocks/10k {blocks * scale:,.0f}")
+    print(f"retained KiB/10k    {size * scale / 1024:,.1f}")
+    print(f"peak traced KiB     {peak / 1024:,.1f}")
+    print(f"us/event            {elapsed / count * 1e6:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=10_000)
+    args = parser.parse_args()
+    main(args.events)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Compare JSON codec backends on representative app-server payloads.
+
+Payloads mirror recorded traffic shapes: a high-rate `item/completed` stream
+(reasoning, command output, agent messages) and one large `thread/read`
+response with `includeTurns=true`. Codecs that are not installed are skipped.
+
+Usage:
+    python benchmarks/bench_json_codecs.py [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from codex_app_server_sdk.codec import (
+    JsonCodec,
+    MsgspecJsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+)
+
+
+def _item_completed(seq: int) -> dict[str, Any]:
+    kind = seq % 3
+    if kind == 0:
+        item: dict[str, Any] = {
+            "id": f"rs_{seq}",
+            "type": "reasoning",
+            "summary": ["**Inspecting failing tests**"],
+            "content": [],
+        }
+    elif kind == 1:
+        item = {
+            "id": f"call_{seq}",
+            "type": "commandExecution",
+            "command": "/bin/bash -lc 'pytest -q tests/test_client.py'",
+            "cwd": "/home/dev/project",
+            "status": "completed",
+            "aggregatedOutput": "".join(f"tests/test_{n}.py::case PASSED\n" for n in range(120)),
+            "exitCode": 0,
+            "durationMs": 5321,
+            "commandActions": [{"type": "unknown", "command": "pytest -q"}],
+        }
+    else:
+        item = {
+            "id": f"msg_{seq}",
+            "type": "agentMessage",
+            "text": "All tests pass. The fix updates the parser to handle — and ✓ cases. " * 8,
+        }
+    return {
+        "jsonrpc": "2.0",
+        "method": "item/completed",
+        "params": {"threadId": "019a-thread", "turnId": f"019a-turn-{seq // 30}", "item": item},
+    }
+
+
+def _thread_read(turns: int) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": 42,
+        "result": {
+            "thread": {
+                "id": "019a-thread",
+                "preview": "Fix flaky tests",
+                "turns": [
+                    {
+                        "id": f"019a-turn-{turn}",
+                        "status": "completed",
+                        "items": [
+                            _item_completed(turn * 30 + seq)["params"]["item"] for seq in range(30)
+                        ],
+                    }
+                    for turn in range(turns)
+                ],
+            }
+        },
+    }
+
+
+def _available() -> list[JsonCodec]:
+    codecs: list[JsonCodec] = [StdlibJsonCodec()]
+    for codec_cls in (OrjsonCodec, MsgspecJsonCodec):
+        try:
+            codecs.append(codec_cls())
+        except ImportError:
+            print(f"skipping {codec_cls.__name__}: backend not installed")
+    return codecs
+
+
+def _encode_all(codec: JsonCodec, messages: list[dict[str, Any]]) -> None:
+    for message in messages:
+        codec.encode(message)
+
+
+def _decode_all(codec: JsonCodec, lines: list[bytes]) -> None:
+    for line in lines:
+        codec.decode(line)
+
+
+def _best_of(repeat: int, fn: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(repeat: int) -> None:
+    stream = [_item_completed(seq) for seq in range(3000)]
+    big = _thread_read(turns=200)
+    reference = StdlibJsonCodec()
+    stream_bytes = [reference.encode(message) for message in stream]
+    big_bytes = reference.encode(big)
+    stream_mib = sum(len(line) for line in stream_bytes) / 2**20
+    print(f"item/completed stream: {len(stream)} messages, {stream_mib:.1f} MiB")
+    print(f"thread/read response:  {len(big_bytes) / 2**20:.1f} MiB")
+    print()
+    print(f"{'codec':<8} {'stream enc':>11} {'stream dec':>11} {'read enc':>10} {'read dec':>10}")
+
+    for codec in _available():
+        stream_enc = _best_of(repeat, partial(_encode_all, codec, stream))
+        stream_dec = _best_of(repeat, partial(_decode_all, codec, stream_bytes))
+        big_enc = _best_of(repeat, partial(codec.encode, big))
+        big_dec = _best_of(repeat, partial(codec.decode, big_bytes))
+        print(
+            f"{codec.name:<8} {stream_enc * 1e3:>9.1f}ms {stream_dec * 1e3:>9.1f}ms"
+            f" {big_enc * 1e3:>8.1f}ms {big_dec * 1e3:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.repeat)
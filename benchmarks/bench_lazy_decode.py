@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Compare eager vs lazy decoding of received messages in the client receiver.
+
+The workload mixes legacy `codex/event/*` deltas (ignored by default), large
+`thread/resume` responses whose result the client discards, and
+`item/completed` notifications for a live turn. "eager" decodes every message
+before dispatch; "lazy" is the receiver's raw path, which peeks at `id` and
+`method` first and skips the full parse when nobody consumes the payload.
+
+Usage:
+    python benchmarks/bench_lazy_decode.py [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from codex_app_server_sdk.client import CodexClient, _TurnSession
+from codex_app_server_sdk.codec import StdlibJsonCodec
+from codex_app_server_sdk.transport import Transport
+
+DELTAS = 20_000
+RESUMES = 50
+ITEMS = 5_000
+
+
+class _NullTransport(Transport):
+    codec = StdlibJsonCodec()
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        return None
+
+    async def recv(self) -> dict[str, Any]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+def _encode(message: dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode()
+
+
+def _workload() -> list[bytes]:
+    messages: list[bytes] = []
+    for seq in range(DELTAS):
+        messages.append(
+            _encode(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "codex/event/agent_message_content_delta",
+                    "params": {"id": "turn-1", "msg": {"delta": f"token {seq} "}},
+                }
+            )
+        )
+    history = {
+        "thread": {
+            "id": "thread-1",
+            "turns": [
+                {"id": f"t{n}", "items": [{"type": "agentMessage", "text": "x" * 400}] * 10}
+                for n in range(50)
+            ],
+        }
+    }
+    for request_id in range(1, RESUMES + 1):
+        messages.append(_encode({"jsonrpc": "2.0", "id": request_id, "result": history}))
+    for seq in range(ITEMS):
+        messages.append(
+            _encode(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "item/completed",
+                    "params": {
+                        "threadId": "thread-1",
+                        "turnId": "turn-1",
+                        "item": {"id": f"cmd-{seq}", "type": "commandExecution", "command": "ls"},
+                    },
+                }
+            )
+        )
+    return messages
+
+
+def _client() -> tuple[CodexClient, _TurnSession]:
+    client = CodexClient(_NullTransport())
+    loop = asyncio.get_running_loop()
+    for request_id in range(1, RESUMES + 1):
+        client._pending[request_id] = loop.create_future()
+        client._discarded_results.add(request_id)
+    session = _TurnSession(thread_id="thread-1", turn_id="turn-1")
+    client._register_turn_session(session)
+    return client, session
+
+
+async def _run_mode(mode: str, messages: list[bytes]) -> float:
+    client, _ = _client()
+    decode = client._transport.codec.decode
+    started = time.perf_counter()
+    if mode == "eager":
+        for data in messages:
+            client._dispatch_incoming(decode(data))
+    else:
+        for data in messages:
+            client._dispatch_raw(data)
+    return time.perf_counter() - started
+
+
+async def _main(repeat: int) -> None:
+    messages = _workload()
+    total_mib = sum(len(data) for data in messages) / 2**20
+    print(f"{len(messages)} messages, {total_mib:.1f} MiB")
+    print(f"{'mode':<6} {'best ms':>8}")
+    for mode in ("eager", "lazy"):
+        best = min([await _run_mode(mode, messages) for _ in range(repeat)])
+        print(f"{mode:<6} {best * 1e3:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_main(args.repeat))
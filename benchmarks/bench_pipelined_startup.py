@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Measure time from `start()` to a usable thread, sequential vs pipelined.
+
+Each sample spawns the fake app-server, calls `start()` and then
+`start_thread()`. Only the part after the fake server is up (answered one raw
+probe request) is timed. The fake
+server delays every reply batch by `--reply-delay-ms` to stand in for
+server-side latency. With `pipeline_startup=True` the `initialize` and
+`thread/start` requests share one round trip.
+
+Usage:
+    python benchmarks/bench_pipelined_startup.py [--samples 50] [--reply-delay-ms 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from codex_app_server_sdk import CodexClient, StdlibJsonCodec
+
+FAKE_SERVER = Path(__file__).with_name("_fake_app_server.py")
+COMMAND = [sys.executable, str(FAKE_SERVER)]
+
+
+async def _sample(pipeline_startup: bool) -> float:
+    client = CodexClient.connect_stdio(
+        command=COMMAND,
+        codec=StdlibJsonCodec(),
+        pipeline_startup=pipeline_startup,
+    )
+    transport = client._transport
+    await transport.connect()
+    await transport.send({"jsonrpc": "2.0", "id": 0, "method": "bench/ping"})
+    await transport.recv()
+    started = time.perf_counter()
+    await client.start()
+    await client.start_thread()
+    elapsed = time.perf_counter() - started
+    await client.close()
+    return elapsed
+
+
+def _report(name: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, round(0.99 * (len(ordered) - 1)))]
+    print(f"{name:<10} {len(samples):>7} {p50 * 1e3:>9.2f} {p99 * 1e3:>9.2f}")
+
+
+async def _main(samples: int) -> None:
+    print(f"{'mode':<10} {'samples':>7} {'p50 ms':>9} {'p99 ms':>9}")
+    _report("sequential", [await _sample(False) for _ in range(samples)])
+    _report("pipelined", [await _sample(True) for _ in range(samples)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--reply-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    os.environ["FAKE_APP_SERVER_REPLY_DELAY_MS"] = str(args.reply_delay_ms)
+    asyncio.run(_main(args.samples))
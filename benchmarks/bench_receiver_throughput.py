@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Measure receiver throughput (messages/sec) over stdio on a loopback server.
+
+The fake app-server writes a burst of `item/completed` notifications for one
+turn. The client routes each into the turn mailbox while a consumer drains it.
+Two modes are compared: one `recv()` per message (the `Transport` default) and
+`StdioTransport.recv_many()`, which returns every buffered line at once.
+
+Usage:
+    python benchmarks/bench_receiver_throughput.py [--messages 100000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from codex_app_server_sdk import CodexClient, StdlibJsonCodec
+from codex_app_server_sdk.client import _TurnSession
+from codex_app_server_sdk.transport import StdioTransport, Transport
+
+FAKE_SERVER = Path(__file__).with_name("_fake_app_server.py")
+
+
+class _SingleRecvStdioTransport(StdioTransport):
+    async def recv_many(self) -> list[dict[str, Any]]:
+        return await Transport.recv_many(self)
+
+
+async def _measure(transport: StdioTransport, count: int) -> float:
+    async with CodexClient(transport, request_timeout=300.0) as client:
+        await client.request("bench/stream", {"count": 10, "turnId": "warmup"})
+        session = _TurnSession(thread_id="thread-1", turn_id="turn-1")
+        client._register_turn_session(session)
+
+        async def _consume() -> None:
+            for _ in range(count):
+                await client._receive_turn_event(session, inactivity_timeout=None)
+
+        consumer = asyncio.create_task(_consume())
+        started = time.perf_counter()
+        await client.request("bench/stream", {"count": count, "turnId": "turn-1"})
+        await consumer
+        return time.perf_counter() - started
+
+
+async def _main(count: int, repeat: int) -> None:
+    command = [sys.executable, str(FAKE_SERVER)]
+    modes = {
+        "recv": lambda: _SingleRecvStdioTransport(command, codec=StdlibJsonCodec()),
+        "recv_many": lambda: StdioTransport(command, codec=StdlibJsonCodec()),
+    }
+    print(f"{'mode':<10} {'messages':>9} {'seconds':>8} {'msg/s':>10}")
+    for name, factory in modes.items():
+        for _ in range(repeat):
+            elapsed = await _measure(factory(), count)
+            print(f"{name:<10} {count:>9} {elapsed:>8.3f} {count / elapsed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(_main(args.messages, args.repeat))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Measure request throughput over stdio against a loopback fake app-server.
+
+Fires N small requests concurrently through one `CodexClient` and reports the
+wall time until every response has arrived, plus the number of stdin writes
+the transport performed.
+
+Usage:
+    python benchmarks/bench_request_throughput.py [--requests 10000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from codex_app_server_sdk import CodexClient, StdlibJsonCodec
+from codex_app_server_sdk.transport import StdioTransport
+
+FAKE_SERVER = Path(__file__).with_name("_fake_app_server.py")
+
+
+class _CountingStdioTransport(StdioTransport):
+    def __init__(self) -> None:
+        super().__init__([sys.executable, str(FAKE_SERVER)], codec=StdlibJsonCodec())
+        self.writes = 0
+
+    async def connect(self) -> None:
+        await super().connect()
+        assert self._proc is not None and self._proc.stdin is not None
+        stdin = self._proc.stdin
+        write = stdin.write
+
+        def _counting_write(data: bytes) -> None:
+            self.writes += 1
+            write(data)
+
+        stdin.write = _counting_write  # type: ignore[method-assign]
+
+
+async def _measure(count: int) -> tuple[float, int]:
+    transport = _CountingStdioTransport()
+    async with CodexClient(transport, request_timeout=120.0) as client:
+        await client.request("model/list")
+        transport.writes = 0
+        started = time.perf_counter()
+        await asyncio.gather(*(client.request("model/list") for _ in range(count)))
+        elapsed = time.perf_counter() - started
+    return elapsed, transport.writes
+
+
+async def _main(count: int, repeat: int) -> None:
+    print(f"{'requests':>8}  {'seconds':>8}  {'req/s':>9}  {'writes':>7}")
+    for _ in range(repeat):
+        elapsed, writes = await _measure(count)
+        print(f"{count:>8}  {elapsed:>8.3f}  {count / elapsed:>9,.0f}  {writes:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(_main(args.requests, args.repeat))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Measure time until a stdio client is ready for its first turn.
+
+"cold" is `connect_stdio(...)`, `start()` and `initialize()` against a freshly
+spawned fake app-server. "warm" is `connect_stdio(warm_pool=...)` plus
+`start()`, leasing a process from a `StdioWarmPool` that already completed
+the handshake. The pool is refilled between samples (not timed).
+
+Usage:
+    python benchmarks/bench_startup.py [--samples 100]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from codex_app_server_sdk import CodexClient, StdioWarmPool, StdlibJsonCodec
+
+FAKE_SERVER = Path(__file__).with_name("_fake_app_server.py")
+COMMAND = [sys.executable, str(FAKE_SERVER)]
+
+
+async def _cold_sample() -> float:
+    started = time.perf_counter()
+    client = CodexClient.connect_stdio(command=COMMAND, codec=StdlibJsonCodec())
+    await client.start()
+    await client.initialize()
+    elapsed = time.perf_counter() - started
+    await client.close()
+    return elapsed
+
+
+async def _warm_sample(pool: StdioWarmPool) -> float:
+    await pool.wait_ready()
+    started = time.perf_counter()
+    client = CodexClient.connect_stdio(warm_pool=pool)
+    await client.start()
+    elapsed = time.perf_counter() - started
+    assert client._initialized
+    await client.close()
+    return elapsed
+
+
+def _report(name: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, round(0.99 * (len(ordered) - 1)))]
+    print(f"{name:<5} {len(samples):>7} {p50 * 1e3:>9.3f} {p99 * 1e3:>9.3f}")
+
+
+async def _main(samples: int) -> None:
+    print(f"{'mode':<5} {'samples':>7} {'p50 ms':>9} {'p99 ms':>9}")
+    _report("cold", [await _cold_sample() for _ in range(samples)])
+    async with StdioWarmPool(2, command=COMMAND, codec=StdlibJsonCodec()) as pool:
+        _report("warm", [await _warm_sample(pool) for _ in range(samples)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(_main(args.samples))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Measure per-event notification routing cost against concurrent turn count.
+
+Each run registers N live turn sessions on one client, starts one waiter task
+per turn, and routes interleaved `item/completed` events through the same
+dispatch path used by the receiver loop. Per-event cost should stay flat as
+N grows because routing is a single dictionary lookup by turn id.
+
+Usage:
+    python benchmarks/bench_turn_routing.py [--events 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from codex_app_server_sdk.client import CodexClient, _TurnSession
+from codex_app_server_sdk.transport import Transport
+
+TURN_COUNTS = (1, 10, 50, 100, 250, 500)
+
+
+class _NullTransport(Transport):
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        return None
+
+    async def recv(self) -> dict[str, Any]:
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    async def close(self) -> None:
+        return None
+
+
+def _item_completed(turn_id: str, seq: int) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "item/completed",
+        "params": {
+            "threadId": "thread-1",
+            "turnId": turn_id,
+            "item": {"id": f"item-{seq}", "type": "commandExecution", "command": "ls"},
+        },
+    }
+
+
+async def _measure(turn_count: int, total_events: int) -> float:
+    client = CodexClient(_NullTransport())
+    sessions = [
+        _TurnSession(thread_id="thread-1", turn_id=f"turn-{idx}") for idx in range(turn_count)
+    ]
+    for session in sessions:
+        client._register_turn_session(session)
+
+    per_turn = max(1, total_events // turn_count)
+    events = [
+        _item_completed(sessions[seq % turn_count].turn_id, seq)
+        for seq in range(per_turn * turn_count)
+    ]
+
+    async def _waiter(session: _TurnSession) -> None:
+        for _ in range(per_turn):
+            await client._receive_turn_event(session, inactivity_timeout=None)
+
+    waiters = [asyncio.create_task(_waiter(session)) for session in sessions]
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    for event in events:
+        client._route_notification(client._make_envelope(event, "item/completed"))
+    await asyncio.gather(*waiters)
+    elapsed = time.perf_counter() - started
+    return elapsed / len(events)
+
+
+async def _main(total_events: int) -> None:
+    print(f"{'turns':>6}  {'events':>7}  {'us/event':>9}")
+    for turn_count in TURN_COUNTS:
+        per_event = await _measure(turn_count, total_events)
+        print(f"{turn_count:>6}  {total_events:>7}  {per_event * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(_main(args.events))
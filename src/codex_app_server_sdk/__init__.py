@@ -1,4 +1,17 @@
-from .client import CodexClient, ThreadHandle
+from .client import CodexClient, QueuedTurn, ThreadHandle
+from .codec import (
+    JsonCodec,
+    MsgspecJsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    default_codec,
+)
+from .command_output import (
+    CommandOutputHost,
+    CommandOutputMonitor,
+    CommandOutputSink,
+    CommandOutputStream,
+)
 from .errors import (
     CodexError,
     CodexProtocolError,
@@ -7,52 +20,112 @@ from .errors import (
     CodexTurnInactiveError,
 )
 from .models import (
-    ApprovalRequest,
+    UNSET,
+    AgentMessageDelta,
+    AimdStats,
     ApprovalPolicy,
+    ApprovalRequest,
     CancelResult,
+    ChatBatchItem,
     ChatContinuation,
+    ChatRequest,
     ChatResult,
+    ClientStats,
     CommandApprovalDecision,
     CommandApprovalRequest,
     CommandApprovalWithExecpolicyAmendment,
+    CommandOutputOverflow,
+    CommandOutputStats,
     ConversationStep,
     FileChangeApprovalDecision,
     FileChangeApprovalRequest,
     InitializeResult,
-    SandboxMode,
-    SandboxPolicy,
+    OrphanDropReason,
     ReasoningEffort,
     ReasoningSummary,
+    SandboxMode,
+    SandboxPolicy,
+    SendLane,
+    SendLaneStats,
+    StructuredOutputItem,
     ThreadConfig,
+    ThreadPrefetchStats,
+    ThreadTemplate,
+    TurnEnded,
     TurnOverrides,
-    UNSET,
+    TurnPriority,
+    TurnSample,
+    TurnSchedule,
+    TurnSchedulerStats,
 )
+from .pool import CodexClientPool
+from .prefetch import ThreadPrefetcher, ThreadPrefetchHost
+from .scheduling import AimdController, TurnAdmission, TurnScheduler
+from .structured import StructuredOutputParser
+from .warm_pool import StdioWarmPool, WarmLease
 
 __all__ = [
-    "CancelResult",
-    "ApprovalRequest",
+    "UNSET",
+    "AgentMessageDelta",
+    "AimdController",
+    "AimdStats",
     "ApprovalPolicy",
+    "ApprovalRequest",
+    "CancelResult",
+    "ChatBatchItem",
     "ChatContinuation",
+    "ChatRequest",
     "ChatResult",
-    "CommandApprovalDecision",
-    "CommandApprovalRequest",
-    "CommandApprovalWithExecpolicyAmendment",
+    "ClientStats",
     "CodexClient",
+    "CodexClientPool",
     "CodexError",
     "CodexProtocolError",
     "CodexTimeoutError",
     "CodexTransportError",
     "CodexTurnInactiveError",
+    "CommandApprovalDecision",
+    "CommandApprovalRequest",
+    "CommandApprovalWithExecpolicyAmendment",
+    "CommandOutputHost",
+    "CommandOutputMonitor",
+    "CommandOutputOverflow",
+    "CommandOutputSink",
+    "CommandOutputStats",
+    "CommandOutputStream",
     "ConversationStep",
     "FileChangeApprovalDecision",
     "FileChangeApprovalRequest",
     "InitializeResult",
-    "SandboxMode",
-    "SandboxPolicy",
+    "JsonCodec",
+    "MsgspecJsonCodec",
+    "OrjsonCodec",
+    "OrphanDropReason",
+    "QueuedTurn",
     "ReasoningEffort",
     "ReasoningSummary",
+    "SandboxMode",
+    "SandboxPolicy",
+    "SendLane",
+    "SendLaneStats",
+    "StdioWarmPool",
+    "StdlibJsonCodec",
+    "StructuredOutputItem",
+    "StructuredOutputParser",
     "ThreadConfig",
     "ThreadHandle",
+    "ThreadPrefetchHost",
+    "ThreadPrefetchStats",
+    "ThreadPrefetcher",
+    "ThreadTemplate",
+    "TurnAdmission",
+    "TurnEnded",
     "TurnOverrides",
-    "UNSET",
+    "TurnPriority",
+    "TurnSample",
+    "TurnSchedule",
+    "TurnScheduler",
+    "TurnSchedulerStats",
+    "WarmLease",
+    "default_codec",
 ]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class _EventEnvelope:
+    """Normalized view of one incoming notification, built once by the receiver.
+
+    `raw` is the decoded message itself; `params` and `item` reference into it
+    and are never copied.
+    """
+
+    method: str
+    raw: dict[str, Any]
+    thread_id: str | None = None
+    turn_id: str | None = None
+    params: dict[str, Any] | None = None
+    item: dict[str, Any] | None = None
+    item_type: str | None = None
+    item_id: str | None = None
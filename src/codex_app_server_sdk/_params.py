@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from .models import InitializeResult, ThreadConfig, TurnOverrides, UnsetType
+from .protocol import DEFAULT_OPT_OUT_NOTIFICATION_METHODS
+
+
+def _prepare_initialize_params(
+    params: Mapping[str, Any] | None,
+) -> dict[str, Any]:
+    """Merge caller-provided initialize params with library defaults.
+
+    Merge behavior:
+    - start with `_default_initialize_params()`;
+    - shallow-merge top-level keys from caller `params`;
+    - when caller provides `capabilities` as a mapping and omits
+      `optOutNotificationMethods`, inject the default opt-out list;
+    - if caller provides explicit `capabilities.optOutNotificationMethods`, keep it.
+
+    Args:
+        params: Optional caller initialize payload.
+
+    Returns:
+        Final initialize payload sent to the server.
+    """
+    payload = _default_initialize_params()
+    if params is None:
+        return payload
+
+    params_dict = dict(params)
+    payload.update(params_dict)
+
+    if "capabilities" not in params_dict:
+        return payload
+
+    capabilities = payload.get("capabilities")
+    if capabilities is None:
+        return payload
+    if not isinstance(capabilities, Mapping):
+        return payload
+
+    capabilities_dict = dict(capabilities)
+    if "optOutNotificationMethods" not in capabilities_dict:
+        capabilities_dict["optOutNotificationMethods"] = list(DEFAULT_OPT_OUT_NOTIFICATION_METHODS)
+    payload["capabilities"] = capabilities_dict
+    return payload
+
+
+def _parse_initialize_result(result: Any) -> InitializeResult:
+    """Normalize an `initialize` response result into `InitializeResult`."""
+    result_dict = result if isinstance(result, dict) else {"value": result}
+    return InitializeResult(
+        protocol_version=_find_first_string_by_exact_keys(
+            result_dict,
+            {"protocolversion", "protocol_version"},
+        ),
+        server_info=_find_first_dict_by_exact_key(result_dict, {"serverinfo", "server_info"}),
+        capabilities=_find_first_dict_by_exact_key(result_dict, {"capabilities"}),
+        raw=result_dict,
+    )
+
+
+def _default_initialize_params() -> dict[str, Any]:
+    """Build the default initialize payload for Codex app-server.
+
+    The default payload currently includes:
+    - `protocolVersion`: protocol version string sent by this client;
+    - `clientInfo`: client name/version metadata;
+    - `capabilities.optOutNotificationMethods`: compat event opt-outs used by
+      default to reduce duplicate/legacy notification streams.
+
+    Returns:
+        Default initialize payload map.
+    """
+    return {
+        "protocolVersion": "1",
+        "clientInfo": {
+            "name": "codex-app-server-sdk",
+            "version": "0.1.0",
+        },
+        "capabilities": {
+            "optOutNotificationMethods": list(DEFAULT_OPT_OUT_NOTIFICATION_METHODS),
+        },
+    }
+
+
+def _find_first_string_by_exact_keys(
+    payload: Any,
+    keys_lower: set[str],
+) -> str | None:
+    """Depth-first search for first string whose key matches provided names."""
+    if isinstance(payload, Mapping):
+        for key, value in payload.items():
+            if key.lower() in keys_lower and isinstance(value, str):
+                return value
+        for value in payload.values():
+            found = _find_first_string_by_exact_keys(value, keys_lower)
+            if found is not None:
+                return found
+        return None
+
+    if isinstance(payload, list):
+        for item in payload:
+            found = _find_first_string_by_exact_keys(item, keys_lower)
+            if found is not None:
+                return found
+
+    return None
+
+
+def _find_first_dict_by_exact_key(
+    payload: Any,
+    keys_lower: set[str],
+) -> dict[str, Any] | None:
+    """Depth-first search for first dict value under matching key name."""
+    if isinstance(payload, Mapping):
+        for key, value in payload.items():
+            if key.lower() in keys_lower and isinstance(value, Mapping):
+                return dict(value)
+        for value in payload.values():
+            found = _find_first_dict_by_exact_key(value, keys_lower)
+            if found is not None:
+                return found
+        return None
+
+    if isinstance(payload, list):
+        for item in payload:
+            found = _find_first_dict_by_exact_key(item, keys_lower)
+            if found is not None:
+                return found
+
+    return None
+
+
+def _is_unset(value: Any) -> bool:
+    return isinstance(value, UnsetType)
+
+
+def _params_fingerprint(params: Any) -> str:
+    """Stable key for JSON-like params, independent of dict key order."""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _thread_config_to_params(config: ThreadConfig | None) -> dict[str, Any]:
+    """Encode `ThreadConfig` into protocol params (camelCase), omitting UNSET."""
+    if config is None:
+        return {}
+
+    mapping: tuple[tuple[str, str], ...] = (
+        ("cwd", "cwd"),
+        ("base_instructions", "baseInstructions"),
+        ("developer_instructions", "developerInstructions"),
+        ("model", "model"),
+        ("model_provider", "modelProvider"),
+        ("approval_policy", "approvalPolicy"),
+        ("sandbox", "sandbox"),
+        ("personality", "personality"),
+        ("ephemeral", "ephemeral"),
+        ("config", "config"),
+    )
+    params: dict[str, Any] = {}
+    for attr_name, key_name in mapping:
+        value = getattr(config, attr_name)
+        if _is_unset(value):
+            continue
+        params[key_name] = value
+    return params
+
+
+def _turn_overrides_to_params(overrides: TurnOverrides | None) -> dict[str, Any]:
+    """Encode `TurnOverrides` into protocol params (camelCase), omitting UNSET."""
+    if overrides is None:
+        return {}
+
+    mapping: tuple[tuple[str, str], ...] = (
+        ("cwd", "cwd"),
+        ("model", "model"),
+        ("effort", "effort"),
+        ("summary", "summary"),
+        ("sandbox_policy", "sandboxPolicy"),
+        ("personality", "personality"),
+        ("approval_policy", "approvalPolicy"),
+        ("output_schema", "outputSchema"),
+    )
+    params: dict[str, Any] = {}
+    for attr_name, key_name in mapping:
+        value = getattr(overrides, attr_name)
+        if _is_unset(value):
+            continue
+        params[key_name] = value
+    return params
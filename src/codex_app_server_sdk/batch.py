@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any
+
+from .errors import CodexError, CodexProtocolError, CodexTurnInactiveError
+from .models import CancelResult, ChatBatchItem, ChatContinuation, ChatResult
+
+ChatOnce = Callable[..., Awaitable[ChatResult]]
+Cancel = Callable[[ChatContinuation], Awaitable[CancelResult]]
+
+
+def _chat_batch(
+    chat_once: ChatOnce,
+    cancel: Cancel,
+    prompts: Iterable[str],
+    *,
+    concurrency: int,
+    max_continuations: int,
+    retries: int,
+    inactivity_timeout: float | None,
+    chat_kwargs: dict[str, Any],
+) -> AsyncIterator[ChatBatchItem]:
+    """Run prompts through `chat_once` with bounded concurrency, yielding as they finish.
+
+    Shared by `CodexClient.chat_batch()` and `CodexClientPool.chat_batch()`.
+    Arguments are validated immediately; work starts on first iteration.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if max_continuations < 0:
+        raise ValueError("max_continuations must not be negative")
+    if retries < 0:
+        raise ValueError("retries must not be negative")
+    return _run_chat_batch(
+        chat_once,
+        cancel,
+        prompts,
+        concurrency=concurrency,
+        max_continuations=max_continuations,
+        retries=retries,
+        inactivity_timeout=inactivity_timeout,
+        chat_kwargs=chat_kwargs,
+    )
+
+
+async def _run_chat_batch(
+    chat_once: ChatOnce,
+    cancel: Cancel,
+    prompts: Iterable[str],
+    *,
+    concurrency: int,
+    max_continuations: int,
+    retries: int,
+    inactivity_timeout: float | None,
+    chat_kwargs: dict[str, Any],
+) -> AsyncIterator[ChatBatchItem]:
+    # `prompts` is consumed lazily by the workers, so it may be a generator
+    # over a large dataset.
+    pending = enumerate(prompts)
+    finished: asyncio.Queue[ChatBatchItem | None] = asyncio.Queue()
+    failures: list[BaseException] = []
+
+    async def _run(index: int, prompt: str) -> ChatBatchItem:
+        item = ChatBatchItem(index=index, prompt=prompt)
+        while True:
+            item.attempts += 1
+            try:
+                result = await chat_once(
+                    prompt,
+                    inactivity_timeout=inactivity_timeout,
+                    **chat_kwargs,
+                )
+            except CodexTurnInactiveError as exc:
+                continued = await _continue(item, exc)
+                if continued is not None:
+                    item.result = continued
+                return item
+            except CodexProtocolError as exc:
+                if item.attempts <= retries:
+                    continue
+                item.error = exc
+                return item
+            except CodexError as exc:
+                item.error = exc
+                return item
+            item.result = result
+            return item
+
+    async def _continue(item: ChatBatchItem, exc: CodexTurnInactiveError) -> ChatResult | None:
+        while item.continuations < max_continuations:
+            item.continuations += 1
+            try:
+                return await chat_once(
+                    continuation=exc.continuation,
+                    inactivity_timeout=inactivity_timeout,
+                )
+            except CodexTurnInactiveError as next_exc:
+                exc = next_exc
+            except CodexError as other:
+                item.error = other
+                return None
+        item.error = exc
+        # Give up on the turn so it does not keep running server-side.
+        with contextlib.suppress(CodexError):
+            await cancel(exc.continuation)
+        return None
+
+    async def _worker() -> None:
+        try:
+            for index, prompt in pending:
+                finished.put_nowait(await _run(index, prompt))
+        except Exception as exc:
+            failures.append(exc)
+        finally:
+            finished.put_nowait(None)
+
+    workers = [asyncio.create_task(_worker()) for _ in range(concurrency)]
+    running = len(workers)
+    try:
+        while running:
+            item = await finished.get()
+            if item is None:
+                running -= 1
+                continue
+            yield item
+        if failures:
+            raise failures[0]
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -2,23 +2,43 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import os
-import shlex
-from collections.abc import AsyncIterator, Mapping, Sequence
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Hashable, Iterable, Mapping, Sequence
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Coroutine, Literal
-
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Coroutine, Literal
+
+from ._events import _EventEnvelope
+from ._params import (
+    _find_first_dict_by_exact_key,
+    _find_first_string_by_exact_keys,
+    _is_unset,
+    _params_fingerprint,
+    _parse_initialize_result,
+    _prepare_initialize_params,
+    _thread_config_to_params,
+    _turn_overrides_to_params,
+)
+from .batch import _chat_batch
+from .codec import JsonCodec
 from .errors import (
+    CodexError,
     CodexProtocolError,
     CodexTimeoutError,
     CodexTransportError,
     CodexTurnInactiveError,
 )
 from .models import (
+    AgentMessageDelta,
     ApprovalRequest,
     CancelResult,
+    ChatBatchItem,
     ChatContinuation,
+    ChatRequest,
     ChatResult,
+    ClientStats,
     CommandApprovalDecision,
     CommandApprovalRequest,
     CommandApprovalWithExecpolicyAmendment,
@@ -26,9 +46,14 @@ from .models import (
     FileChangeApprovalDecision,
     FileChangeApprovalRequest,
     InitializeResult,
+    OrphanDropReason,
+    SendLane,
+    SendLaneStats,
     ThreadConfig,
+    ThreadTemplate,
+    TurnEnded,
     TurnOverrides,
-    UnsetType,
+    TurnSchedule,
 )
 from .protocol import (
     COMMAND_EXEC_METHOD,
@@ -38,9 +63,12 @@ from .protocol import (
     CONFIG_VALUE_WRITE_METHOD,
     DEFAULT_OPT_OUT_NOTIFICATION_METHODS,
     INITIALIZE_METHOD,
+    ITEM_AGENT_MESSAGE_DELTA_METHOD,
+    ITEM_COMMAND_EXECUTION_OUTPUT_DELTA_METHOD,
     ITEM_COMMAND_EXECUTION_REQUEST_APPROVAL_METHOD,
     ITEM_COMPLETED_METHOD,
     ITEM_FILE_CHANGE_REQUEST_APPROVAL_METHOD,
+    ITEM_STARTED_METHOD,
     MODEL_LIST_METHOD,
     REVIEW_START_METHOD,
     THREAD_ARCHIVE_METHOD,
@@ -53,9 +81,12 @@ from .protocol import (
     THREAD_RESUME_METHOD,
     THREAD_START_METHOD,
     THREAD_UNARCHIVE_METHOD,
+    TURN_COMPLETED_METHODS,
+    TURN_FAILED_METHODS,
     TURN_INTERRUPT_METHOD,
     TURN_STEER_METHOD,
     TURN_START_METHOD,
+    TURN_STARTED_METHOD,
     extract_error,
     is_response_message,
     is_turn_completed,
@@ -63,8 +94,20 @@ from .protocol import (
     make_error_response,
     make_result_response,
     make_request,
+    peek_message_head,
 )
-from .transport import StdioTransport, Transport, WebSocketTransport
+from .transport import (
+    StdioTransport,
+    Transport,
+    WebSocketTransport,
+    _default_stdio_command,
+)
+
+if TYPE_CHECKING:
+    from .command_output import CommandOutputMonitor
+    from .prefetch import ThreadPrefetcher
+    from .scheduling import TurnAdmission, TurnScheduler
+    from .warm_pool import StdioWarmPool, WarmLease
 
 
 @dataclass(slots=True)
@@ -82,13 +125,473 @@ class _TurnSession:
     completed_item_ids: set[str] = field(default_factory=set)
     step_records: list[_StepRecord] = field(default_factory=list)
     step_item_ids: set[str] = field(default_factory=set)
+    mailbox: asyncio.Queue[_EventEnvelope] = field(default_factory=asyncio.Queue)
     completed: bool = False
     failed: bool = False
     failure_message: str | None = None
     interrupted: bool = False
+    # Scheduler slot held while the turn runs, if a scheduler is attached.
+    admission: TurnAdmission | None = None
+
+
+@dataclass(slots=True)
+class _ClientCounters:
+    id_fast_path_hits: int = 0
+    id_fallback_scans: int = 0
+    orphaned_notifications: int = 0
+    dropped_notifications: int = 0
+    skipped_notifications: int = 0
+    skipped_results: int = 0
+    template_primes: int = 0
+    skipped_resumes: int = 0
+
+
+@dataclass(slots=True)
+class _PrimedTemplate:
+    """Cached template thread and the fingerprint of the inputs that primed it."""
+
+    fingerprint: str
+    thread_id: str
+
+
+@dataclass(slots=True)
+class _OutboundMessage:
+    """One queued outgoing message; `flushed` resolves once it is written."""
+
+    payload: dict[str, Any]
+    flushed: asyncio.Future[None] | None = None
+    lane: SendLane = "normal"
+    enqueued_at: float = 0.0
+
+
+@dataclass(slots=True)
+class _PendingRequest:
+    """A request that has been queued for writing but not yet answered.
+
+    `flushed` is the writer's flush future, or the direct `transport.send()`
+    coroutine when no writer task is running yet.
+    """
+
+    request_id: int
+    method: str
+    response: asyncio.Future[dict[str, Any]]
+    flushed: Awaitable[None]
+
+
+# Error message fragments the app-server uses when a thread it is asked about
+# was archived, never existed, or is not loaded.
+_MISSING_THREAD_MARKERS = ("not found", "not loaded", "no rollout", "unknown thread")
+
+# Upper bound on messages the writer task hands to the transport per wake-up,
+# so one huge burst does not delay the first caller's flush indefinitely.
+_MAX_SEND_BATCH = 512
+
+_SEND_LANES: tuple[SendLane, ...] = ("control", "approval", "normal", "bulk")
+# Lanes flushed in their own write, never joined with normal or bulk payloads.
+_URGENT_SEND_LANES: tuple[SendLane, ...] = ("control", "approval")
+_BACKGROUND_SEND_LANES: tuple[SendLane, ...] = ("normal", "bulk")
+
+_REQUEST_SEND_LANES: dict[str, SendLane] = {
+    TURN_INTERRUPT_METHOD: "control",
+    THREAD_READ_METHOD: "bulk",
+    THREAD_LIST_METHOD: "bulk",
+    CONFIG_VALUE_WRITE_METHOD: "bulk",
+    CONFIG_BATCH_WRITE_METHOD: "bulk",
+}
+
+
+class _OutboundQueue:
+    """Outgoing messages split into priority lanes.
+
+    `take()` returns messages from the control and approval lanes on their own
+    whenever any are waiting, so an interrupt or approval answer is never
+    written behind a large `thread/read` or config payload. Otherwise it
+    returns normal messages ahead of bulk ones. Order within a lane is FIFO.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._lanes: dict[SendLane, deque[_OutboundMessage]] = {
+            lane: deque() for lane in _SEND_LANES
+        }
+        self._ready = asyncio.Event()
+        self._clock = clock
+        self._sent: dict[SendLane, int] = dict.fromkeys(_SEND_LANES, 0)
+        self._wait_total: dict[SendLane, float] = dict.fromkeys(_SEND_LANES, 0.0)
+        self._wait_max: dict[SendLane, float] = dict.fromkeys(_SEND_LANES, 0.0)
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._lanes.values())
+
+    def put(self, message: _OutboundMessage) -> None:
+        message.enqueued_at = self._clock()
+        self._lanes[message.lane].append(message)
+        self._ready.set()
+
+    async def take(self, limit: int) -> list[_OutboundMessage]:
+        """Wait for queued messages and return the next batch to write."""
+        while True:
+            batch = self._take_from(_URGENT_SEND_LANES, limit) or self._take_from(
+                _BACKGROUND_SEND_LANES, limit
+            )
+            if batch:
+                self._record_wait(batch)
+                return batch
+            self._ready.clear()
+            await self._ready.wait()
+
+    def drain(self) -> list[_OutboundMessage]:
+        """Remove and return every queued message, highest lane first."""
+        batch: list[_OutboundMessage] = []
+        for queue in self._lanes.values():
+            batch.extend(queue)
+            queue.clear()
+        return batch
+
+    def stats(self) -> dict[str, SendLaneStats]:
+        return {
+            lane: SendLaneStats(
+                sent=self._sent[lane],
+                queued=len(self._lanes[lane]),
+                mean_wait_seconds=(
+                    self._wait_total[lane] / self._sent[lane] if self._sent[lane] else 0.0
+                ),
+                max_wait_seconds=self._wait_max[lane],
+            )
+            for lane in _SEND_LANES
+        }
+
+    def _take_from(self, lanes: tuple[SendLane, ...], limit: int) -> list[_OutboundMessage]:
+        batch: list[_OutboundMessage] = []
+        for lane in lanes:
+            queue = self._lanes[lane]
+            while queue and len(batch) < limit:
+                batch.append(queue.popleft())
+        return batch
+
+    def _record_wait(self, batch: list[_OutboundMessage]) -> None:
+        now = self._clock()
+        for message in batch:
+            waited = now - message.enqueued_at
+            lane = message.lane
+            self._sent[lane] += 1
+            self._wait_total[lane] += waited
+            if waited > self._wait_max[lane]:
+                self._wait_max[lane] = waited
+
+
+OrphanHandler = Callable[[dict[str, Any], OrphanDropReason], None]
+
+
+class _OrphanBuffer:
+    """Bounded holding area for notifications whose turn is not registered.
+
+    Buckets are keyed by turn id (`None` for terminal events without one) and
+    kept in least-recently-touched order. The buffer enforces a total event cap
+    by evicting from the least recently touched bucket, expires buckets that
+    were not touched within `ttl` seconds, and remembers a bounded set of
+    finished turn ids so late events for them are dropped immediately.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_events: int,
+        ttl: float | None,
+        counters: _ClientCounters,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_events < 0:
+            raise ValueError("max_orphan_notifications must be >= 0")
+        self._max_events = max_events
+        self._ttl = ttl
+        self._counters = counters
+        self._clock = clock
+        self._buckets: OrderedDict[str | None, deque[_EventEnvelope]] = OrderedDict()
+        self._touched: dict[str | None, float] = {}
+        self._size = 0
+        self._finished_turns: OrderedDict[str, None] = OrderedDict()
+        self.handler: OrphanHandler | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, turn_id: str | None, envelope: _EventEnvelope) -> None:
+        """Park one event for a turn that may register later."""
+        if turn_id is not None and turn_id in self._finished_turns:
+            self.drop(envelope, "late")
+            return
+
+        now = self._clock()
+        self._expire(now)
+        bucket = self._buckets.get(turn_id)
+        if bucket is None:
+            bucket = deque()
+            self._buckets[turn_id] = bucket
+        else:
+            self._buckets.move_to_end(turn_id)
+        bucket.append(envelope)
+        self._touched[turn_id] = now
+        self._size += 1
+        self._counters.orphaned_notifications += 1
+
+        while self._size > self._max_events:
+            oldest_key = next(iter(self._buckets))
+            oldest = self._buckets[oldest_key]
+            self._size -= 1
+            self.drop(oldest.popleft(), "evicted")
+            if not oldest:
+                self._remove_bucket(oldest_key)
+
+    def pop(self, turn_id: str | None) -> deque[_EventEnvelope] | tuple[()]:
+        """Remove and return all events parked for `turn_id`."""
+        bucket = self._buckets.pop(turn_id, None)
+        if bucket is None:
+            return ()
+        self._touched.pop(turn_id, None)
+        self._size -= len(bucket)
+        return bucket
+
+    def retire(self, turn_id: str) -> None:
+        """Drop parked events for a finished turn and ignore later arrivals."""
+        for envelope in self.pop(turn_id):
+            self.drop(envelope, "late")
+        self._finished_turns[turn_id] = None
+        self._finished_turns.move_to_end(turn_id)
+        while len(self._finished_turns) > max(self._max_events, 1):
+            self._finished_turns.popitem(last=False)
+
+    def drop(self, envelope: _EventEnvelope, reason: OrphanDropReason) -> None:
+        """Count one dropped event and report it to the configured handler."""
+        self._counters.dropped_notifications += 1
+        handler = self.handler
+        if handler is None:
+            return
+        with contextlib.suppress(Exception):
+            handler(envelope.raw, reason)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._touched.clear()
+        self._finished_turns.clear()
+        self._size = 0
+
+    def _expire(self, now: float) -> None:
+        if self._ttl is None:
+            return
+        while self._buckets:
+            oldest_key = next(iter(self._buckets))
+            if now - self._touched[oldest_key] < self._ttl:
+                return
+            for envelope in self.pop(oldest_key):
+                self.drop(envelope, "expired")
+
+    def _remove_bucket(self, turn_id: str | None) -> None:
+        self._buckets.pop(turn_id, None)
+        self._touched.pop(turn_id, None)
 
 
 _APPROVAL_QUEUE_STOP = object()
+_QUEUED_STEPS_END = object()
+
+
+def _settle_outbound(
+    batch: Sequence[_OutboundMessage],
+    error: CodexTransportError | None,
+) -> None:
+    for message in batch:
+        flushed = message.flushed
+        if flushed is None or flushed.done():
+            continue
+        if error is None:
+            flushed.set_result(None)
+        else:
+            flushed.set_exception(error)
+
+
+def _encode_outbound(
+    batch: Sequence[_OutboundMessage],
+    encode: Callable[[Mapping[str, Any]], bytes],
+) -> tuple[list[_OutboundMessage], list[bytes]]:
+    """Encode each message on its own; a payload that fails fails only its caller."""
+    sendable: list[_OutboundMessage] = []
+    encoded: list[bytes] = []
+    for message in batch:
+        try:
+            encoded.append(encode(message.payload))
+        except Exception as exc:
+            flushed = message.flushed
+            if flushed is not None and not flushed.done():
+                flushed.set_exception(exc)
+            continue
+        sendable.append(message)
+    return sendable, encoded
+
+
+class QueuedTurn:
+    """One prompt submitted to a thread's turn queue.
+
+    Await the object (or `result()`) for the `ChatResult`, or iterate
+    `steps()` for completed steps as they arrive. Created by
+    `ThreadHandle.submit()`.
+    """
+
+    def __init__(
+        self,
+        thread_id: str,
+        text: str,
+        *,
+        user: str | None,
+        metadata: Mapping[str, Any] | None,
+        turn_overrides: TurnOverrides | None,
+        inactivity_timeout: float | None,
+        schedule: TurnSchedule | None = None,
+    ) -> None:
+        self._thread_id = thread_id
+        self._text = text
+        self._user = user
+        self._metadata = metadata
+        self._turn_overrides = turn_overrides
+        self._inactivity_timeout = inactivity_timeout
+        self._schedule = schedule
+        self._turn_id: str | None = None
+        self._started = False
+        self._result: asyncio.Future[ChatResult] = asyncio.get_running_loop().create_future()
+        self._steps: asyncio.Queue[ConversationStep | object] = asyncio.Queue()
+
+    @property
+    def thread_id(self) -> str:
+        """Thread the prompt was submitted to."""
+        return self._thread_id
+
+    @property
+    def turn_id(self) -> str | None:
+        """Server turn id, or `None` while the prompt is still queued."""
+        return self._turn_id
+
+    @property
+    def started(self) -> bool:
+        """Whether the prompt left the queue and its turn is being started or run."""
+        return self._started
+
+    def done(self) -> bool:
+        """Whether the turn finished, failed, or was cancelled."""
+        return self._result.done()
+
+    def cancel(self) -> bool:
+        """Withdraw the prompt if it has not started yet.
+
+        Returns:
+            `True` if the prompt was withdrawn. A running turn is not affected;
+            interrupt it with `CodexClient.cancel(...)` instead.
+        """
+        if self.started or self._result.done():
+            return False
+        self._result.cancel()
+        self._steps.put_nowait(_QUEUED_STEPS_END)
+        return True
+
+    async def result(self) -> ChatResult:
+        """Wait for the turn to finish and return its `ChatResult`.
+
+        Raises:
+            asyncio.CancelledError: If the prompt was withdrawn with `cancel()`.
+            CodexTurnInactiveError: If the turn went inactive; it has been
+                interrupted so the queue can continue.
+            CodexProtocolError: If the turn failed.
+            CodexTransportError: If the transport failed or the client closed.
+        """
+        return await asyncio.shield(self._result)
+
+    def __await__(self) -> Any:
+        return self.result().__await__()
+
+    async def steps(self) -> AsyncIterator[ConversationStep]:
+        """Yield completed steps of this turn as they arrive.
+
+        Raises the turn's error, if any, after the last step.
+        """
+        while True:
+            step = await self._steps.get()
+            if not isinstance(step, ConversationStep):
+                # `_QUEUED_STEPS_END` marks the end of the turn.
+                break
+            yield step
+        error: BaseException | None = None
+        if not self._result.cancelled():
+            error = self._result.exception()
+        if error is not None:
+            raise error
+
+    def _push_step(self, step: ConversationStep) -> None:
+        self._steps.put_nowait(step)
+
+    def _set_result(self, result: ChatResult) -> None:
+        if not self._result.done():
+            self._result.set_result(result)
+            self._steps.put_nowait(_QUEUED_STEPS_END)
+
+    def _set_error(self, error: BaseException) -> None:
+        if not self._result.done():
+            self._result.set_exception(error)
+            # Consumers of `steps()` see the error too; do not report it as
+            # never retrieved when nobody awaits the result.
+            self._result.exception()
+            self._steps.put_nowait(_QUEUED_STEPS_END)
+
+
+@dataclass(slots=True, eq=False)
+class _MergedTurn:
+    """One turn of a `chat_many()` stream, from `turn/start` to its end marker."""
+
+    key: Hashable
+    mailbox: _MergedMailbox | None = None
+    start: asyncio.Task[tuple[str, _TurnSession]] | None = None
+    session: _TurnSession | None = None
+    last_event_at: float = 0.0
+    ended: bool = False
+
+
+class _MergedTurns:
+    """Arrival-ordered feed shared by the mailboxes of one `chat_many()` stream.
+
+    The receiver appends a turn once per delivered event, so one wake-up covers
+    every turn that received events since the consumer last ran.
+    """
+
+    def __init__(self) -> None:
+        self.ready: deque[_MergedTurn] = deque()
+        self.wakeup = asyncio.Event()
+
+    def notify(self, turn: _MergedTurn) -> None:
+        self.ready.append(turn)
+        self.wakeup.set()
+
+
+class _MergedMailbox(asyncio.Queue[_EventEnvelope]):
+    """Turn mailbox that also reports each delivery to its `chat_many()` feed.
+
+    Setting `merged` to `None` detaches it into a plain mailbox, for example
+    when the turn is handed back through a continuation.
+    """
+
+    def __init__(self, merged: _MergedTurns, turn: _MergedTurn) -> None:
+        super().__init__()
+        self.merged: _MergedTurns | None = merged
+        self.turn = turn
+
+    def put_nowait(self, item: _EventEnvelope) -> None:
+        super().put_nowait(item)
+        if self.merged is not None:
+            self.merged.notify(self.turn)
+
+
+@dataclass(slots=True)
+class _ThreadTurnQueue:
+    """FIFO of submitted prompts for one thread and the task draining it."""
+
+    pending: deque[QueuedTurn] = field(default_factory=deque)
+    running: QueuedTurn | None = None
+    worker: asyncio.Task[None] | None = None
 
 
 class ThreadHandle:
@@ -124,6 +627,7 @@ class ThreadHandle:
         inactivity_timeout: float | None = None,
         continuation: ChatContinuation | None = None,
         turn_overrides: TurnOverrides | None = None,
+        schedule: TurnSchedule | None = None,
     ) -> ChatResult:
         """Send one message on this bound thread and return the final assistant output.
 
@@ -137,6 +641,8 @@ class ThreadHandle:
             continuation: Continuation token from `CodexTurnInactiveError` for
                 resuming the same running turn.
             turn_overrides: Optional per-turn override payload for `turn/start`.
+            schedule: Optional priority, fairness key and admission deadline
+                used by the client's `TurnScheduler`.
 
         Returns:
             Buffered final turn result for this thread.
@@ -149,8 +655,8 @@ class ThreadHandle:
             CodexTransportError: If transport fails while waiting for turn events.
 
         Notes:
-            When `continuation` is provided, `text`, `user`, `metadata`, and
-            `turn_overrides` cannot be provided in the same call.
+            When `continuation` is provided, `text`, `user`, `metadata`,
+            `turn_overrides`, and `schedule` cannot be provided in the same call.
         """
         return await self._client.chat_once(
             text,
@@ -160,6 +666,7 @@ class ThreadHandle:
             inactivity_timeout=inactivity_timeout,
             continuation=continuation,
             turn_overrides=turn_overrides,
+            schedule=schedule,
         )
 
     async def chat(
@@ -171,6 +678,7 @@ class ThreadHandle:
         inactivity_timeout: float | None = None,
         continuation: ChatContinuation | None = None,
         turn_overrides: TurnOverrides | None = None,
+        schedule: TurnSchedule | None = None,
     ) -> AsyncIterator[ConversationStep]:
         """Stream completed, non-delta steps for one message on this bound thread.
 
@@ -184,6 +692,8 @@ class ThreadHandle:
             continuation: Continuation token from `CodexTurnInactiveError` for
                 resuming the same running turn.
             turn_overrides: Optional per-turn override payload for `turn/start`.
+            schedule: Optional priority, fairness key and admission deadline
+                used by the client's `TurnScheduler`.
 
         Yields:
             Completed conversation step blocks as they arrive.
@@ -196,8 +706,8 @@ class ThreadHandle:
             CodexTransportError: If transport fails while waiting for turn events.
 
         Notes:
-            When `continuation` is provided, `text`, `user`, `metadata`, and
-            `turn_overrides` cannot be provided in the same call.
+            When `continuation` is provided, `text`, `user`, `metadata`,
+            `turn_overrides`, and `schedule` cannot be provided in the same call.
         """
         async for step in self._client.chat(
             text,
@@ -207,9 +717,119 @@ class ThreadHandle:
             inactivity_timeout=inactivity_timeout,
             continuation=continuation,
             turn_overrides=turn_overrides,
+            schedule=schedule,
         ):
             yield step
 
+    async def chat_deltas(
+        self,
+        text: str | None = None,
+        *,
+        user: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        inactivity_timeout: float | None = None,
+        continuation: ChatContinuation | None = None,
+        turn_overrides: TurnOverrides | None = None,
+        schedule: TurnSchedule | None = None,
+    ) -> AsyncIterator[AgentMessageDelta | ConversationStep]:
+        """Stream assistant text deltas and completed steps on this bound thread.
+
+        Arguments and errors are the same as `chat()`; see
+        `CodexClient.chat_deltas()` for what is yielded.
+        """
+        async for event in self._client.chat_deltas(
+            text,
+            thread_id=self._thread_id,
+            user=user,
+            metadata=metadata,
+            inactivity_timeout=inactivity_timeout,
+            continuation=continuation,
+            turn_overrides=turn_overrides,
+            schedule=schedule,
+        ):
+            yield event
+
+    async def chat_batches(
+        self,
+        text: str | None = None,
+        *,
+        user: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        inactivity_timeout: float | None = None,
+        continuation: ChatContinuation | None = None,
+        turn_overrides: TurnOverrides | None = None,
+        schedule: TurnSchedule | None = None,
+        max_batch: int = 64,
+        max_delay: float = 0.0,
+    ) -> AsyncIterator[list[ConversationStep]]:
+        """Stream completed steps in lists on this bound thread.
+
+        Arguments and errors are the same as `chat()`; see
+        `CodexClient.chat_batches()` for `max_batch` and `max_delay`.
+        """
+        async for batch in self._client.chat_batches(
+            text,
+            thread_id=self._thread_id,
+            user=user,
+            metadata=metadata,
+            inactivity_timeout=inactivity_timeout,
+            continuation=continuation,
+            turn_overrides=turn_overrides,
+            schedule=schedule,
+            max_batch=max_batch,
+            max_delay=max_delay,
+        ):
+            yield batch
+
+    def submit(
+        self,
+        text: str,
+        *,
+        user: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        turn_overrides: TurnOverrides | None = None,
+        inactivity_timeout: float | None = None,
+        schedule: TurnSchedule | None = None,
+    ) -> QueuedTurn:
+        """Queue a prompt to run after every prompt submitted before it.
+
+        Prompts for one thread run one turn at a time in submission order,
+        also across handles for the same thread. The next `turn/start` is sent
+        as soon as the previous turn completes, whether or not its caller
+        has collected the result yet.
+
+        Args:
+            text: User text for the turn.
+            user: Optional user label forwarded on `turn/start`.
+            metadata: Optional per-turn metadata forwarded on `turn/start`.
+            turn_overrides: Optional per-turn override payload for `turn/start`.
+            inactivity_timeout: Optional per-turn inactivity timeout override.
+                A turn that goes inactive is interrupted so the queue can
+                continue.
+            schedule: Optional priority, fairness key and admission deadline
+                used by the client's `TurnScheduler` when this turn reaches
+                the head of the thread queue.
+
+        Returns:
+            `QueuedTurn` to await or stream.
+        """
+        return self._client._submit_turn(
+            QueuedTurn(
+                self._thread_id,
+                text,
+                user=user,
+                metadata=metadata,
+                turn_overrides=turn_overrides,
+                inactivity_timeout=inactivity_timeout,
+                schedule=schedule,
+            )
+        )
+
+    @property
+    def queued_turns(self) -> int:
+        """Prompts submitted to this thread that have not finished yet."""
+        return self._client._turn_queue_depth(self._thread_id)
+
     async def fork(self, *, overrides: ThreadConfig | None = None) -> ThreadHandle:
         """Fork this thread into a new thread handle.
 
@@ -309,6 +929,11 @@ class CodexClient:
         request_timeout: float = 30.0,
         inactivity_timeout: float | None = 180.0,
         strict: bool = False,
+        max_orphan_notifications: int = 1024,
+        orphan_notification_ttl: float | None = 300.0,
+        ignored_notification_methods: Sequence[str] | None = None,
+        pipeline_startup: bool = False,
+        max_primed_templates: int = 8,
     ) -> None:
         """Create a client bound to a transport.
 
@@ -318,18 +943,54 @@ class CodexClient:
             inactivity_timeout: Turn inactivity timeout in seconds. If None,
                 turn waits can run indefinitely until terminal events.
             strict: If True, fail on certain protocol ambiguities.
+            max_orphan_notifications: Maximum number of notifications held for
+                turns that are not (yet) awaited by this client. Oldest events
+                are evicted first.
+            orphan_notification_ttl: Seconds after which held notifications for
+                an untouched turn are expired. `None` disables expiry.
+            ignored_notification_methods: Notification methods dropped by the
+                receiver without decoding. Defaults to the
+                `optOutNotificationMethods` sent in `initialize`; pass `()` to
+                keep every notification.
+            pipeline_startup: If True, `start()` sends the default `initialize`
+                request without waiting for its response, and the first
+                `thread/start`/`thread/resume` is written right behind it
+                instead of after the handshake round trip.
+            max_primed_templates: Maximum number of primed `ThreadTemplate`
+                threads kept by `fork_template()`. The least recently used one
+                is archived when the cap is exceeded.
         """
         self._transport = transport
         self._request_timeout = request_timeout
         self._inactivity_timeout = inactivity_timeout
         self._strict = strict
         self._initialized = False
+        self._initialize_result: InitializeResult | None = None
+        self._pipeline_startup = pipeline_startup
+        # In-flight default handshake started by pipelined startup.
+        self._initialize_task: asyncio.Task[InitializeResult] | None = None
 
         self._next_request_id = 1
         self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
-        self._notifications: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
-        self._deferred_notifications: list[dict[str, Any]] = []
+        self._counters = _ClientCounters()
+        # Notifications for turns without a registered session yet, keyed by
+        # turn id. The `None` key holds terminal events that carry no turn id.
+        self._deferred_notifications = _OrphanBuffer(
+            max_events=max_orphan_notifications,
+            ttl=orphan_notification_ttl,
+            counters=self._counters,
+        )
         self._turn_sessions: dict[str, _TurnSession] = {}
+        self._transport_failure: _EventEnvelope | None = None
+        # Messages are peeked before decoding; ignored notifications and
+        # responses whose result the caller discards are never fully parsed.
+        self._ignore_follows_opt_out = ignored_notification_methods is None
+        self._ignored_notification_methods = _ignorable_methods(
+            DEFAULT_OPT_OUT_NOTIFICATION_METHODS
+            if ignored_notification_methods is None
+            else ignored_notification_methods
+        )
+        self._discarded_results: set[int] = set()
         self._approval_requests: asyncio.Queue[ApprovalRequest | object] = asyncio.Queue()
         self._pending_approval_requests: dict[int | str, ApprovalRequest] = {}
         self._approval_handler: (
@@ -340,8 +1001,29 @@ class CodexClient:
             | None
         ) = None
         self._background_tasks: set[asyncio.Task[Any]] = set()
-
-        self._send_lock = asyncio.Lock()
+        self._thread_prefetcher: ThreadPrefetcher | None = None
+        # Threads started, resumed or forked on this connection, with the
+        # thread config params applied so far. A turn on a live thread skips
+        # `thread/resume` unless it asks for params not applied yet.
+        self._live_threads: dict[str, dict[str, Any]] = {}
+        self._turn_queues: dict[str, _ThreadTurnQueue] = {}
+        self._turn_scheduler: TurnScheduler | None = None
+        self._command_output_monitor: CommandOutputMonitor | None = None
+        # The receiver stops reading between batches while any consumer holds
+        # a pause (see `pause_receiving()`).
+        self._receive_pauses = 0
+        self._receive_resumed = asyncio.Event()
+        self._receive_resumed.set()
+        # Primed template threads by template name, least recently used first.
+        self._max_primed_templates = max_primed_templates
+        self._primed_templates: OrderedDict[str, _PrimedTemplate] = OrderedDict()
+        self._template_locks: dict[str, asyncio.Lock] = {}
+
+        # Outgoing messages are written by a single writer task that encodes
+        # each queued message and flushes them per wake-up with one
+        # `send_raw_many()` call, highest priority lane first.
+        self._send_queue = _OutboundQueue()
+        self._writer_task: asyncio.Task[None] | None = None
         self._receiver_task: asyncio.Task[None] | None = None
         self._started = False
         self._closed = False
@@ -354,9 +1036,16 @@ class CodexClient:
         cwd: str | None = None,
         env: Mapping[str, str] | None = None,
         connect_timeout: float = 30.0,
+        codec: JsonCodec | None = None,
         request_timeout: float = 30.0,
         inactivity_timeout: float | None = 180.0,
         strict: bool = False,
+        max_orphan_notifications: int = 1024,
+        orphan_notification_ttl: float | None = 300.0,
+        ignored_notification_methods: Sequence[str] | None = None,
+        warm_pool: StdioWarmPool | None = None,
+        pipeline_startup: bool = False,
+        max_primed_templates: int = 8,
     ) -> CodexClient:
         """Create an unstarted client configured for stdio transport.
 
@@ -366,27 +1055,59 @@ class CodexClient:
             cwd: Optional subprocess working directory.
             env: Optional subprocess environment overrides.
             connect_timeout: Subprocess spawn timeout in seconds.
+            codec: Optional JSON codec for the transport. Defaults to the
+                fastest installed backend (`orjson`, `msgspec`, stdlib).
             request_timeout: Default request/response timeout in seconds.
             inactivity_timeout: Default turn inactivity timeout in seconds.
                 If `None`, turn waits are unbounded by inactivity.
             strict: Enable strict protocol behavior for ambiguous cases.
+            max_orphan_notifications: Cap on notifications held for turns not
+                awaited by this client.
+            orphan_notification_ttl: Expiry in seconds for held notifications.
+            ignored_notification_methods: Notification methods dropped without
+                decoding. Defaults to the initialize opt-out list.
+            warm_pool: Optional `StdioWarmPool` to lease an already spawned and
+                initialized process from. `command`, `cwd`, `env`,
+                `connect_timeout` and `codec` are then taken from the pool. If
+                no process is ready, a fresh one with the pool's settings is
+                used instead.
+            pipeline_startup: Send `initialize` from `start()` and pipeline the
+                first thread request behind it.
+            max_primed_templates: Cap on primed `ThreadTemplate` threads.
 
         Returns:
             Unstarted `CodexClient` using `StdioTransport`.
         """
-        resolved_command = list(command) if command is not None else _default_stdio_command()
-        transport = StdioTransport(
-            resolved_command,
-            cwd=cwd,
-            env=env,
-            connect_timeout=connect_timeout,
-        )
+        lease: WarmLease | None = None
+        if warm_pool is not None:
+            lease = warm_pool.lease_nowait()
+            transport = lease.transport if lease is not None else warm_pool.create_transport()
+        else:
+            resolved_command = (
+                list(command) if command is not None else _default_stdio_command()
+            )
+            transport = StdioTransport(
+                resolved_command,
+                cwd=cwd,
+                env=env,
+                connect_timeout=connect_timeout,
+                codec=codec,
+            )
         client = cls(
             transport,
             request_timeout=request_timeout,
             inactivity_timeout=inactivity_timeout,
             strict=strict,
+            max_orphan_notifications=max_orphan_notifications,
+            orphan_notification_ttl=orphan_notification_ttl,
+            ignored_notification_methods=ignored_notification_methods,
+            pipeline_startup=pipeline_startup,
+            max_primed_templates=max_primed_templates,
         )
+        if lease is not None and warm_pool is not None:
+            client._adopt_initialize_params(warm_pool.initialize_params)
+            client._initialized = True
+            client._initialize_result = lease.initialize_result
         return client
 
     @classmethod
@@ -397,9 +1118,15 @@ class CodexClient:
         token: str | None = None,
         headers: Mapping[str, str] | None = None,
         connect_timeout: float = 30.0,
+        codec: JsonCodec | None = None,
         request_timeout: float = 30.0,
         inactivity_timeout: float | None = 180.0,
         strict: bool = False,
+        max_orphan_notifications: int = 1024,
+        orphan_notification_ttl: float | None = 300.0,
+        ignored_notification_methods: Sequence[str] | None = None,
+        pipeline_startup: bool = False,
+        max_primed_templates: int = 8,
     ) -> CodexClient:
         """Create an unstarted client configured for websocket transport.
 
@@ -409,10 +1136,20 @@ class CodexClient:
             token: Optional bearer token. Defaults to `CODEX_APP_SERVER_TOKEN`.
             headers: Optional extra websocket headers.
             connect_timeout: Websocket handshake timeout in seconds.
+            codec: Optional JSON codec for the transport. Defaults to the
+                fastest installed backend (`orjson`, `msgspec`, stdlib).
             request_timeout: Default request/response timeout in seconds.
             inactivity_timeout: Default turn inactivity timeout in seconds.
                 If `None`, turn waits are unbounded by inactivity.
             strict: Enable strict protocol behavior for ambiguous cases.
+            max_orphan_notifications: Cap on notifications held for turns not
+                awaited by this client.
+            orphan_notification_ttl: Expiry in seconds for held notifications.
+            ignored_notification_methods: Notification methods dropped without
+                decoding. Defaults to the initialize opt-out list.
+            pipeline_startup: Send `initialize` from `start()` and pipeline the
+                first thread request behind it.
+            max_primed_templates: Cap on primed `ThreadTemplate` threads.
 
         Returns:
             Unstarted `CodexClient` using `WebSocketTransport`.
@@ -427,18 +1164,27 @@ class CodexClient:
             resolved_url,
             headers=resolved_headers,
             connect_timeout=connect_timeout,
+            codec=codec,
         )
         client = cls(
             transport,
             request_timeout=request_timeout,
             inactivity_timeout=inactivity_timeout,
             strict=strict,
+            max_orphan_notifications=max_orphan_notifications,
+            orphan_notification_ttl=orphan_notification_ttl,
+            ignored_notification_methods=ignored_notification_methods,
+            pipeline_startup=pipeline_startup,
+            max_primed_templates=max_primed_templates,
         )
         return client
 
     async def start(self) -> CodexClient:
         """Connect transport and start the background receiver loop.
 
+        With `pipeline_startup=True` the `initialize` request is also sent,
+        and its response is awaited by the first call that needs it.
+
         Returns:
             `self` for fluent usage.
 
@@ -450,8 +1196,11 @@ class CodexClient:
         if self._started:
             return self
         await self._transport.connect()
+        self._start_writer()
         self._start_receiver()
         self._started = True
+        if self._pipeline_startup:
+            self._begin_initialize()
         return self
 
     async def __aenter__(self) -> CodexClient:
@@ -474,10 +1223,21 @@ class CodexClient:
                 await self._receiver_task
             self._receiver_task = None
 
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+        self._fail_queued_sends(CodexTransportError("client is closing"))
+
         for future in list(self._pending.values()):
             if not future.done():
                 future.set_exception(CodexTransportError("client is closing"))
         self._pending.clear()
+        self._discarded_results.clear()
+        if self._initialize_task is not None:
+            await asyncio.gather(self._initialize_task, return_exceptions=True)
+            self._initialize_task = None
 
         for task in list(self._background_tasks):
             task.cancel()
@@ -487,7 +1247,10 @@ class CodexClient:
 
         self._pending_approval_requests.clear()
         self._approval_handler = None
+        self._primed_templates.clear()
+        self._template_locks.clear()
 
+        self._fail_turn_waiters(_transport_error_envelope("client is closing"))
         self._turn_sessions.clear()
         self._deferred_notifications.clear()
         self._approval_requests.put_nowait(_APPROVAL_QUEUE_STOP)
@@ -517,19 +1280,57 @@ class CodexClient:
             Parsed initialize result containing normalized protocol/server fields
             and raw initialize payload.
         """
+        if params is None and self._initialize_task is not None:
+            # Pipelined startup already sent the default handshake.
+            return await asyncio.shield(self._initialize_task)
+        if params is None and self._initialize_result is not None:
+            # Already initialized, for example by a warm pool before the lease.
+            return self._initialize_result
         payload = _prepare_initialize_params(params)
-        result = await self.request(INITIALIZE_METHOD, payload, timeout=timeout)
-        result_dict = result if isinstance(result, dict) else {"value": result}
+        self._adopt_initialize_params(payload)
+        pending = self._begin_request(INITIALIZE_METHOD, payload)
+        return await self._finish_initialize(pending, timeout=timeout)
+
+    def _begin_initialize(self) -> asyncio.Task[InitializeResult] | None:
+        """Queue the default `initialize` request unless the handshake is done.
+
+        Returns the task awaiting its response, shared by every caller until
+        it finishes, or `None` if the client is already initialized.
+        """
+        if self._initialized:
+            return None
+        if self._initialize_task is None:
+            payload = _prepare_initialize_params(None)
+            self._adopt_initialize_params(payload)
+            pending = self._begin_request(INITIALIZE_METHOD, payload)
+            task = asyncio.create_task(self._finish_initialize(pending, timeout=None))
+            task.add_done_callback(self._initialize_task_done)
+            self._initialize_task = task
+        return self._initialize_task
+
+    def _initialize_task_done(self, task: asyncio.Task[InitializeResult]) -> None:
+        # A failed handshake is reported to whoever awaits it next; forget the
+        # task so a later call can retry.
+        if task.cancelled() or task.exception() is not None:
+            if self._initialize_task is task:
+                self._initialize_task = None
+
+    async def _finish_initialize(
+        self,
+        pending: _PendingRequest,
+        *,
+        timeout: float | None,
+    ) -> InitializeResult:
+        result = await self._finish_request(pending, timeout=timeout)
         self._initialized = True
-        return InitializeResult(
-            protocol_version=_find_first_string_by_exact_keys(
-                result_dict,
-                {"protocolversion", "protocol_version"},
-            ),
-            server_info=_find_first_dict_by_exact_key(result_dict, {"serverinfo", "server_info"}),
-            capabilities=_find_first_dict_by_exact_key(result_dict, {"capabilities"}),
-            raw=result_dict,
-        )
+        self._initialize_result = _parse_initialize_result(result)
+        return self._initialize_result
+
+    def _adopt_initialize_params(self, payload: Mapping[str, Any]) -> None:
+        if self._ignore_follows_opt_out:
+            self._ignored_notification_methods = _ignorable_methods(
+                _initialize_opt_out_methods(payload)
+            )
 
     async def request(
         self,
@@ -554,6 +1355,36 @@ class CodexClient:
             CodexTimeoutError: If no response arrives within timeout.
             CodexProtocolError: If response contains JSON-RPC error payload.
         """
+        return await self._request(method, params, timeout=timeout)
+
+    async def _request(
+        self,
+        method: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        timeout: float | None = None,
+        discard_result: bool = False,
+    ) -> Any:
+        """Implement `request()`.
+
+        With `discard_result=True` a successful response is not decoded and
+        `None` is returned; error responses are still decoded and raised.
+        """
+        pending = self._begin_request(method, params, discard_result=discard_result)
+        return await self._finish_request(pending, timeout=timeout)
+
+    def _begin_request(
+        self,
+        method: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        discard_result: bool = False,
+    ) -> _PendingRequest:
+        """Register a request and queue it for writing without suspending.
+
+        Requests begun back-to-back are written in that order, which is what
+        lets pipelined startup put `thread/start` right behind `initialize`.
+        """
         if self._closed:
             raise CodexTransportError("client is closed")
 
@@ -564,15 +1395,41 @@ class CodexClient:
         loop = asyncio.get_running_loop()
         future: asyncio.Future[dict[str, Any]] = loop.create_future()
         self._pending[request_id] = future
+        if discard_result:
+            self._discarded_results.add(request_id)
 
-        async with self._send_lock:
-            await self._transport.send(message)
+        flushed: Awaitable[None]
+        if self._writer_task is None:
+            flushed = self._transport.send(message)
+        else:
+            flushed = loop.create_future()
+            self._send_queue.put(
+                _OutboundMessage(message, flushed, _REQUEST_SEND_LANES.get(method, "normal"))
+            )
+        return _PendingRequest(request_id, method, future, flushed)
+
+    async def _finish_request(
+        self,
+        pending: _PendingRequest,
+        *,
+        timeout: float | None = None,
+    ) -> Any:
+        """Wait for a begun request to be written and answered; return its `result`."""
+        request_id = pending.request_id
+        method = pending.method
+        try:
+            await pending.flushed
+        except BaseException:
+            self._pending.pop(request_id, None)
+            self._discarded_results.discard(request_id)
+            raise
 
         timeout_seconds = timeout if timeout is not None else self._request_timeout
         try:
-            response = await asyncio.wait_for(future, timeout=timeout_seconds)
+            response = await asyncio.wait_for(pending.response, timeout=timeout_seconds)
         except asyncio.TimeoutError as exc:
             self._pending.pop(request_id, None)
+            self._discarded_results.discard(request_id)
             raise CodexTimeoutError(
                 f"request timed out for method={method!r} after {timeout_seconds:.1f}s"
             ) from exc
@@ -589,6 +1446,87 @@ class CodexClient:
             )
         return response.get("result")
 
+    async def _initialized_request(
+        self,
+        method: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        discard_result: bool = False,
+    ) -> Any:
+        """Send a request that requires the `initialize` handshake.
+
+        Normally the handshake completes first. With `pipeline_startup` the
+        request is written right behind a pending `initialize` instead, and a
+        handshake failure is raised in preference to the request's own error.
+        """
+        if not self._pipeline_startup or self._writer_task is None:
+            if not self._initialized:
+                await self.initialize()
+            return await self._request(method, params, discard_result=discard_result)
+
+        handshake = self._begin_initialize()
+        try:
+            result = await self._request(method, params, discard_result=discard_result)
+        except CodexError:
+            if handshake is not None:
+                await asyncio.shield(handshake)
+            raise
+        if handshake is not None:
+            await asyncio.shield(handshake)
+        return result
+
+    @property
+    def closed(self) -> bool:
+        """Whether `close()` was called on this client."""
+        return self._closed
+
+    @property
+    def active_turns(self) -> int:
+        """Turns on this connection whose events are still being tracked.
+
+        Includes turns left running after `CodexTurnInactiveError` until they
+        are continued to completion or cancelled.
+        """
+        return len(self._turn_sessions)
+
+    def stats(self) -> ClientStats:
+        """Return a snapshot of internal counters for this client.
+
+        Returns:
+            `ClientStats` with id-extraction, notification buffer, and
+            outbound lane counters.
+        """
+        return ClientStats(
+            id_fast_path_hits=self._counters.id_fast_path_hits,
+            id_fallback_scans=self._counters.id_fallback_scans,
+            orphaned_notifications=self._counters.orphaned_notifications,
+            dropped_notifications=self._counters.dropped_notifications,
+            skipped_notifications=self._counters.skipped_notifications,
+            skipped_results=self._counters.skipped_results,
+            template_primes=self._counters.template_primes,
+            skipped_resumes=self._counters.skipped_resumes,
+            queued_turns=sum(len(queue.pending) for queue in self._turn_queues.values()),
+            primed_templates=len(self._primed_templates),
+            buffered_notifications=len(self._deferred_notifications),
+            send_lanes=self._send_queue.stats(),
+        )
+
+    def set_orphan_handler(self, handler: OrphanHandler | None) -> None:
+        """Set or clear a callback for notifications no turn waiter will receive.
+
+        The handler is called synchronously from the receiver loop with the raw
+        notification and an `OrphanDropReason`:
+
+        - `unroutable`: the event carries no turn id (for example thread-level
+          notifications);
+        - `late`: the event belongs to a turn this client already finished;
+        - `expired`: the event was held longer than `orphan_notification_ttl`;
+        - `evicted`: the event was pushed out by `max_orphan_notifications`.
+
+        Handler exceptions are suppressed.
+        """
+        self._deferred_notifications.handler = handler
+
     def set_approval_handler(
         self,
         handler: (
@@ -609,6 +1547,64 @@ class CodexClient:
         """
         self._approval_handler = handler
 
+    def set_turn_scheduler(self, scheduler: TurnScheduler | None) -> None:
+        """Set or clear the `TurnScheduler` that admits new turns.
+
+        When set, every new turn waits for admission before its thread is
+        prepared and `turn/start` is sent, and holds its slot until the turn
+        completes, fails, or is cleaned up. Pass `schedule=TurnSchedule(...)`
+        to `chat_once()`/`chat()` to set priority, fairness key and deadline.
+        """
+        self._turn_scheduler = scheduler
+
+    def set_command_output_monitor(self, monitor: CommandOutputMonitor | None) -> None:
+        """Set or clear the `CommandOutputMonitor` fed with command output deltas.
+
+        `CommandOutputMonitor.start()` calls this; the monitor sees every routed
+        notification and streams `item/commandExecution/outputDelta` chunks per
+        item id.
+        """
+        previous = self._command_output_monitor
+        self._command_output_monitor = monitor
+        if previous is not None and previous is not monitor:
+            previous._close_streams(None)
+
+    @property
+    def command_output_monitor(self) -> CommandOutputMonitor | None:
+        """The attached `CommandOutputMonitor`, if any."""
+        return self._command_output_monitor
+
+    def pause_receiving(self) -> None:
+        """Stop reading the transport after the current batch until resumed.
+
+        Pauses nest; the receiver resumes once every pause is released. While
+        paused the transport's own buffering back-pressures the server, and
+        no response or event on this connection is delivered.
+        """
+        self._receive_pauses += 1
+        self._receive_resumed.clear()
+
+    def resume_receiving(self) -> None:
+        """Release one `pause_receiving()`."""
+        if self._receive_pauses > 0:
+            self._receive_pauses -= 1
+            if self._receive_pauses == 0:
+                self._receive_resumed.set()
+
+    @property
+    def thread_prefetcher(self) -> ThreadPrefetcher | None:
+        """The attached `ThreadPrefetcher`, if any."""
+        return self._thread_prefetcher
+
+    def set_thread_prefetcher(self, prefetcher: ThreadPrefetcher | None) -> None:
+        """Set or clear the `ThreadPrefetcher` consulted for new threads.
+
+        When set, `start_thread()` and `chat_once()`/`chat()` without a
+        `thread_id` take a pre-created thread with a matching config if one
+        is ready, and only send `thread/start` inline otherwise.
+        """
+        self._thread_prefetcher = prefetcher
+
     async def approval_requests(self) -> AsyncIterator[ApprovalRequest]:
         """Yield parsed approval requests from the server.
 
@@ -639,8 +1635,7 @@ class CodexClient:
         self._pending_approval_requests.pop(request.request_id, None)
         result_payload = _encode_approval_result(request, decision)
         response = make_result_response(request.request_id, result_payload)
-        async with self._send_lock:
-            await self._transport.send(response)
+        await self._send(response, lane="approval")
 
     async def approve_approval(
         self,
@@ -689,15 +1684,30 @@ class CodexClient:
         Raises:
             CodexProtocolError: If server response lacks thread id.
         """
-        if not self._initialized:
-            await self.initialize()
+        thread_id = self._take_prefetched_thread(config) or await self.create_thread(config)
+        return ThreadHandle(self, thread_id, defaults=config if config is not None else ThreadConfig())
 
+    async def create_thread(self, config: ThreadConfig | None = None) -> str:
+        """Send `thread/start` now and return the new thread id.
+
+        Unlike `start_thread()`, this never takes a prefetched thread and
+        returns no handle; `ThreadPrefetcher` uses it to fill its buckets.
+
+        Raises:
+            CodexProtocolError: If server response lacks thread id.
+        """
         params = _thread_config_to_params(config)
-        result = await self.request(THREAD_START_METHOD, params)
-        thread_id = _extract_thread_id(result)
+        result = await self._initialized_request(THREAD_START_METHOD, params)
+        thread_id = self._result_thread_id(THREAD_START_METHOD, result)
         if not thread_id:
             raise CodexProtocolError("thread/start succeeded but no thread id found")
-        return ThreadHandle(self, thread_id, defaults=config if config is not None else ThreadConfig())
+        self._mark_thread_live(thread_id, params)
+        return thread_id
+
+    def _take_prefetched_thread(self, config: ThreadConfig | None) -> str | None:
+        if self._thread_prefetcher is None:
+            return None
+        return self._thread_prefetcher.acquire_nowait(config)
 
     async def resume_thread(
         self,
@@ -714,13 +1724,11 @@ class CodexClient:
         Returns:
             `ThreadHandle` bound to resumed thread id.
         """
-        if not self._initialized:
-            await self.initialize()
-
-        params: dict[str, Any] = {"threadId": thread_id}
-        params.update(_thread_config_to_params(overrides))
-        result = await self.request(THREAD_RESUME_METHOD, params)
-        resolved_thread_id = _extract_thread_id(result) or thread_id
+        config_params = _thread_config_to_params(overrides)
+        params: dict[str, Any] = {"threadId": thread_id, **config_params}
+        result = await self._initialized_request(THREAD_RESUME_METHOD, params)
+        resolved_thread_id = self._result_thread_id(THREAD_RESUME_METHOD, result) or thread_id
+        self._mark_thread_live(resolved_thread_id, config_params)
         return ThreadHandle(
             self,
             resolved_thread_id,
@@ -745,15 +1753,17 @@ class CodexClient:
         Raises:
             CodexProtocolError: If server response lacks forked thread id.
         """
-        if not self._initialized:
-            await self.initialize()
-
-        params: dict[str, Any] = {"threadId": thread_id}
-        params.update(_thread_config_to_params(overrides))
-        result = await self.request(THREAD_FORK_METHOD, params)
-        forked_thread_id = _extract_thread_id(result)
+        config_params = _thread_config_to_params(overrides)
+        params: dict[str, Any] = {"threadId": thread_id, **config_params}
+        result = await self._initialized_request(THREAD_FORK_METHOD, params)
+        forked_thread_id = self._result_thread_id(THREAD_FORK_METHOD, result)
         if not forked_thread_id:
             raise CodexProtocolError("thread/fork succeeded but no forked thread id found")
+        # The fork inherits whatever the source had applied on this connection.
+        self._mark_thread_live(
+            forked_thread_id,
+            {**self._live_threads.get(thread_id, {}), **config_params},
+        )
         return ThreadHandle(
             self,
             forked_thread_id,
@@ -767,11 +1777,106 @@ class CodexClient:
             thread_id: Target thread id.
             overrides: Thread-level fields applied through `thread/resume`.
         """
-        if not self._initialized:
-            await self.initialize()
-        params: dict[str, Any] = {"threadId": thread_id}
-        params.update(_thread_config_to_params(overrides))
-        await self.request(THREAD_RESUME_METHOD, params)
+        config_params = _thread_config_to_params(overrides)
+        params: dict[str, Any] = {"threadId": thread_id, **config_params}
+        await self._initialized_request(THREAD_RESUME_METHOD, params, discard_result=True)
+        self._mark_thread_live(thread_id, config_params)
+
+    async def fork_template(
+        self,
+        template: ThreadTemplate,
+        *,
+        overrides: ThreadConfig | None = None,
+    ) -> ThreadHandle:
+        """Fork a fresh thread from a primed template thread.
+
+        The first call for `template.name` creates the template thread and
+        runs its priming turns; later calls only send `thread/fork`. If the
+        template's inputs changed since it was primed, the old template thread
+        is archived and the template is primed again.
+
+        Args:
+            template: Template to fork from.
+            overrides: Optional thread-level overrides for the forked thread.
+
+        Returns:
+            `ThreadHandle` bound to the forked thread id.
+
+        Raises:
+            CodexProtocolError: If `thread/fork` fails for a reason other than
+                a missing or unloaded template thread, or fails again after
+                the template was primed once more.
+        """
+        defaults = template.config if template.config is not None else ThreadConfig()
+        thread_id = await self._primed_template_thread(template)
+        try:
+            return await ThreadHandle(self, thread_id, defaults=defaults).fork(overrides=overrides)
+        except CodexProtocolError as exc:
+            if not _is_missing_thread_error(exc):
+                raise
+            # The template thread was archived or lost server-side; prime once
+            # more before giving up.
+            self._drop_primed_template(template.name, thread_id)
+        thread_id = await self._primed_template_thread(template)
+        return await ThreadHandle(self, thread_id, defaults=defaults).fork(overrides=overrides)
+
+    async def invalidate_template(self, name: str | None = None) -> None:
+        """Forget and archive primed template threads.
+
+        Args:
+            name: Template name to invalidate. If omitted, every primed
+                template is invalidated.
+        """
+        names = [name] if name is not None else list(self._primed_templates)
+        for template_name in names:
+            entry = self._primed_templates.pop(template_name, None)
+            if entry is not None:
+                with contextlib.suppress(CodexError):
+                    await self.archive_thread(entry.thread_id)
+
+    async def _primed_template_thread(self, template: ThreadTemplate) -> str:
+        """Return the primed thread id for `template`, priming it if needed."""
+        fingerprint = _template_fingerprint(template)
+        lock = self._template_locks.setdefault(template.name, asyncio.Lock())
+        async with lock:
+            entry = self._primed_templates.get(template.name)
+            if entry is not None and entry.fingerprint == fingerprint:
+                self._primed_templates.move_to_end(template.name)
+                return entry.thread_id
+            if entry is not None:
+                self._drop_primed_template(template.name, entry.thread_id)
+
+            handle = await self.start_thread(template.config)
+            try:
+                for prompt in template.priming_prompts:
+                    await self.chat_once(
+                        prompt,
+                        handle.thread_id,
+                        turn_overrides=template.turn_overrides,
+                    )
+            except BaseException:
+                self._archive_in_background(handle.thread_id)
+                raise
+            self._counters.template_primes += 1
+            self._primed_templates[template.name] = _PrimedTemplate(fingerprint, handle.thread_id)
+            while len(self._primed_templates) > self._max_primed_templates:
+                evicted_name, evicted = next(iter(self._primed_templates.items()))
+                self._drop_primed_template(evicted_name, evicted.thread_id)
+            return handle.thread_id
+
+    def _drop_primed_template(self, name: str, thread_id: str) -> None:
+        entry = self._primed_templates.get(name)
+        if entry is not None and entry.thread_id == thread_id:
+            del self._primed_templates[name]
+            self._archive_in_background(thread_id)
+
+    def _archive_in_background(self, thread_id: str) -> None:
+        if not self._closed:
+            self._spawn_background_task(self._archive_quietly(thread_id))
+
+    async def _archive_quietly(self, thread_id: str) -> None:
+        with contextlib.suppress(CodexError):
+            await self.archive_thread(thread_id)
 
     async def read_thread(self, thread_id: str, *, include_turns: bool = True) -> Any:
         """Read server-side thread state.
@@ -835,7 +1940,11 @@ class CodexClient:
             thread_id: Target thread id.
             name: Thread display name.
         """
-        await self.request(THREAD_NAME_SET_METHOD, {"threadId": thread_id, "name": name})
+        await self._request(
+            THREAD_NAME_SET_METHOD,
+            {"threadId": thread_id, "name": name},
+            discard_result=True,
+        )
 
     async def archive_thread(self, thread_id: str) -> None:
         """Archive a thread.
@@ -843,7 +1952,8 @@ class CodexClient:
         Args:
             thread_id: Target thread id.
         """
-        await self.request(THREAD_ARCHIVE_METHOD, {"threadId": thread_id})
+        self._live_threads.pop(thread_id, None)
+        await self._request(THREAD_ARCHIVE_METHOD, {"threadId": thread_id}, discard_result=True)
 
     async def unarchive_thread(self, thread_id: str) -> None:
         """Unarchive a thread.
@@ -851,7 +1961,7 @@ class CodexClient:
         Args:
             thread_id: Target thread id.
         """
-        await self.request(THREAD_UNARCHIVE_METHOD, {"threadId": thread_id})
+        await self._request(THREAD_UNARCHIVE_METHOD, {"threadId": thread_id}, discard_result=True)
 
     async def compact_thread(self, thread_id: str) -> Any:
         """Start compaction for thread history.
@@ -1079,6 +2189,7 @@ class CodexClient:
         turn_overrides: TurnOverrides | None = None,
         inactivity_timeout: float | None = None,
         continuation: ChatContinuation | None = None,
+        schedule: TurnSchedule | None = None,
     ) -> ChatResult:
         """Send one user message and wait for final assistant output.
 
@@ -1098,6 +2209,8 @@ class CodexClient:
                 wait is unbounded by inactivity.
             continuation: Continuation token from `CodexTurnInactiveError` for
                 resuming the same running turn.
+            schedule: Optional priority, fairness key and admission deadline
+                used by the attached `TurnScheduler`. Ignored without one.
 
         Returns:
             `ChatResult` with final assistant text and raw consumed events.
@@ -1109,11 +2222,13 @@ class CodexClient:
                 timeout. Includes resumable continuation token.
             CodexProtocolError: If turn fails or completion cannot be resolved.
             CodexTransportError: If transport fails while receiving events.
+            CodexTimeoutError: If `schedule.deadline` passes before the turn
+                is admitted by the attached `TurnScheduler`.
 
         Notes:
             When `continuation` is provided, `text`, `thread_id`, `user`,
-            `metadata`, `thread_config`, and `turn_overrides` cannot be
-            provided in the same call.
+            `metadata`, `thread_config`, `turn_overrides`, and `schedule`
+            cannot be provided in the same call.
         """
         if continuation is not None:
             if text is not None:
@@ -1128,6 +2243,8 @@ class CodexClient:
                 raise ValueError("thread_config cannot be used with continuation")
             if turn_overrides is not None:
                 raise ValueError("turn_overrides cannot be used with continuation")
+            if schedule is not None:
+                raise ValueError("schedule cannot be used with continuation")
             session = self._get_continuation_session(continuation, expected_mode="once")
             active_thread_id = session.thread_id
         else:
@@ -1140,11 +2257,30 @@ class CodexClient:
                 metadata=metadata,
                 thread_config=thread_config,
                 turn_overrides=turn_overrides,
+                schedule=schedule,
             )
 
         cursor = continuation.cursor if continuation is not None else len(session.raw_events)
-        timeout_value = self._resolve_inactivity_timeout(inactivity_timeout)
+        return await self._collect_chat_result(
+            session,
+            active_thread_id,
+            cursor=cursor,
+            timeout_value=self._resolve_inactivity_timeout(inactivity_timeout),
+        )
+
+    async def _collect_chat_result(
+        self,
+        session: _TurnSession,
+        active_thread_id: str,
+        *,
+        cursor: int,
+        timeout_value: float | None,
+        on_step: Callable[[ConversationStep], None] | None = None,
+    ) -> ChatResult:
+        """Wait for a started turn to finish and build its `ChatResult`.
 
+        `on_step` is called with every completed step as it arrives.
+        """
         while True:
             if session.failed:
                 self._cleanup_turn_state(session.turn_id)
@@ -1161,11 +2297,15 @@ class CodexClient:
             )
 
             if _is_transport_error_event(event):
-                message = _find_first_string_by_exact_keys(event, {"message"})
+                message = _find_first_string_by_exact_keys(event.raw, {"message"})
                 raise CodexTransportError(message or "transport failed")
 
+            step_count_before = len(session.step_records)
             self._apply_event_to_session(session, event)
             cursor = len(session.raw_events)
+            if on_step is not None:
+                for record in session.step_records[step_count_before:]:
+                    on_step(record.step)
 
         assistant_item_id: str | None = None
         final_text = ""
@@ -1212,6 +2352,7 @@ class CodexClient:
         turn_overrides: TurnOverrides | None = None,
         inactivity_timeout: float | None = None,
         continuation: ChatContinuation | None = None,
+        schedule: TurnSchedule | None = None,
     ) -> AsyncIterator[ConversationStep]:
         """Stream completed, non-delta conversation steps for one turn.
 
@@ -1231,6 +2372,8 @@ class CodexClient:
                 wait is unbounded by inactivity.
             continuation: Continuation token from `CodexTurnInactiveError` for
                 resuming the same running turn.
+            schedule: Optional priority, fairness key and admission deadline
+                used by the attached `TurnScheduler`. Ignored without one.
 
         Yields:
             Completed non-delta step blocks (`ConversationStep`), sourced from
@@ -1243,14 +2386,161 @@ class CodexClient:
                 timeout. Includes resumable continuation token.
             CodexProtocolError: If turn fails.
             CodexTransportError: If transport fails while receiving events.
+            CodexTimeoutError: If `schedule.deadline` passes before the turn
+                is admitted by the attached `TurnScheduler`.
 
         Notes:
             Streaming is live-notification based and intentionally does not
             backfill from `thread/read` snapshots for the same turn.
 
             When `continuation` is provided, `text`, `thread_id`, `user`,
-            `metadata`, `thread_config`, and `turn_overrides` cannot be
-            provided in the same call.
+            `metadata`, `thread_config`, `turn_overrides`, and `schedule`
+            cannot be provided in the same call.
+        """
+        session, cursor = await self._open_stream_session(
+            text=text,
+            thread_id=thread_id,
+            user=user,
+            metadata=metadata,
+            thread_config=thread_config,
+            turn_overrides=turn_overrides,
+            continuation=continuation,
+            schedule=schedule,
+        )
+        async for step in self._stream_turn(
+            session,
+            cursor=cursor,
+            timeout_value=self._resolve_inactivity_timeout(inactivity_timeout),
+            deltas=False,
+        ):
+            if isinstance(step, ConversationStep):
+                yield step
+
+    async def chat_deltas(
+        self,
+        text: str | None = None,
+        thread_id: str | None = None,
+        *,
+        user: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        thread_config: ThreadConfig | None = None,
+        turn_overrides: TurnOverrides | None = None,
+        inactivity_timeout: float | None = None,
+        continuation: ChatContinuation | None = None,
+        schedule: TurnSchedule | None = None,
+    ) -> AsyncIterator[AgentMessageDelta | ConversationStep]:
+        """Stream assistant text as it is generated, plus completed steps.
+
+        Yields an `AgentMessageDelta` for every `item/agentMessage/delta`
+        notification of the turn, as soon as it arrives, and the same
+        completed `ConversationStep`s as `chat()`. A completed agent message
+        whose `item/completed` carries no text gets the text assembled from
+        its deltas.
+
+        Arguments, errors and continuation rules are the same as `chat()`.
+        A continuation from this method may be resumed with either method.
+
+        Yields:
+            `AgentMessageDelta` chunks and completed `ConversationStep`
+            blocks, in arrival order.
+        """
+        session, cursor = await self._open_stream_session(
+            text=text,
+            thread_id=thread_id,
+            user=user,
+            metadata=metadata,
+            thread_config=thread_config,
+            turn_overrides=turn_overrides,
+            continuation=continuation,
+            schedule=schedule,
+        )
+        async for event in self._stream_turn(
+            session,
+            cursor=cursor,
+            timeout_value=self._resolve_inactivity_timeout(inactivity_timeout),
+            deltas=True,
+        ):
+            yield event
+
+    async def chat_batches(
+        self,
+        text: str | None = None,
+        thread_id: str | None = None,
+        *,
+        user: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        thread_config: ThreadConfig | None = None,
+        turn_overrides: TurnOverrides | None = None,
+        inactivity_timeout: float | None = None,
+        continuation: ChatContinuation | None = None,
+        schedule: TurnSchedule | None = None,
+        max_batch: int = 64,
+        max_delay: float = 0.0,
+    ) -> AsyncIterator[list[ConversationStep]]:
+        """Stream the same steps as `chat()`, as lists of already-available steps.
+
+        Each wake-up drains every event already in the turn's mailbox and
+        yields the resulting steps as one list, so bulk consumers can write
+        them with one I/O call. `max_delay` optionally waits a little longer
+        for more steps before yielding a list that is not full.
+
+        Arguments, errors and continuation rules are the same as `chat()`;
+        continuations from either method may be resumed with the other.
+
+        Args:
+            max_batch: Maximum steps per list.
+            max_delay: Seconds to keep collecting after the first step of a
+                list while it is not full. `0` yields as soon as no more
+                events are buffered.
+
+        Yields:
+            Non-empty lists of completed `ConversationStep` blocks in arrival
+            order. Steps collected before a failure are yielded before the
+            error is raised.
+
+        Raises:
+            ValueError: If `max_batch` is smaller than 1 or `max_delay` is
+                negative, or for the same reasons as `chat()`.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+        session, cursor = await self._open_stream_session(
+            text=text,
+            thread_id=thread_id,
+            user=user,
+            metadata=metadata,
+            thread_config=thread_config,
+            turn_overrides=turn_overrides,
+            continuation=continuation,
+            schedule=schedule,
+        )
+        async for batch in self._stream_turn_batches(
+            session,
+            cursor=cursor,
+            timeout_value=self._resolve_inactivity_timeout(inactivity_timeout),
+            max_batch=max_batch,
+            max_delay=max_delay,
+        ):
+            yield batch
+
+    async def _open_stream_session(
+        self,
+        *,
+        text: str | None,
+        thread_id: str | None,
+        user: str | None,
+        metadata: Mapping[str, Any] | None,
+        thread_config: ThreadConfig | None,
+        turn_overrides: TurnOverrides | None,
+        continuation: ChatContinuation | None,
+        schedule: TurnSchedule | None,
+    ) -> tuple[_TurnSession, int]:
+        """Start a streamed turn, or resume one from `continuation`.
+
+        Returns:
+            The turn session and the raw-event cursor to stream from.
         """
         if continuation is not None:
             if text is not None:
@@ -1265,31 +2555,59 @@ class CodexClient:
                 raise ValueError("thread_config cannot be used with continuation")
             if turn_overrides is not None:
                 raise ValueError("turn_overrides cannot be used with continuation")
-            session = self._get_continuation_session(
-                continuation,
-                expected_mode="stream",
-            )
-            cursor = max(0, continuation.cursor)
-        else:
-            if text is None:
-                raise ValueError("text is required when continuation is not provided")
-            _, session = await self._start_chat_turn(
-                text=text,
-                thread_id=thread_id,
-                user=user,
-                metadata=metadata,
-                thread_config=thread_config,
-                turn_overrides=turn_overrides,
-            )
-            cursor = len(session.raw_events)
-
-        timeout_value = self._resolve_inactivity_timeout(inactivity_timeout)
+            if schedule is not None:
+                raise ValueError("schedule cannot be used with continuation")
+            session = self._get_continuation_session(continuation, expected_mode="stream")
+            return session, max(0, continuation.cursor)
+
+        if text is None:
+            raise ValueError("text is required when continuation is not provided")
+        _, session = await self._start_chat_turn(
+            text=text,
+            thread_id=thread_id,
+            user=user,
+            metadata=metadata,
+            thread_config=thread_config,
+            turn_overrides=turn_overrides,
+            schedule=schedule,
+        )
+        return session, len(session.raw_events)
 
-        for record in session.step_records:
-            if record.event_index >= cursor:
-                yield record.step
-        if cursor < len(session.raw_events):
-            cursor = len(session.raw_events)
+    async def _stream_turn(
+        self,
+        session: _TurnSession,
+        *,
+        cursor: int,
+        timeout_value: float | None,
+        deltas: bool,
+    ) -> AsyncIterator[AgentMessageDelta | ConversationStep]:
+        """Yield a started turn's completed steps, and optionally its text deltas."""
+        # Text chunks per agent message item, joined only if the completed
+        # item turns out to carry no text of its own.
+        chunks: dict[str | None, list[str]] = {}
+
+        def _emit(index: int, raw: dict[str, Any], records: list[_StepRecord]) -> Iterable[Any]:
+            if deltas and raw.get("method") == ITEM_AGENT_MESSAGE_DELTA_METHOD:
+                delta = _agent_message_delta(raw, session)
+                if delta is not None:
+                    chunks.setdefault(delta.item_id, []).append(delta.delta)
+                    yield delta
+            for record in records:
+                if record.event_index != index:
+                    continue
+                step = record.step
+                if deltas and step.item_type == "agentMessage":
+                    buffered = chunks.pop(step.item_id, None)
+                    if not step.text and buffered:
+                        step = step.model_copy(update={"text": "".join(buffered)})
+                yield step
+
+        # Events consumed before this call (for example before a continuation).
+        replay = [record for record in session.step_records if record.event_index >= cursor]
+        for index in range(cursor, len(session.raw_events)):
+            for item in _emit(index, session.raw_events[index], replay):
+                yield item
+        cursor = max(cursor, len(session.raw_events))
 
         while True:
             if session.failed:
@@ -1308,15 +2626,312 @@ class CodexClient:
             )
 
             if _is_transport_error_event(event):
-                message = _find_first_string_by_exact_keys(event, {"message"})
+                message = _find_first_string_by_exact_keys(event.raw, {"message"})
                 raise CodexTransportError(message or "transport failed")
 
             step_count_before = len(session.step_records)
             self._apply_event_to_session(session, event)
             cursor = len(session.raw_events)
 
-            for record in session.step_records[step_count_before:]:
-                yield record.step
+            if deltas or len(session.step_records) > step_count_before:
+                for item in _emit(
+                    cursor - 1,
+                    event.raw,
+                    session.step_records[step_count_before:],
+                ):
+                    yield item
+
+    async def _stream_turn_batches(
+        self,
+        session: _TurnSession,
+        *,
+        cursor: int,
+        timeout_value: float | None,
+        max_batch: int,
+        max_delay: float,
+    ) -> AsyncIterator[list[ConversationStep]]:
+        """Yield a started turn's completed steps in lists of up to `max_batch`."""
+        loop = asyncio.get_running_loop()
+        # Steps consumed before this call (for example before a continuation).
+        pending = [record.step for record in session.step_records if record.event_index >= cursor]
+        cursor = max(cursor, len(session.raw_events))
+
+        while True:
+            error: CodexError | None = None
+            flush_at: float | None = None
+            while len(pending) < max_batch and not (session.failed or session.completed):
+                if not session.mailbox.empty():
+                    event = session.mailbox.get_nowait()
+                elif not pending:
+                    # Only an empty batch waits for the inactivity timeout, so
+                    # the continuation cursor never skips unyielded steps.
+                    event = await self._await_turn_event_or_timeout(
+                        session=session,
+                        timeout_value=timeout_value,
+                        cursor=cursor,
+                        mode="stream",
+                    )
+                elif max_delay > 0:
+                    if flush_at is None:
+                        flush_at = loop.time() + max_delay
+                    remaining = flush_at - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        event = await asyncio.wait_for(session.mailbox.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    break
+
+                if _is_transport_error_event(event):
+                    message = _find_first_string_by_exact_keys(event.raw, {"message"})
+                    error = CodexTransportError(message or "transport failed")
+                    break
+                step_count_before = len(session.step_records)
+                self._apply_event_to_session(session, event)
+                cursor = len(session.raw_events)
+                pending.extend(record.step for record in session.step_records[step_count_before:])
+
+            while pending:
+                batch, pending = pending[:max_batch], pending[max_batch:]
+                yield batch
+
+            if error is not None:
+                raise error
+            if session.failed:
+                self._cleanup_turn_state(session.turn_id)
+                raise CodexProtocolError(session.failure_message or "turn failed")
+            if session.completed:
+                self._cleanup_turn_state(session.turn_id)
+                return
+
+    def chat_batch(
+        self,
+        prompts: Iterable[str],
+        *,
+        concurrency: int = 8,
+        thread_config: ThreadConfig | None = None,
+        turn_overrides: TurnOverrides | None = None,
+        inactivity_timeout: float | None = None,
+        max_continuations: int = 3,
+        retries: int = 0,
+        schedule: TurnSchedule | None = None,
+    ) -> AsyncIterator[ChatBatchItem]:
+        """Run many prompts, each on a new thread, and yield results as they finish.
+
+        At most `concurrency` prompts run at once. `prompts` is consumed
+        lazily, so it may be a generator. A prompt that fails does not stop
+        the batch; its `ChatBatchItem` carries the error instead of a result.
+
+        Args:
+            prompts: User texts, one turn each.
+            concurrency: Maximum prompts running at once.
+            thread_config: Optional thread-level configuration for every
+                prompt's thread.
+            turn_overrides: Optional per-turn overrides for every prompt.
+            inactivity_timeout: Optional per-turn inactivity timeout override.
+            max_continuations: Times a prompt keeps waiting, through its
+                `ChatContinuation`, after the inactivity timeout fires. The
+                turn is cancelled when they run out.
+            retries: Times a prompt is re-run after its turn fails with
+                `CodexProtocolError`.
+            schedule: Optional admission options for the attached
+                `TurnScheduler`.
+
+        Returns:
+            Async iterator of `ChatBatchItem` in completion order. Closing it
+            early cancels the prompts still running.
+
+        Raises:
+            ValueError: If `concurrency` is smaller than 1 or
+                `max_continuations`/`retries` is negative.
+        """
+        return _chat_batch(
+            self.chat_once,
+            self.cancel,
+            prompts,
+            concurrency=concurrency,
+            max_continuations=max_continuations,
+            retries=retries,
+            inactivity_timeout=inactivity_timeout,
+            chat_kwargs={
+                "thread_config": thread_config,
+                "turn_overrides": turn_overrides,
+                "schedule": schedule,
+            },
+        )
+
+    async def chat_many(
+        self,
+        requests: Mapping[Hashable, str | ChatRequest],
+        *,
+        inactivity_timeout: float | None = None,
+    ) -> AsyncIterator[tuple[Hashable, ConversationStep | TurnEnded]]:
+        """Run many turns at once and stream all of their steps through one iterator.
+
+        Every turn is started when iteration begins. Their mailboxes feed one
+        shared, arrival-ordered queue straight from the receiver, so watching
+        many turns costs one consumer and one wake-up per receive batch
+        instead of one `chat()` task per turn.
+
+        Args:
+            requests: Turns to start, keyed by a caller-chosen turn key. A
+                plain string is shorthand for `ChatRequest(text)`.
+            inactivity_timeout: Optional per-turn inactivity timeout override.
+                A turn that stays silent that long ends with
+                `CodexTurnInactiveError`; the others keep streaming.
+
+        Yields:
+            `(turn_key, ConversationStep)` for every completed step, in
+            arrival order across turns, and exactly one
+            `(turn_key, TurnEnded)` per turn once it completes, fails, cannot
+            be started, or goes inactive.
+
+        Notes:
+            A turn that goes inactive is left running; resume it with
+            `chat(continuation=marker.error.continuation)` or pass the
+            continuation to `cancel()`. Closing the iterator early stops
+            watching the remaining turns and cancels those not started yet.
+        """
+        loop = asyncio.get_running_loop()
+        timeout_value = self._resolve_inactivity_timeout(inactivity_timeout)
+        merged = _MergedTurns()
+        turns: list[_MergedTurn] = []
+        # Started turns and their sessions by last activity, so the oldest
+        # deadline is first.
+        idle: OrderedDict[_MergedTurn, _TurnSession] = OrderedDict()
+
+        def _notify_started(turn: _MergedTurn, _start: asyncio.Task[Any]) -> None:
+            merged.notify(turn)
+
+        for key, request in requests.items():
+            if isinstance(request, str):
+                request = ChatRequest(request)
+            turn = _MergedTurn(key)
+            turn.mailbox = _MergedMailbox(merged, turn)
+            turn.start = asyncio.create_task(
+                self._start_chat_turn(
+                    text=request.text,
+                    thread_id=request.thread_id,
+                    user=request.user,
+                    metadata=request.metadata,
+                    thread_config=request.thread_config,
+                    turn_overrides=request.turn_overrides,
+                    schedule=request.schedule,
+                    mailbox=turn.mailbox,
+                )
+            )
+            turn.start.add_done_callback(functools.partial(_notify_started, turn))
+            turns.append(turn)
+
+        live = len(turns)
+
+        def _end(turn: _MergedTurn, **fields: Any) -> tuple[Hashable, TurnEnded]:
+            nonlocal live
+            live -= 1
+            turn.ended = True
+            idle.pop(turn, None)
+            if turn.mailbox is not None:
+                turn.mailbox.merged = None
+            session = turn.session
+            marker = TurnEnded(
+                thread_id=None if session is None else session.thread_id,
+                turn_id=None if session is None else session.turn_id,
+                **fields,
+            )
+            if session is not None and not isinstance(marker.error, CodexTurnInactiveError):
+                self._cleanup_turn_state(session.turn_id)
+            return turn.key, marker
+
+        try:
+            while live:
+                if not merged.ready:
+                    wait_for: float | None = None
+                    if timeout_value is not None and idle:
+                        oldest = next(iter(idle))
+                        wait_for = oldest.last_event_at + timeout_value - loop.time()
+                    if wait_for is None:
+                        await merged.wakeup.wait()
+                    elif wait_for > 0:
+                        with contextlib.suppress(asyncio.TimeoutError):
+                            await asyncio.wait_for(merged.wakeup.wait(), timeout=wait_for)
+                    merged.wakeup.clear()
+                    if timeout_value is not None and not merged.ready:
+                        now = loop.time()
+                        while idle:
+                            turn, session = next(iter(idle.items()))
+                            if turn.last_event_at + timeout_value > now:
+                                break
+                            yield _end(
+                                turn,
+                                error=CodexTurnInactiveError(
+                                    f"turn became inactive for {timeout_value:.1f}s",
+                                    continuation=self._make_continuation(
+                                        session,
+                                        cursor=len(session.raw_events),
+                                        mode="stream",
+                                    ),
+                                    idle_seconds=timeout_value,
+                                ),
+                            )
+                    continue
+
+                turn = merged.ready.popleft()
+                if turn.ended or turn.mailbox is None or turn.start is None:
+                    continue
+                if turn.session is None:
+                    if not turn.start.done():
+                        # Events that raced ahead of `turn/start` wait in the mailbox.
+                        continue
+                    start_error = turn.start.exception()
+                    if start_error is not None:
+                        yield _end(turn, error=start_error)
+                        continue
+                    _, turn.session = turn.start.result()
+                    turn.last_event_at = loop.time()
+                    idle[turn] = turn.session
+                    events = []
+                    while not turn.mailbox.empty():
+                        events.append(turn.mailbox.get_nowait())
+                elif turn.mailbox.empty():
+                    continue
+                else:
+                    events = [turn.mailbox.get_nowait()]
+
+                session = turn.session
+                for event in events:
+                    if _is_transport_error_event(event):
+                        message = _find_first_string_by_exact_keys(event.raw, {"message"})
+                        yield _end(turn, error=CodexTransportError(message or "transport failed"))
+                        break
+                    step_count_before = len(session.step_records)
+                    self._apply_event_to_session(session, event)
+                    for record in session.step_records[step_count_before:]:
+                        yield turn.key, record.step
+                    if session.failed:
+                        failure = CodexProtocolError(session.failure_message or "turn failed")
+                        yield _end(turn, error=failure)
+                        break
+                    if session.completed:
+                        messages = session.completed_agent_messages
+                        yield _end(turn, final_text=messages[-1][1] if messages else None)
+                        break
+                    turn.last_event_at = loop.time()
+                    idle.move_to_end(turn)
+        finally:
+            for turn in turns:
+                if turn.mailbox is not None:
+                    turn.mailbox.merged = None
+                if turn.ended or turn.start is None:
+                    continue
+                if not turn.start.done():
+                    turn.start.cancel()
+                    continue
+                if turn.start.cancelled() or turn.start.exception() is not None:
+                    continue
+                # Nobody holds a continuation for this turn, so stop tracking it.
+                self._cleanup_turn_state(turn.start.result()[1].turn_id)
 
     async def cancel(
         self,
@@ -1492,10 +3107,44 @@ class CodexClient:
         metadata: Mapping[str, Any] | None,
         thread_config: ThreadConfig | None,
         turn_overrides: TurnOverrides | None,
+        schedule: TurnSchedule | None = None,
+        mailbox: asyncio.Queue[_EventEnvelope] | None = None,
     ) -> tuple[str, _TurnSession]:
-        if not self._initialized:
-            await self.initialize()
+        admission: TurnAdmission | None = None
+        if self._turn_scheduler is not None:
+            admission = await self._turn_scheduler.acquire(schedule, default_key=thread_id or "")
+        try:
+            return await self._start_admitted_turn(
+                text=text,
+                thread_id=thread_id,
+                user=user,
+                metadata=metadata,
+                thread_config=thread_config,
+                turn_overrides=turn_overrides,
+                admission=admission,
+                mailbox=mailbox,
+            )
+        except CodexProtocolError as exc:
+            if admission is not None:
+                admission.release(error_code=exc.code)
+            raise
+        except BaseException:
+            if admission is not None:
+                admission.release(failed=True)
+            raise
 
+    async def _start_admitted_turn(
+        self,
+        *,
+        text: str,
+        thread_id: str | None,
+        user: str | None,
+        metadata: Mapping[str, Any] | None,
+        thread_config: ThreadConfig | None,
+        turn_overrides: TurnOverrides | None,
+        admission: TurnAdmission | None,
+        mailbox: asyncio.Queue[_EventEnvelope] | None = None,
+    ) -> tuple[str, _TurnSession]:
         active_thread_id = await self._prepare_thread_context(
             thread_id=thread_id,
             thread_config=thread_config,
@@ -1511,13 +3160,20 @@ class CodexClient:
             turn_params["metadata"] = dict(metadata)
         turn_params.update(_turn_overrides_to_params(turn_overrides))
 
-        turn_result = await self.request(TURN_START_METHOD, turn_params)
-        turn_id = _extract_turn_id(turn_result)
+        try:
+            turn_result = await self.request(TURN_START_METHOD, turn_params)
+        except CodexProtocolError:
+            # The server may have unloaded the thread; resume it next time.
+            self._live_threads.pop(active_thread_id, None)
+            raise
+        turn_id = self._result_turn_id(TURN_START_METHOD, turn_result)
         if not turn_id:
             raise CodexProtocolError("turn/start succeeded but no turn id found")
 
-        session = _TurnSession(thread_id=active_thread_id, turn_id=turn_id)
-        self._turn_sessions[turn_id] = session
+        session = _TurnSession(thread_id=active_thread_id, turn_id=turn_id, admission=admission)
+        if mailbox is not None:
+            session.mailbox = mailbox
+        self._register_turn_session(session)
         return active_thread_id, session
 
     async def _prepare_thread_context(
@@ -1528,22 +3184,38 @@ class CodexClient:
     ) -> str:
         """Start or resume a thread and return the active thread id."""
         if thread_id is None:
-            thread_params = _thread_config_to_params(thread_config)
-            thread_result = await self.request(THREAD_START_METHOD, thread_params)
-            active_thread_id = _extract_thread_id(thread_result)
-            if not active_thread_id:
-                raise CodexProtocolError("thread/start succeeded but no thread id found")
-            return active_thread_id
-
-        resume_params: dict[str, Any] = {"threadId": thread_id}
-        resume_params.update(_thread_config_to_params(thread_config))
+            return self._take_prefetched_thread(thread_config) or await self.create_thread(
+                thread_config
+            )
+
+        config_params = _thread_config_to_params(thread_config)
+        if self._thread_is_current(thread_id, config_params):
+            self._counters.skipped_resumes += 1
+            return thread_id
         try:
-            await self.request(THREAD_RESUME_METHOD, resume_params)
+            await self._initialized_request(
+                THREAD_RESUME_METHOD,
+                {"threadId": thread_id, **config_params},
+                discard_result=True,
+            )
         except CodexProtocolError:
-            if self._strict:
+            # A failed pipelined handshake surfaces here too; never swallow it.
+            if self._strict or not self._initialized:
                 raise
+        else:
+            self._mark_thread_live(thread_id, config_params)
         return thread_id
 
+    def _mark_thread_live(self, thread_id: str, config_params: Mapping[str, Any]) -> None:
+        self._live_threads.setdefault(thread_id, {}).update(config_params)
+
+    def _thread_is_current(self, thread_id: str, config_params: Mapping[str, Any]) -> bool:
+        """Whether `thread_id` is live here with every param in `config_params` applied."""
+        applied = self._live_threads.get(thread_id)
+        if applied is None:
+            return False
+        return all(key in applied and applied[key] == value for key, value in config_params.items())
+
     def _get_continuation_session(
         self,
         continuation: ChatContinuation,
@@ -1586,7 +3258,7 @@ class CodexClient:
 
             try:
                 event = await self._receive_turn_event(
-                    session.turn_id,
+                    session,
                     inactivity_timeout=timeout_value,
                 )
             except asyncio.TimeoutError:
@@ -1599,39 +3271,15 @@ class CodexClient:
 
     async def _receive_turn_event(
         self,
-        turn_id: str,
+        session: _TurnSession,
         *,
         inactivity_timeout: float | None,
-    ) -> dict[str, Any]:
-        loop = asyncio.get_running_loop()
-        deadline = None
-        if inactivity_timeout is not None:
-            deadline = loop.time() + inactivity_timeout
-
-        while True:
-            deferred_idx = self._find_deferred_for_turn(turn_id)
-            if deferred_idx is not None:
-                return self._deferred_notifications.pop(deferred_idx)
-
-            wait_timeout: float | None = None
-            if deadline is not None:
-                remaining = deadline - loop.time()
-                if remaining <= 0:
-                    raise asyncio.TimeoutError
-                wait_timeout = remaining
-
-            if wait_timeout is None:
-                event = await self._notifications.get()
-            else:
-                event = await asyncio.wait_for(
-                    self._notifications.get(),
-                    timeout=wait_timeout,
-                )
-
-            if _is_transport_error_event(event) or self._event_is_for_turn(event, turn_id):
-                return event
-
-            self._deferred_notifications.append(event)
+    ) -> _EventEnvelope:
+        if not session.mailbox.empty():
+            return session.mailbox.get_nowait()
+        if inactivity_timeout is None:
+            return await session.mailbox.get()
+        return await asyncio.wait_for(session.mailbox.get(), timeout=inactivity_timeout)
 
     async def _await_turn_event_or_timeout(
         self,
@@ -1640,16 +3288,16 @@ class CodexClient:
         timeout_value: float | None,
         cursor: int,
         mode: Literal["once", "stream"],
-    ) -> dict[str, Any]:
+    ) -> _EventEnvelope:
         if timeout_value is None:
             return await self._receive_turn_event(
-                session.turn_id,
+                session,
                 inactivity_timeout=None,
             )
 
         try:
             return await self._receive_turn_event(
-                session.turn_id,
+                session,
                 inactivity_timeout=timeout_value,
             )
         except asyncio.TimeoutError as exc:
@@ -1663,87 +3311,239 @@ class CodexClient:
                 idle_seconds=timeout_value,
             ) from exc
 
-    def _find_deferred_for_turn(self, turn_id: str) -> int | None:
-        for idx, event in enumerate(self._deferred_notifications):
-            if _is_transport_error_event(event) or self._event_is_for_turn(event, turn_id):
-                return idx
-        return None
-
-    def _event_is_for_turn(self, event: dict[str, Any], turn_id: str) -> bool:
-        if _event_mentions_turn_id(event, turn_id):
-            return True
-
-        method = event.get("method")
-        if not isinstance(method, str):
-            return False
-
-        if not (is_turn_completed(method) or is_turn_failed(method)):
-            return False
-
-        params = event.get("params")
-        if not isinstance(params, Mapping):
-            return True
+    def _make_envelope(self, payload: dict[str, Any], method: str) -> _EventEnvelope:
+        """Build the routing envelope for one notification or server request."""
+        params_obj = payload.get("params")
+        params = params_obj if isinstance(params_obj, dict) else None
+        thread_id, turn_id = self._event_ids(payload, method, params)
 
-        has_direct_turn = (
-            _find_first_string_by_exact_keys(params, {"turnid", "turn_id"}) is not None
+        envelope = _EventEnvelope(
+            method=method,
+            raw=payload,
+            thread_id=thread_id,
+            turn_id=turn_id,
+            params=params,
         )
-        turn_obj = _find_first_dict_by_exact_key(params, {"turn"})
-        has_turn_obj = False
-        if turn_obj is not None:
-            has_turn_obj = _find_first_string_by_exact_keys(turn_obj, {"id"}) is not None
+        if params is not None:
+            item = params.get("item")
+            if isinstance(item, dict):
+                envelope.item = item
+                item_type = item.get("type")
+                if isinstance(item_type, str):
+                    envelope.item_type = item_type
+                item_id = item.get("id")
+                if isinstance(item_id, str):
+                    envelope.item_id = item_id
+        return envelope
+
+    def _event_ids(
+        self,
+        payload: dict[str, Any],
+        method: str,
+        params: dict[str, Any] | None,
+    ) -> tuple[str | None, str | None]:
+        """Return `(thread_id, turn_id)` for a notification or server request.
 
-        return not has_direct_turn and not has_turn_obj
+        Known method shapes are read directly from `params`; anything else falls
+        back to a recursive payload search.
+        """
+        shape = _ID_SHAPES.get(method)
+        if shape is not None and params is not None:
+            turn_id = _read_first_path(params, shape.turn_paths)
+            if turn_id is not None:
+                self._counters.id_fast_path_hits += 1
+                return _read_first_path(params, shape.thread_paths), turn_id
+
+        self._counters.id_fallback_scans += 1
+        return _extract_thread_id_from_params(payload), _extract_turn_id(payload)
+
+    def _result_thread_id(self, method: str, result: Any) -> str | None:
+        """Return the thread id from a known request result shape."""
+        shape = _ID_SHAPES.get(method)
+        if shape is not None:
+            thread_id = _read_first_path(result, shape.thread_paths)
+            if thread_id is not None:
+                self._counters.id_fast_path_hits += 1
+                return thread_id
+        self._counters.id_fallback_scans += 1
+        return _extract_thread_id(result)
+
+    def _result_turn_id(self, method: str, result: Any) -> str | None:
+        """Return the turn id from a known request result shape."""
+        shape = _ID_SHAPES.get(method)
+        if shape is not None:
+            turn_id = _read_first_path(result, shape.turn_paths)
+            if turn_id is not None:
+                self._counters.id_fast_path_hits += 1
+                return turn_id
+        self._counters.id_fallback_scans += 1
+        return _extract_turn_id(result)
+
+    def _register_turn_session(self, session: _TurnSession) -> None:
+        """Register a turn session and hand it any notifications that raced ahead."""
+        self._turn_sessions[session.turn_id] = session
+        for event in self._deferred_notifications.pop(session.turn_id):
+            _deliver_event(session, event)
+        for event in self._deferred_notifications.pop(None):
+            _deliver_event(session, event)
+        if self._transport_failure is not None:
+            session.mailbox.put_nowait(self._transport_failure)
+
+    def _route_notification(self, envelope: _EventEnvelope) -> None:
+        """Deliver one notification to the mailbox of the turn it belongs to.
+
+        Events for turns that have no registered session yet are parked by turn
+        id until `_register_turn_session()` claims them. Terminal events without
+        any turn id go to the oldest live turn, matching the first-waiter
+        semantics of a shared queue.
+        """
+        if self._command_output_monitor is not None:
+            self._command_output_monitor._observe(envelope)
+        turn_id = envelope.turn_id
+        if turn_id is None:
+            method = envelope.method
+            if not (is_turn_completed(method) or is_turn_failed(method)):
+                # Thread-level events can never be claimed by a turn waiter.
+                self._deferred_notifications.drop(envelope, "unroutable")
+                return
+            session = next(iter(self._turn_sessions.values()), None)
+        else:
+            session = self._turn_sessions.get(turn_id)
 
-    def _apply_event_to_session(self, session: _TurnSession, event: dict[str, Any]) -> None:
-        method = event.get("method")
-        if not isinstance(method, str):
+        if session is not None:
+            _deliver_event(session, envelope)
             return
-
-        session.raw_events.append(event)
+        self._deferred_notifications.add(turn_id, envelope)
+
+    def _fail_turn_waiters(self, envelope: _EventEnvelope) -> None:
+        """Wake every live turn waiter with a transport error event."""
+        self._transport_failure = envelope
+        # Live-thread state is per connection.
+        self._live_threads.clear()
+        for session in self._turn_sessions.values():
+            session.mailbox.put_nowait(envelope)
+            _release_admission(session, failed=True)
+        if self._command_output_monitor is not None:
+            self._command_output_monitor._close_streams(None)
+
+    def _apply_event_to_session(self, session: _TurnSession, envelope: _EventEnvelope) -> None:
+        method = envelope.method
+        session.raw_events.append(envelope.raw)
         event_index = len(session.raw_events) - 1
 
-        completed_message = _extract_completed_agent_message(method, event)
-        if completed_message is not None:
-            item_id, _ = completed_message
-            if item_id is None or item_id not in session.completed_item_ids:
-                if item_id is not None:
-                    session.completed_item_ids.add(item_id)
-                session.completed_agent_messages.append(completed_message)
-
-        step = _extract_completed_step(
-            method,
-            event,
-            fallback_thread_id=session.thread_id,
-            fallback_turn_id=session.turn_id,
-        )
-        if step is not None:
-            if step.item_id is None or step.item_id not in session.step_item_ids:
-                if step.item_id is not None:
-                    session.step_item_ids.add(step.item_id)
-                session.step_records.append(_StepRecord(event_index=event_index, step=step))
+        if method == ITEM_COMPLETED_METHOD:
+            completed_message = _extract_completed_agent_message(envelope)
+            if completed_message is not None:
+                item_id, _ = completed_message
+                if item_id is None or item_id not in session.completed_item_ids:
+                    if item_id is not None:
+                        session.completed_item_ids.add(item_id)
+                    session.completed_agent_messages.append(completed_message)
+
+            step = _extract_completed_step(
+                envelope,
+                thread_id=envelope.thread_id or session.thread_id,
+                turn_id=envelope.turn_id or session.turn_id,
+            )
+            if step is not None:
+                if step.item_id is None or step.item_id not in session.step_item_ids:
+                    if step.item_id is not None:
+                        session.step_item_ids.add(step.item_id)
+                    session.step_records.append(_StepRecord(event_index=event_index, step=step))
+            return
 
         if is_turn_failed(method):
-            details = _find_first_string_by_exact_keys(event, {"message", "error"})
+            details = _find_first_string_by_exact_keys(envelope.raw, {"message", "error"})
             session.failed = True
             session.failure_message = details or "turn failed"
 
         if is_turn_completed(method):
             session.completed = True
 
+    def _submit_turn(self, turn: QueuedTurn) -> QueuedTurn:
+        if self._closed:
+            raise CodexTransportError("client is closed")
+        queue = self._turn_queues.setdefault(turn.thread_id, _ThreadTurnQueue())
+        queue.pending.append(turn)
+        if queue.worker is None:
+            queue.worker = asyncio.create_task(self._drain_turn_queue(turn.thread_id, queue))
+            self._background_tasks.add(queue.worker)
+            queue.worker.add_done_callback(self._background_tasks.discard)
+        return turn
+
+    def _turn_queue_depth(self, thread_id: str) -> int:
+        queue = self._turn_queues.get(thread_id)
+        if queue is None:
+            return 0
+        return len(queue.pending) + (queue.running is not None)
+
+    async def _drain_turn_queue(self, thread_id: str, queue: _ThreadTurnQueue) -> None:
+        try:
+            while queue.pending:
+                turn = queue.pending.popleft()
+                if turn.done():
+                    continue
+                queue.running = turn
+                await self._run_queued_turn(turn)
+                queue.running = None
+        except asyncio.CancelledError:
+            closing = CodexTransportError("client is closing")
+            if queue.running is not None:
+                queue.running._set_error(closing)
+            for turn in queue.pending:
+                turn._set_error(closing)
+            queue.pending.clear()
+            raise
+        finally:
+            queue.running = None
+            queue.worker = None
+            if self._turn_queues.get(thread_id) is queue:
+                del self._turn_queues[thread_id]
+
+    async def _run_queued_turn(self, turn: QueuedTurn) -> None:
+        turn._started = True
+        try:
+            active_thread_id, session = await self._start_chat_turn(
+                text=turn._text,
+                thread_id=turn.thread_id,
+                user=turn._user,
+                metadata=turn._metadata,
+                thread_config=None,
+                turn_overrides=turn._turn_overrides,
+                schedule=turn._schedule,
+            )
+            turn._turn_id = session.turn_id
+            for record in session.step_records:
+                turn._push_step(record.step)
+            result = await self._collect_chat_result(
+                session,
+                active_thread_id,
+                cursor=len(session.raw_events),
+                timeout_value=self._resolve_inactivity_timeout(turn._inactivity_timeout),
+                on_step=turn._push_step,
+            )
+        except CodexTurnInactiveError as exc:
+            turn._set_error(exc)
+            # Free the thread for the next prompt.
+            with contextlib.suppress(CodexError):
+                await self.cancel(exc.continuation)
+        except Exception as exc:
+            turn._set_error(exc)
+        else:
+            turn._set_result(result)
+
     def _cleanup_turn_state(self, turn_id: str) -> None:
-        self._turn_sessions.pop(turn_id, None)
+        session = self._turn_sessions.pop(turn_id, None)
+        if session is not None:
+            # Still holding a slot here means the turn was abandoned or interrupted.
+            _release_admission(session, failed=True)
         for request_id, request in list(self._pending_approval_requests.items()):
             if request.turn_id == turn_id:
                 self._pending_approval_requests.pop(request_id, None)
         self._drop_deferred_for_turn(turn_id)
 
     def _drop_deferred_for_turn(self, turn_id: str) -> None:
-        retained: list[dict[str, Any]] = []
-        for event in self._deferred_notifications:
-            if self._event_is_for_turn(event, turn_id):
-                continue
-            retained.append(event)
-        self._deferred_notifications = retained
+        self._deferred_notifications.retire(turn_id)
 
     def _resolve_inactivity_timeout(self, timeout: float | None) -> float | None:
         return timeout if timeout is not None else self._inactivity_timeout
@@ -1762,6 +3562,59 @@ class CodexClient:
             mode=mode,
         )
 
+    def _start_writer(self) -> None:
+        """Start background writer task exactly once."""
+        if self._writer_task is not None:
+            return
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def _send(self, payload: dict[str, Any], *, lane: SendLane = "normal") -> None:
+        """Queue one message for the writer task and wait until it is flushed.
+
+        Before `start()` there is no writer task and the message is written
+        directly.
+        """
+        if self._writer_task is None:
+            await self._transport.send(payload)
+            return
+        flushed: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._send_queue.put(_OutboundMessage(payload, flushed, lane))
+        await flushed
+
+    def _send_nowait(self, payload: dict[str, Any], *, lane: SendLane = "normal") -> None:
+        """Queue one message without waiting for the flush (used by the receiver)."""
+        if self._writer_task is None:
+            self._spawn_background_task(self._transport.send(payload))
+            return
+        self._send_queue.put(_OutboundMessage(payload, lane=lane))
+
+    async def _writer_loop(self) -> None:
+        """Flush queued outgoing messages, coalescing everything already queued."""
+        queue = self._send_queue
+        while True:
+            batch, encoded = _encode_outbound(
+                await queue.take(_MAX_SEND_BATCH), self._transport.codec.encode
+            )
+            if not batch:
+                continue
+            try:
+                await self._transport.send_raw_many(encoded)
+            except asyncio.CancelledError:
+                _settle_outbound(batch, CodexTransportError("client is closing"))
+                raise
+            except Exception as exc:
+                error = (
+                    exc
+                    if isinstance(exc, CodexTransportError)
+                    else CodexTransportError(f"failed writing to transport: {exc}")
+                )
+                _settle_outbound(batch, error)
+            else:
+                _settle_outbound(batch, None)
+
+    def _fail_queued_sends(self, error: CodexTransportError) -> None:
+        _settle_outbound(self._send_queue.drain(), error)
+
     def _start_receiver(self) -> None:
         """Start background receive loop exactly once."""
         if self._receiver_task is not None:
@@ -1769,43 +3622,26 @@ class CodexClient:
         self._receiver_task = asyncio.create_task(self._receiver_loop())
 
     async def _receiver_loop(self) -> None:
-        """Route incoming transport messages to request futures or notification queue."""
-        try:
-            while not self._closed:
-                payload = await self._transport.recv()
-
-                if is_response_message(payload):
-                    response_id = payload.get("id")
-                    if isinstance(response_id, int):
-                        future = self._pending.pop(response_id, None)
-                        if future is not None and not future.done():
-                            future.set_result(payload)
-                    continue
-
-                method = payload.get("method")
-                if not isinstance(method, str):
-                    continue
+        """Route incoming transport messages to request futures or turn mailboxes.
 
-                if "id" in payload and payload.get("id") is not None:
-                    request_id = payload["id"]
-                    if isinstance(request_id, (int, str)):
-                        handled = await self._handle_server_request(
-                            request_id=request_id,
-                            method=method,
-                            payload=payload,
-                        )
-                        if handled:
-                            await self._notifications.put(payload)
-                            continue
-                        error_response = make_error_response(
-                            request_id,
-                            -32601,
-                            "Client does not implement server-initiated requests.",
-                        )
-                        async with self._send_lock:
-                            await self._transport.send(error_response)
-
-                await self._notifications.put(payload)
+        Each `recv_many()` batch is dispatched synchronously, so a burst of
+        buffered messages costs one event-loop round trip rather than one per
+        message.
+        """
+        transport = self._transport
+        try:
+            if transport.supports_raw_messages:
+                while not self._closed:
+                    for data in await transport.recv_raw_many():
+                        self._dispatch_raw(data)
+                    if self._receive_pauses:
+                        await self._receive_resumed.wait()
+            else:
+                while not self._closed:
+                    for payload in await transport.recv_many():
+                        self._dispatch_incoming(payload)
+                    if self._receive_pauses:
+                        await self._receive_resumed.wait()
         except asyncio.CancelledError:
             raise
         except Exception as exc:
@@ -1816,15 +3652,66 @@ class CodexClient:
                 if not future.done():
                     future.set_exception(transport_error)
             self._pending.clear()
-            await self._notifications.put(
-                {
-                    "jsonrpc": "2.0",
-                    "method": "__transport_error__",
-                    "params": {"message": str(exc)},
-                }
-            )
+            self._fail_turn_waiters(_transport_error_envelope(str(exc)))
+
+    def _dispatch_raw(self, data: bytes) -> None:
+        """Decode and dispatch one raw message, unless nobody would consume it."""
+        head = peek_message_head(data)
+        if head is not None:
+            if (
+                head.id is None
+                and head.method is not None
+                and head.method in self._ignored_notification_methods
+            ):
+                # Only notifications are skipped; server requests with the
+                # same method still need a reply.
+                self._counters.skipped_notifications += 1
+                return
+            if head.has_result and head.id in self._discarded_results:
+                self._counters.skipped_results += 1
+                self._dispatch_incoming({"jsonrpc": "2.0", "id": head.id, "result": None})
+                return
+        try:
+            payload = self._transport.codec.decode(data)
+        except ValueError as exc:
+            raise CodexTransportError("received invalid JSON from transport") from exc
+        self._dispatch_incoming(payload)
+
+    def _dispatch_incoming(self, payload: dict[str, Any]) -> None:
+        if is_response_message(payload):
+            response_id = payload.get("id")
+            if isinstance(response_id, int):
+                self._discarded_results.discard(response_id)
+                future = self._pending.pop(response_id, None)
+                if future is not None and not future.done():
+                    future.set_result(payload)
+            return
+
+        method = payload.get("method")
+        if not isinstance(method, str):
+            return
 
-    async def _handle_server_request(
+        if "id" in payload and payload.get("id") is not None:
+            request_id = payload["id"]
+            if isinstance(request_id, (int, str)):
+                handled = self._handle_server_request(
+                    request_id=request_id,
+                    method=method,
+                    payload=payload,
+                )
+                if handled:
+                    self._route_notification(self._make_envelope(payload, method))
+                    return
+                error_response = make_error_response(
+                    request_id,
+                    -32601,
+                    "Client does not implement server-initiated requests.",
+                )
+                self._send_nowait(error_response, lane="control")
+
+        self._route_notification(self._make_envelope(payload, method))
+
+    def _handle_server_request(
         self,
         *,
         request_id: int | str,
@@ -1844,8 +3731,7 @@ class CodexClient:
                 -32602,
                 f"{method} received invalid params",
             )
-            async with self._send_lock:
-                await self._transport.send(error)
+            self._send_nowait(error, lane="control")
             return True
 
         try:
@@ -1856,12 +3742,11 @@ class CodexClient:
             )
         except CodexProtocolError as exc:
             error = make_error_response(request_id, -32602, str(exc))
-            async with self._send_lock:
-                await self._transport.send(error)
+            self._send_nowait(error, lane="control")
             return True
 
         self._pending_approval_requests[request_id] = request
-        await self._approval_requests.put(request)
+        self._approval_requests.put_nowait(request)
 
         if self._approval_handler is None:
             self._spawn_background_task(self._auto_decline_approval(request))
@@ -1902,58 +3787,38 @@ class CodexClient:
             return
 
 
-def _is_unset(value: Any) -> bool:
-    return isinstance(value, UnsetType)
+def _deliver_event(session: _TurnSession, envelope: _EventEnvelope) -> None:
+    """Put one event in a turn's mailbox and update the turn's admission slot."""
+    session.mailbox.put_nowait(envelope)
+    if session.admission is not None:
+        session.admission.observe_event()
+        failed = is_turn_failed(envelope.method)
+        if failed or is_turn_completed(envelope.method):
+            # The server is done with the turn; admit the next one even if
+            # nobody is consuming this turn's events right now.
+            _release_admission(session, failed=failed)
 
 
-def _thread_config_to_params(config: ThreadConfig | None) -> dict[str, Any]:
-    """Encode `ThreadConfig` into protocol params (camelCase), omitting UNSET."""
-    if config is None:
-        return {}
+def _is_missing_thread_error(error: CodexProtocolError) -> bool:
+    """Whether a thread request failed because the thread is gone or not loaded."""
+    message = str(error).lower()
+    return any(marker in message for marker in _MISSING_THREAD_MARKERS)
 
-    mapping: tuple[tuple[str, str], ...] = (
-        ("cwd", "cwd"),
-        ("base_instructions", "baseInstructions"),
-        ("developer_instructions", "developerInstructions"),
-        ("model", "model"),
-        ("model_provider", "modelProvider"),
-        ("approval_policy", "approvalPolicy"),
-        ("sandbox", "sandbox"),
-        ("personality", "personality"),
-        ("ephemeral", "ephemeral"),
-        ("config", "config"),
-    )
-    params: dict[str, Any] = {}
-    for attr_name, key_name in mapping:
-        value = getattr(config, attr_name)
-        if _is_unset(value):
-            continue
-        params[key_name] = value
-    return params
-
-
-def _turn_overrides_to_params(overrides: TurnOverrides | None) -> dict[str, Any]:
-    """Encode `TurnOverrides` into protocol params (camelCase), omitting UNSET."""
-    if overrides is None:
-        return {}
-
-    mapping: tuple[tuple[str, str], ...] = (
-        ("cwd", "cwd"),
-        ("model", "model"),
-        ("effort", "effort"),
-        ("summary", "summary"),
-        ("sandbox_policy", "sandboxPolicy"),
-        ("personality", "personality"),
-        ("approval_policy", "approvalPolicy"),
-        ("output_schema", "outputSchema"),
+
+def _release_admission(session: _TurnSession, *, failed: bool = False) -> None:
+    if session.admission is not None:
+        session.admission.release(failed=failed)
+        session.admission = None
+
+
+def _template_fingerprint(template: ThreadTemplate) -> str:
+    return _params_fingerprint(
+        {
+            "thread": _thread_config_to_params(template.config),
+            "turn": _turn_overrides_to_params(template.turn_overrides),
+            "priming": list(template.priming_prompts),
+        }
     )
-    params: dict[str, Any] = {}
-    for attr_name, key_name in mapping:
-        value = getattr(overrides, attr_name)
-        if _is_unset(value):
-            continue
-        params[key_name] = value
-    return params
 
 
 def _merge_thread_config(base: ThreadConfig, override: ThreadConfig | None) -> ThreadConfig:
@@ -1998,77 +3863,73 @@ def _filter_none(values: Mapping[str, Any]) -> dict[str, Any]:
     return {key: value for key, value in values.items() if value is not None}
 
 
-def _default_stdio_command() -> list[str]:
-    """Return default app-server command for stdio mode."""
-    from_env = os.getenv("CODEX_APP_SERVER_CMD")
-    if from_env:
-        return shlex.split(from_env)
-    return ["codex", "app-server"]
-
-
-def _prepare_initialize_params(
-    params: Mapping[str, Any] | None,
-) -> dict[str, Any]:
-    """Merge caller-provided initialize params with library defaults.
-
-    Merge behavior:
-    - start with `_default_initialize_params()`;
-    - shallow-merge top-level keys from caller `params`;
-    - when caller provides `capabilities` as a mapping and omits
-      `optOutNotificationMethods`, inject the default opt-out list;
-    - if caller provides explicit `capabilities.optOutNotificationMethods`, keep it.
-
-    Args:
-        params: Optional caller initialize payload.
-
-    Returns:
-        Final initialize payload sent to the server.
-    """
-    payload = _default_initialize_params()
-    if params is None:
-        return payload
-
-    params_dict = dict(params)
-    payload.update(params_dict)
-
-    if "capabilities" not in params_dict:
-        return payload
-
+def _initialize_opt_out_methods(payload: Mapping[str, Any]) -> list[str]:
     capabilities = payload.get("capabilities")
-    if capabilities is None:
-        return payload
     if not isinstance(capabilities, Mapping):
-        return payload
+        return []
+    methods = capabilities.get("optOutNotificationMethods")
+    if not isinstance(methods, Sequence) or isinstance(methods, str):
+        return []
+    return [method for method in methods if isinstance(method, str)]
+
+
+def _ignorable_methods(methods: Iterable[str]) -> frozenset[str]:
+    # Approval requests are always handled, even if a caller lists them.
+    return frozenset(methods) - {
+        ITEM_COMMAND_EXECUTION_REQUEST_APPROVAL_METHOD,
+        ITEM_FILE_CHANGE_REQUEST_APPROVAL_METHOD,
+    }
 
-    capabilities_dict = dict(capabilities)
-    if "optOutNotificationMethods" not in capabilities_dict:
-        capabilities_dict["optOutNotificationMethods"] = list(DEFAULT_OPT_OUT_NOTIFICATION_METHODS)
-    payload["capabilities"] = capabilities_dict
-    return payload
 
+@dataclass(frozen=True, slots=True)
+class _IdShape:
+    """Where thread/turn ids live for one method, relative to `params` or `result`."""
 
-def _default_initialize_params() -> dict[str, Any]:
-    """Build the default initialize payload for Codex app-server.
+    thread_paths: tuple[tuple[str, ...], ...]
+    turn_paths: tuple[tuple[str, ...], ...]
 
-    The default payload currently includes:
-    - `protocolVersion`: protocol version string sent by this client;
-    - `clientInfo`: client name/version metadata;
-    - `capabilities.optOutNotificationMethods`: compat event opt-outs used by
-      default to reduce duplicate/legacy notification streams.
 
-    Returns:
-        Default initialize payload map.
-    """
-    return {
-        "protocolVersion": "1",
-        "clientInfo": {
-            "name": "codex-app-server-sdk",
-            "version": "0.1.0",
-        },
-        "capabilities": {
-            "optOutNotificationMethods": list(DEFAULT_OPT_OUT_NOTIFICATION_METHODS),
-        },
-    }
+_ITEM_ID_SHAPE = _IdShape(thread_paths=(("threadId",),), turn_paths=(("turnId",),))
+_TURN_ID_SHAPE = _IdShape(
+    thread_paths=(("threadId",), ("thread", "id")),
+    turn_paths=(("turn", "id"), ("turnId",)),
+)
+_THREAD_RESULT_SHAPE = _IdShape(thread_paths=(("thread", "id"), ("threadId",)), turn_paths=())
+
+# Known method shapes used for direct id lookups. Notification and server
+# request entries describe `params`; request entries describe `result`.
+_ID_SHAPES: dict[str, _IdShape] = {
+    ITEM_STARTED_METHOD: _ITEM_ID_SHAPE,
+    ITEM_COMPLETED_METHOD: _ITEM_ID_SHAPE,
+    ITEM_AGENT_MESSAGE_DELTA_METHOD: _ITEM_ID_SHAPE,
+    ITEM_COMMAND_EXECUTION_OUTPUT_DELTA_METHOD: _ITEM_ID_SHAPE,
+    ITEM_COMMAND_EXECUTION_REQUEST_APPROVAL_METHOD: _ITEM_ID_SHAPE,
+    ITEM_FILE_CHANGE_REQUEST_APPROVAL_METHOD: _ITEM_ID_SHAPE,
+    TURN_STARTED_METHOD: _TURN_ID_SHAPE,
+    **{method: _TURN_ID_SHAPE for method in TURN_COMPLETED_METHODS},
+    **{method: _TURN_ID_SHAPE for method in TURN_FAILED_METHODS},
+    THREAD_START_METHOD: _THREAD_RESULT_SHAPE,
+    THREAD_RESUME_METHOD: _THREAD_RESULT_SHAPE,
+    THREAD_FORK_METHOD: _THREAD_RESULT_SHAPE,
+    TURN_START_METHOD: _IdShape(
+        thread_paths=(("threadId",),),
+        turn_paths=(("turn", "id"), ("turnId",)),
+    ),
+}
+
+
+def _read_first_path(payload: Any, paths: tuple[tuple[str, ...], ...]) -> str | None:
+    """Return the first non-empty string found at one of the exact key paths."""
+    for path in paths:
+        value = payload
+        for key in path:
+            if not isinstance(value, dict):
+                value = None
+                break
+            value = value.get(key)
+        if isinstance(value, str) and value:
+            return value
+    return None
 
 
 def _extract_thread_id(payload: Any) -> str | None:
@@ -2101,78 +3962,81 @@ def _extract_turn_id(payload: Any) -> str | None:
     return None
 
 
+def _extract_thread_id_from_params(payload: Any) -> str | None:
+    """Extract a thread id without treating arbitrary `id` keys as thread ids."""
+    if not isinstance(payload, (dict, list)):
+        return None
+    direct = _find_first_string_by_exact_keys(payload, {"threadid", "thread_id"})
+    if direct:
+        return direct
+    thread_obj = _find_first_dict_by_exact_key(payload, {"thread"})
+    if thread_obj:
+        return _find_first_string_by_exact_keys(thread_obj, {"id"})
+    return None
+
+
 def _extract_completed_agent_message(
-    method: str,
-    payload: dict[str, Any],
+    envelope: _EventEnvelope,
 ) -> tuple[str | None, str] | None:
     """Extract final assistant text from an `item/completed` event."""
-    if method != ITEM_COMPLETED_METHOD:
+    if envelope.method != ITEM_COMPLETED_METHOD:
         return None
 
-    params = payload.get("params")
-    if not isinstance(params, Mapping):
+    item = envelope.item
+    if item is None or envelope.item_type != "agentMessage":
         return None
 
-    item = params.get("item")
-    if not isinstance(item, Mapping):
+    text = _extract_item_text(item)
+    if text is None:
         return None
+    return envelope.item_id, text
 
-    item_type = item.get("type")
-    if item_type != "agentMessage":
-        return None
 
-    item_id_raw = item.get("id")
-    item_id: str | None = item_id_raw if isinstance(item_id_raw, str) else None
-    text = _extract_item_text(item)
-    if text is None:
+def _agent_message_delta(
+    raw: Mapping[str, Any],
+    session: _TurnSession,
+) -> AgentMessageDelta | None:
+    """Build a typed delta from an `item/agentMessage/delta` notification."""
+    params = raw.get("params")
+    if not isinstance(params, dict):
         return None
-    return item_id, text
+    delta = params.get("delta")
+    if not isinstance(delta, str) or not delta:
+        return None
+    item_id = params.get("itemId")
+    thread_id = params.get("threadId")
+    turn_id = params.get("turnId")
+    return AgentMessageDelta(
+        thread_id=thread_id if isinstance(thread_id, str) else session.thread_id,
+        turn_id=turn_id if isinstance(turn_id, str) else session.turn_id,
+        item_id=item_id if isinstance(item_id, str) else None,
+        delta=delta,
+    )
 
 
 def _extract_completed_step(
-    method: str,
-    payload: dict[str, Any],
+    envelope: _EventEnvelope,
     *,
-    fallback_thread_id: str | None = None,
-    fallback_turn_id: str | None = None,
+    thread_id: str | None,
+    turn_id: str | None,
 ) -> ConversationStep | None:
     """Build a completed conversation step from an `item/completed` event."""
-    if method != ITEM_COMPLETED_METHOD:
-        return None
-
-    params = payload.get("params")
-    if not isinstance(params, Mapping):
+    if envelope.method != ITEM_COMPLETED_METHOD:
         return None
 
-    item = params.get("item")
-    if not isinstance(item, Mapping):
+    params = envelope.params
+    item = envelope.item
+    if params is None or item is None:
         return None
 
-    thread_id = _find_first_string_by_exact_keys(params, {"threadid", "thread_id"})
-    if thread_id is None:
-        thread_obj = _find_first_dict_by_exact_key(params, {"thread"})
-        if thread_obj is not None:
-            thread_id = _find_first_string_by_exact_keys(thread_obj, {"id"})
-
-    turn_id = _find_first_string_by_exact_keys(params, {"turnid", "turn_id"})
-    if turn_id is None:
-        turn_obj = _find_first_dict_by_exact_key(params, {"turn"})
-        if turn_obj is not None:
-            turn_id = _find_first_string_by_exact_keys(turn_obj, {"id"})
-
-    if thread_id is None:
-        thread_id = fallback_thread_id
-    if turn_id is None:
-        turn_id = fallback_turn_id
-
     if not thread_id or not turn_id:
         return None
 
     return _step_from_item(
         thread_id=thread_id,
         turn_id=turn_id,
-        item=dict(item),
-        data={"params": dict(params), "item": dict(item)},
+        item=item,
+        data={"params": params, "item": item},
     )
 
 
@@ -2202,10 +4066,8 @@ def _step_from_item(
     item_id_obj = item.get("id")
     item_id = item_id_obj if isinstance(item_id_obj, str) else None
 
-    payload_data: dict[str, Any] = {}
-    if data is not None:
-        payload_data.update(dict(data))
-    payload_data.setdefault("item", dict(item))
+    payload_data: dict[str, Any] = dict(data) if data is not None else {}
+    payload_data.setdefault("item", item)
 
     return ConversationStep(
         thread_id=thread_id,
@@ -2352,72 +4214,17 @@ def _optional_string(value: Any) -> str | None:
     return value if isinstance(value, str) else None
 
 
-def _event_mentions_turn_id(payload: Any, turn_id: str) -> bool:
-    """Return True when payload references target turn id."""
-    if not isinstance(payload, (dict, list)):
-        return False
-
-    direct = _find_first_string_by_exact_keys(payload, {"turnid", "turn_id"})
-    if direct == turn_id:
-        return True
-
-    turn_obj = _find_first_dict_by_exact_key(payload, {"turn"})
-    if turn_obj:
-        nested_id = _find_first_string_by_exact_keys(turn_obj, {"id"})
-        if nested_id == turn_id:
-            return True
-
-    return False
-
-
-def _find_first_string_by_exact_keys(
-    payload: Any,
-    keys_lower: set[str],
-) -> str | None:
-    """Depth-first search for first string whose key matches provided names."""
-    if isinstance(payload, Mapping):
-        for key, value in payload.items():
-            if key.lower() in keys_lower and isinstance(value, str):
-                return value
-        for value in payload.values():
-            found = _find_first_string_by_exact_keys(value, keys_lower)
-            if found is not None:
-                return found
-        return None
-
-    if isinstance(payload, list):
-        for item in payload:
-            found = _find_first_string_by_exact_keys(item, keys_lower)
-            if found is not None:
-                return found
-
-    return None
-
+_TRANSPORT_ERROR_METHOD = "__transport_error__"
 
-def _find_first_dict_by_exact_key(
-    payload: Any,
-    keys_lower: set[str],
-) -> dict[str, Any] | None:
-    """Depth-first search for first dict value under matching key name."""
-    if isinstance(payload, Mapping):
-        for key, value in payload.items():
-            if key.lower() in keys_lower and isinstance(value, Mapping):
-                return dict(value)
-        for value in payload.values():
-            found = _find_first_dict_by_exact_key(value, keys_lower)
-            if found is not None:
-                return found
-        return None
-
-    if isinstance(payload, list):
-        for item in payload:
-            found = _find_first_dict_by_exact_key(item, keys_lower)
-            if found is not None:
-                return found
 
-    return None
+def _transport_error_envelope(message: str) -> _EventEnvelope:
+    params = {"message": message}
+    return _EventEnvelope(
+        method=_TRANSPORT_ERROR_METHOD,
+        raw={"jsonrpc": "2.0", "method": _TRANSPORT_ERROR_METHOD, "params": params},
+        params=params,
+    )
 
 
-def _is_transport_error_event(payload: dict[str, Any]) -> bool:
-    method = payload.get("method")
-    return isinstance(method, str) and method == "__transport_error__"
+def _is_transport_error_event(envelope: _EventEnvelope) -> bool:
+    return envelope.method == _TRANSPORT_ERROR_METHOD
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any
+
+try:
+    import orjson  # type: ignore[import-not-found,unused-ignore]
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec  # type: ignore[import-not-found,unused-ignore]
+except ImportError:  # pragma: no cover
+    msgspec = None  # type: ignore[assignment]
+
+
+class JsonCodec(ABC):
+    """Encode/decode JSON-RPC messages to and from UTF-8 bytes."""
+
+    #: Short backend name used in diagnostics and benchmarks.
+    name: str = "abstract"
+
+    @abstractmethod
+    def encode(self, payload: Mapping[str, Any]) -> bytes:
+        """Serialize one message to compact UTF-8 JSON bytes."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Parse one JSON document.
+
+        Raises:
+            ValueError: If `data` is not valid UTF-8 JSON.
+        """
+        raise NotImplementedError
+
+
+class StdlibJsonCodec(JsonCodec):
+    """Codec backed by the standard-library `json` module."""
+
+    name = "json"
+
+    def encode(self, payload: Mapping[str, Any]) -> bytes:
+        """Serialize one message with compact separators."""
+        if not isinstance(payload, dict):
+            payload = dict(payload)
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Parse UTF-8 bytes (or text) without an intermediate `str` copy."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec backed by `orjson` (optional dependency)."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        """Create codec.
+
+        Raises:
+            ImportError: If `orjson` is not installed.
+        """
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def encode(self, payload: Mapping[str, Any]) -> bytes:
+        """Serialize one message with `orjson.dumps`."""
+        if not isinstance(payload, dict):
+            payload = dict(payload)
+        return self._dumps(payload)
+
+    def decode(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Parse one message with `orjson.loads`."""
+        return self._loads(data)
+
+
+class MsgspecJsonCodec(JsonCodec):
+    """Codec backed by `msgspec.json` (optional dependency)."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        """Create codec with reusable encoder/decoder instances.
+
+        Raises:
+            ImportError: If `msgspec` is not installed.
+        """
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._decode_error = msgspec.DecodeError
+
+    def encode(self, payload: Mapping[str, Any]) -> bytes:
+        """Serialize one message with a shared `msgspec.json.Encoder`."""
+        if not isinstance(payload, dict):
+            payload = dict(payload)
+        return self._encoder.encode(payload)
+
+    def decode(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Parse one message with a shared `msgspec.json.Decoder`."""
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as exc:
+            raise ValueError(str(exc)) from exc
+
+
+def default_codec() -> JsonCodec:
+    """Return the fastest available codec.
+
+    Preference order is `orjson`, then `msgspec`, then the standard library.
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+    if msgspec is not None:
+        return MsgspecJsonCodec()
+    return StdlibJsonCodec()
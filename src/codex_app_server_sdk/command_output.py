@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Protocol
+
+from ._events import _EventEnvelope
+from .models import CommandOutputOverflow, CommandOutputStats
+from .protocol import (
+    ITEM_COMMAND_EXECUTION_OUTPUT_DELTA_METHOD,
+    ITEM_COMPLETED_METHOD,
+    is_turn_completed,
+    is_turn_failed,
+)
+
+_COMMAND_EXECUTION_ITEM_TYPE = "commandExecution"
+
+
+class CommandOutputSink(Protocol):
+    """Destination for teed command output, such as a text file."""
+
+    def write(self, data: str, /) -> Any:
+        """Write one output chunk."""
+
+    def close(self) -> Any:
+        """Called once when the command's output ends."""
+
+
+class CommandOutputHost(Protocol):
+    """Client surface a monitor attaches to; `CodexClient` implements it."""
+
+    @property
+    def command_output_monitor(self) -> CommandOutputMonitor | None:
+        """The attached monitor, if any."""
+        ...
+
+    def set_command_output_monitor(self, monitor: CommandOutputMonitor | None) -> None:
+        """Attach or detach a monitor."""
+        ...
+
+    def pause_receiving(self) -> None:
+        """Stop reading the connection until resumed."""
+        ...
+
+    def resume_receiving(self) -> None:
+        """Release one `pause_receiving()`."""
+        ...
+
+
+class CommandOutputStream:
+    """Incremental output of one `commandExecution` item.
+
+    Iterate it with `async for chunk in stream` to receive output chunks as
+    the app-server sends them; iteration ends when the item completes or its
+    turn ends. Streams are created by a `CommandOutputMonitor` and buffer at
+    most `max_buffered_chars` unread characters.
+
+    When the monitor was given a sink factory, chunks are written to the sink
+    as they arrive instead of being buffered, and iteration yields nothing.
+    """
+
+    def __init__(
+        self,
+        monitor: CommandOutputMonitor,
+        *,
+        thread_id: str | None,
+        turn_id: str | None,
+        item_id: str,
+    ) -> None:
+        self.thread_id = thread_id
+        self.turn_id = turn_id
+        self.item_id = item_id
+        self._monitor = monitor
+        self._chunks: deque[str] = deque()
+        self._buffered_chars = 0
+        self._total_chars = 0
+        self._dropped_chars = 0
+        self._wakeup = asyncio.Event()
+        self._full = False
+        self._closed = False
+        self._sink: CommandOutputSink | None = None
+        self._sink_error: BaseException | None = None
+
+    @property
+    def closed(self) -> bool:
+        """Whether the command finished and no more output will arrive."""
+        return self._closed
+
+    @property
+    def buffered_chars(self) -> int:
+        """Characters received but not read yet."""
+        return self._buffered_chars
+
+    @property
+    def total_chars(self) -> int:
+        """Characters received so far, including dropped ones."""
+        return self._total_chars
+
+    @property
+    def dropped_chars(self) -> int:
+        """Characters discarded because the buffer was full."""
+        return self._dropped_chars
+
+    @property
+    def sink_error(self) -> BaseException | None:
+        """Exception raised by the sink, after which output was discarded."""
+        return self._sink_error
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self
+
+    async def __anext__(self) -> str:
+        while not self._chunks:
+            if self._closed:
+                raise StopAsyncIteration
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        chunk = self._chunks.popleft()
+        self._buffered_chars -= len(chunk)
+        if self._full and self._buffered_chars <= self._monitor._max_buffered_chars:
+            self._full = False
+            self._monitor._client.resume_receiving()
+        return chunk
+
+    async def read(self) -> str:
+        """Wait for the command to finish and return its unread output."""
+        return "".join([chunk async for chunk in self])
+
+    def _feed(self, chunk: str) -> None:
+        self._total_chars += len(chunk)
+        monitor = self._monitor
+        monitor._chars += len(chunk)
+        if self._sink is not None:
+            try:
+                self._sink.write(chunk)
+            except Exception as exc:
+                self._sink_error = exc
+                monitor._sink_errors += 1
+                self._close_sink()
+            return
+        if self._sink_error is not None:
+            return
+
+        self._chunks.append(chunk)
+        self._buffered_chars += len(chunk)
+        limit = monitor._max_buffered_chars
+        if self._buffered_chars > limit:
+            if monitor._overflow == "drop_oldest":
+                # Keep at least the newest chunk even if it alone is too large.
+                while self._buffered_chars > limit and len(self._chunks) > 1:
+                    dropped = len(self._chunks.popleft())
+                    self._buffered_chars -= dropped
+                    self._dropped_chars += dropped
+                    monitor._dropped_chars += dropped
+            elif not self._full:
+                self._full = True
+                monitor._pauses += 1
+                monitor._client.pause_receiving()
+        self._wakeup.set()
+
+    def _close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._full:
+            # No more output will arrive, so a full buffer cannot stall the connection.
+            self._full = False
+            self._monitor._client.resume_receiving()
+        self._close_sink()
+        self._wakeup.set()
+
+    def _close_sink(self) -> None:
+        sink, self._sink = self._sink, None
+        if sink is not None:
+            with contextlib.suppress(Exception):
+                sink.close()
+
+
+class CommandOutputMonitor:
+    """Stream `commandExecution` output per item while the command runs.
+
+    Once started, every `item/commandExecution/outputDelta` notification on
+    the client is appended to the `CommandOutputStream` of its item id, which
+    is opened by the first chunk and closed by the item's `item/completed`
+    notification or the end of its turn. Turn events, including the
+    `ConversationStep` built for the finished command, are unaffected.
+
+    Use `streams()` to receive each stream as it opens, or `get(item_id)` to
+    look up a running command seen in an `item/started` event.
+
+    Buffering is bounded per stream by `max_buffered_chars`. With
+    `overflow="drop_oldest"` old output is discarded and counted; with
+    `overflow="block"` a full stream stops the client from reading the
+    transport until its consumer catches up. That back-pressures the
+    app-server, but it stalls every request and turn on the connection, so
+    only use it when each stream is read by a task that awaits nothing else
+    on the same client.
+
+    With `sink`, output is teed straight to `sink(stream)` (for example a file
+    opened per item) instead of being kept in memory; the sink is closed when
+    the stream closes.
+    """
+
+    def __init__(
+        self,
+        client: CommandOutputHost,
+        *,
+        max_buffered_chars: int = 1 << 20,
+        overflow: CommandOutputOverflow = "drop_oldest",
+        sink: Callable[[CommandOutputStream], CommandOutputSink] | None = None,
+    ) -> None:
+        """Configure the monitor.
+
+        Args:
+            client: Client whose notifications are watched.
+            max_buffered_chars: Unread characters kept per stream.
+            overflow: What a full stream does, see `CommandOutputOverflow`.
+            sink: Factory called with each new stream; its result receives
+                that stream's output instead of the buffer.
+
+        Raises:
+            ValueError: If `max_buffered_chars` is smaller than 1 or
+                `overflow` is unknown.
+        """
+        if max_buffered_chars < 1:
+            raise ValueError("max_buffered_chars must be at least 1")
+        if overflow not in ("drop_oldest", "block"):
+            raise ValueError(f"unknown overflow policy: {overflow!r}")
+        self._client = client
+        self._max_buffered_chars = max_buffered_chars
+        self._overflow = overflow
+        self._sink_factory = sink
+        self._streams: dict[str, CommandOutputStream] = {}
+        self._opened: asyncio.Queue[CommandOutputStream | None] | None = None
+        self._stream_count = 0
+        self._chars = 0
+        self._dropped_chars = 0
+        self._pauses = 0
+        self._sink_errors = 0
+        self._closed = False
+
+    def stats(self) -> CommandOutputStats:
+        """Return a snapshot of stream and buffering counters."""
+        return CommandOutputStats(
+            open_streams=len(self._streams),
+            streams=self._stream_count,
+            chars=self._chars,
+            dropped_chars=self._dropped_chars,
+            pauses=self._pauses,
+            sink_errors=self._sink_errors,
+        )
+
+    async def start(self) -> CommandOutputMonitor:
+        """Attach to the client.
+
+        Returns:
+            `self` for fluent usage.
+        """
+        self._client.set_command_output_monitor(self)
+        return self
+
+    async def __aenter__(self) -> CommandOutputMonitor:
+        """Support `async with CommandOutputMonitor(...)` usage."""
+        return await self.start()
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        """Close monitor on context-manager exit."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Detach from the client and end every open stream."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._client.command_output_monitor is self:
+            self._client.set_command_output_monitor(None)
+        self._close_streams(None)
+        if self._opened is not None:
+            self._opened.put_nowait(None)
+
+    def get(self, item_id: str) -> CommandOutputStream | None:
+        """Return the open stream for a running command item, if any output arrived."""
+        return self._streams.get(item_id)
+
+    async def streams(self) -> AsyncIterator[CommandOutputStream]:
+        """Yield each command output stream as its first chunk arrives.
+
+        Only streams opened after the first call are announced. Iteration ends
+        when the monitor is closed.
+        """
+        if self._opened is None:
+            self._opened = asyncio.Queue()
+            if self._closed:
+                self._opened.put_nowait(None)
+        while True:
+            stream = await self._opened.get()
+            if stream is None:
+                return
+            yield stream
+
+    def _observe(self, envelope: _EventEnvelope) -> None:
+        """Feed one routed notification; called synchronously by the receiver."""
+        method = envelope.method
+        if method == ITEM_COMMAND_EXECUTION_OUTPUT_DELTA_METHOD:
+            params = envelope.params
+            if params is None:
+                return
+            item_id = params.get("itemId")
+            delta = params.get("delta")
+            if not isinstance(item_id, str) or not isinstance(delta, str) or not delta:
+                return
+            stream = self._streams.get(item_id)
+            if stream is None:
+                stream = self._open(envelope, item_id)
+            stream._feed(delta)
+        elif method == ITEM_COMPLETED_METHOD:
+            if envelope.item_type == _COMMAND_EXECUTION_ITEM_TYPE and envelope.item_id:
+                stream = self._streams.pop(envelope.item_id, None)
+                if stream is not None:
+                    stream._close()
+        elif envelope.turn_id is not None and (is_turn_completed(method) or is_turn_failed(method)):
+            self._close_streams(envelope.turn_id)
+
+    def _open(self, envelope: _EventEnvelope, item_id: str) -> CommandOutputStream:
+        stream = CommandOutputStream(
+            self,
+            thread_id=envelope.thread_id,
+            turn_id=envelope.turn_id,
+            item_id=item_id,
+        )
+        if self._sink_factory is not None:
+            try:
+                stream._sink = self._sink_factory(stream)
+            except Exception as exc:
+                stream._sink_error = exc
+                self._sink_errors += 1
+        self._streams[item_id] = stream
+        self._stream_count += 1
+        if self._opened is not None:
+            self._opened.put_nowait(stream)
+        return stream
+
+    def _close_streams(self, turn_id: str | None) -> None:
+        """Close the streams of `turn_id`, or every stream when it is `None`."""
+        for item_id, stream in list(self._streams.items()):
+            if turn_id is None or stream.turn_id == turn_id:
+                del self._streams[item_id]
+                stream._close()
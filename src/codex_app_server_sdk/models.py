@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any, Literal, TypeAlias, TypedDict
 
@@ -66,6 +67,22 @@ class ConversationStep(BaseModel):
     data: dict[str, Any] = Field(default_factory=dict)
 
 
+class AgentMessageDelta(BaseModel):
+    """One chunk of assistant text streamed before its message completes.
+
+    Attributes:
+        thread_id: Parent thread identifier.
+        turn_id: Parent turn identifier.
+        item_id: Agent message item the chunk belongs to, when provided.
+        delta: Text appended to the message by this chunk.
+    """
+
+    thread_id: str
+    turn_id: str
+    item_id: str | None = None
+    delta: str
+
+
 class ChatContinuation(BaseModel):
     """Opaque continuation token for resuming a timed-out running turn.
 
@@ -102,6 +119,182 @@ class CancelResult(BaseModel):
     was_interrupted: bool = False
 
 
+#: Outbound priority lane. The writer task flushes higher lanes first.
+#:
+#: Values:
+#: - ``"control"``: `turn/interrupt` and error replies to server requests.
+#: - ``"approval"``: responses to approval requests.
+#: - ``"normal"``: all other requests.
+#: - ``"bulk"``: large or non-urgent traffic (`thread/read`, `thread/list`,
+#:   config writes).
+SendLane: TypeAlias = Literal["control", "approval", "normal", "bulk"]
+
+
+#: Admission class of a turn in `TurnScheduler`.
+#:
+#: Waiting turns of a higher class are always admitted first:
+#: ``"high"`` before ``"normal"`` before ``"low"``.
+TurnPriority: TypeAlias = Literal["high", "normal", "low"]
+
+
+class TurnSchedulerStats(BaseModel):
+    """Point-in-time admission counters for one `TurnScheduler`.
+
+    Attributes:
+        max_in_flight: Current concurrency limit.
+        in_flight: Turns admitted and not yet finished.
+        queued: Turns waiting for admission.
+        queued_by_priority: Waiting turns keyed by `TurnPriority`.
+        admitted: Turns admitted so far.
+        expired: Turns whose admission deadline passed while waiting.
+        mean_wait_seconds: Mean time from request until admission.
+        max_wait_seconds: Longest time from request until admission.
+    """
+
+    max_in_flight: int = 0
+    in_flight: int = 0
+    queued: int = 0
+    queued_by_priority: dict[TurnPriority, int] = Field(default_factory=dict)
+    admitted: int = 0
+    expired: int = 0
+    mean_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class AimdStats(BaseModel):
+    """Counters for one `AimdController`.
+
+    Attributes:
+        limit: Concurrency limit the controller last applied.
+        samples: Finished turns observed.
+        increases: Samples that raised the limit.
+        decreases: Times the limit was cut.
+        last_decrease_reason: Signal behind the most recent cut: `"error"`,
+            `"first_event"` or `"duration"`.
+    """
+
+    limit: int = 0
+    samples: int = 0
+    increases: int = 0
+    decreases: int = 0
+    last_decrease_reason: str | None = None
+
+
+class SendLaneStats(BaseModel):
+    """Queue-time metrics for one outbound priority lane.
+
+    Attributes:
+        sent: Messages handed to the transport from this lane.
+        queued: Messages currently waiting in this lane.
+        mean_wait_seconds: Mean time from enqueue until handed to the transport.
+        max_wait_seconds: Longest time from enqueue until handed to the transport.
+    """
+
+    sent: int = 0
+    queued: int = 0
+    mean_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class ClientStats(BaseModel):
+    """Point-in-time counters for one client connection.
+
+    Attributes:
+        id_fast_path_hits: Thread/turn id lookups resolved from known method
+            shapes.
+        id_fallback_scans: Id lookups that fell back to a recursive payload
+            search because the method or payload shape was not recognized.
+        orphaned_notifications: Notifications held because no live turn had
+            claimed them on arrival.
+        dropped_notifications: Notifications discarded without reaching a turn
+            waiter (unroutable, late, expired, or evicted).
+        skipped_notifications: Notifications dropped undecoded because their
+            method is ignored (see `ignored_notification_methods`).
+        skipped_results: Responses resolved without decoding because the caller
+            discards their result.
+        template_primes: Times a `ThreadTemplate` was primed (priming turns run).
+        primed_templates: Primed template threads currently cached.
+        skipped_resumes: Turns on a thread already live on this connection
+            that needed no `thread/resume`.
+        queued_turns: Prompts waiting in thread turn queues (not yet started).
+        buffered_notifications: Notifications currently held for unclaimed turns.
+        send_lanes: Outbound queue-time metrics keyed by `SendLane`.
+    """
+
+    id_fast_path_hits: int = 0
+    id_fallback_scans: int = 0
+    orphaned_notifications: int = 0
+    dropped_notifications: int = 0
+    skipped_notifications: int = 0
+    skipped_results: int = 0
+    template_primes: int = 0
+    primed_templates: int = 0
+    skipped_resumes: int = 0
+    queued_turns: int = 0
+    buffered_notifications: int = 0
+    send_lanes: dict[str, SendLaneStats] = Field(default_factory=dict)
+
+
+class ThreadPrefetchStats(BaseModel):
+    """Point-in-time counters for one `ThreadPrefetcher`.
+
+    Attributes:
+        hits: New-thread requests served from a pre-created thread.
+        misses: New-thread requests that had to send `thread/start` inline.
+        ready: Pre-created threads currently waiting to be handed out.
+        starting: Background `thread/start` requests in flight.
+        failed_starts: Background `thread/start` requests that failed.
+        configs: Distinct thread config fingerprints being kept warm.
+        evicted_configs: Configs dropped as least recently used to make room.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    ready: int = 0
+    starting: int = 0
+    failed_starts: int = 0
+    configs: int = 0
+    evicted_configs: int = 0
+
+
+#: What a `CommandOutputStream` does when its buffer is full.
+#:
+#: Values:
+#: - ``"drop_oldest"``: discard the oldest buffered chunks and count them.
+#: - ``"block"``: stop reading from the transport until the consumer catches up.
+CommandOutputOverflow: TypeAlias = Literal["drop_oldest", "block"]
+
+
+class CommandOutputStats(BaseModel):
+    """Point-in-time counters for one `CommandOutputMonitor`.
+
+    Attributes:
+        open_streams: Command items whose output is still streaming.
+        streams: Command output streams opened so far.
+        chars: Output characters received across all streams.
+        dropped_chars: Characters discarded by the ``"drop_oldest"`` policy.
+        pauses: Times a full ``"block"`` stream paused the receiver.
+        sink_errors: Streams whose sink raised and stopped receiving output.
+    """
+
+    open_streams: int = 0
+    streams: int = 0
+    chars: int = 0
+    dropped_chars: int = 0
+    pauses: int = 0
+    sink_errors: int = 0
+
+
+#: Why a notification was discarded without reaching a turn waiter.
+#:
+#: Values:
+#: - ``"unroutable"``: event carries no turn id (for example thread-level events).
+#: - ``"late"``: event belongs to a turn this client already finished.
+#: - ``"expired"``: event was held longer than the orphan TTL.
+#: - ``"evicted"``: event was pushed out by the orphan buffer cap.
+OrphanDropReason: TypeAlias = Literal["unroutable", "late", "expired", "evicted"]
+
+
 class UnsetType:
     """Sentinel type representing an omitted configuration field."""
 
@@ -260,9 +453,152 @@ class TurnOverrides:
     output_schema: dict[str, Any] | None | UnsetType = UNSET
 
 
+@dataclass(slots=True)
+class TurnSchedule:
+    """Admission options for one turn when a `TurnScheduler` is attached.
+
+    Attributes:
+        priority: Admission class of the turn.
+        key: Fairness key (for example a tenant id). Keys within a priority
+            class share admission by weighted round robin. Defaults to the
+            turn's thread id.
+        deadline: Seconds the turn may wait for admission. Within a key,
+            turns with earlier deadlines are admitted first; a turn still
+            waiting when its deadline passes fails with `CodexTimeoutError`.
+    """
+
+    priority: TurnPriority = "normal"
+    key: str | None = None
+    deadline: float | None = None
+
+
+@dataclass(slots=True)
+class TurnSample:
+    """What one admitted turn looked like, reported when its slot is released.
+
+    Attributes:
+        admitted_at: Event-loop time at which the turn was admitted.
+        in_flight: Turns running, including this one, when it was admitted.
+        first_event_seconds: Time from admission to the first notification
+            for the turn, or `None` if none arrived.
+        duration_seconds: Time from admission to release.
+        error_code: JSON-RPC code of the `CodexProtocolError` that rejected
+            `turn/start`, if any.
+        failed: Whether the turn failed, was rejected, or was abandoned
+            before the server completed it.
+    """
+
+    admitted_at: float
+    in_flight: int
+    first_event_seconds: float | None
+    duration_seconds: float
+    error_code: int | None = None
+    failed: bool = False
+
+
 RequestId: TypeAlias = int | str
 
 
+@dataclass(slots=True)
+class ChatBatchItem:
+    """Outcome of one prompt in a `chat_batch(...)` run.
+
+    Attributes:
+        index: Position of the prompt in the input.
+        prompt: User text that was sent.
+        result: Final turn result, or `None` if the prompt failed.
+        error: Exception from the last attempt, or `None` on success.
+        attempts: Turns started for the prompt, including retries.
+        continuations: Inactivity timeouts that were waited through.
+    """
+
+    index: int
+    prompt: str
+    result: ChatResult | None = None
+    error: Exception | None = None
+    attempts: int = 0
+    continuations: int = 0
+
+
+@dataclass(slots=True)
+class ChatRequest:
+    """One turn to start with `chat_many(...)`.
+
+    Attributes:
+        text: User text for the turn.
+        thread_id: Existing thread to run on; a new thread is started if `None`.
+        user: Optional user label forwarded on `turn/start`.
+        metadata: Optional per-turn metadata forwarded on `turn/start`.
+        thread_config: Optional thread-level configuration.
+        turn_overrides: Optional per-turn overrides.
+        schedule: Optional admission options for the attached `TurnScheduler`.
+    """
+
+    text: str
+    thread_id: str | None = None
+    user: str | None = None
+    metadata: dict[str, Any] | None = None
+    thread_config: ThreadConfig | None = None
+    turn_overrides: TurnOverrides | None = None
+    schedule: TurnSchedule | None = None
+
+
+@dataclass(slots=True)
+class TurnEnded:
+    """Marker yielded by `chat_many(...)` once one of its turns is over.
+
+    Attributes:
+        thread_id: Thread the turn ran on, or `None` if it never started.
+        turn_id: Turn identifier, or `None` if it never started.
+        final_text: Text of the turn's last completed agent message, if any.
+        error: Why the turn did not complete, or `None` if it did. A
+            `CodexTurnInactiveError` carries a continuation for `chat(...)`.
+    """
+
+    thread_id: str | None = None
+    turn_id: str | None = None
+    final_text: str | None = None
+    error: Exception | None = None
+
+
+@dataclass(slots=True)
+class StructuredOutputItem:
+    """One completed top-level part of a structured (JSON) answer.
+
+    Emitted by `StructuredOutputParser` while the answer is still streaming.
+
+    Attributes:
+        value: Decoded JSON value of the field or element.
+        key: Field name when the answer is a JSON object, else `None`.
+        index: Element position when the answer is a JSON array, else `None`.
+    """
+
+    value: Any
+    key: str | None = None
+    index: int | None = None
+
+
+@dataclass(slots=True)
+class ThreadTemplate:
+    """Recipe for a primed thread that new threads are forked from.
+
+    The template thread is created with `config`, then each prompt in
+    `priming_prompts` is run as one turn. Templates are cached by `name`;
+    changing any other field re-primes the template on next use.
+
+    Attributes:
+        name: Cache key for the primed thread.
+        config: Thread-level configuration for the template thread.
+        priming_prompts: User messages run in order to load shared context.
+        turn_overrides: Optional per-turn overrides for the priming turns.
+    """
+
+    name: str
+    config: ThreadConfig | None = None
+    priming_prompts: Sequence[str] = ()
+    turn_overrides: TurnOverrides | None = None
+
+
 @dataclass(slots=True)
 class CommandApprovalRequest:
     """Server-initiated approval request for one command execution item."""
@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import OrderedDict
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Mapping,
+    Sequence,
+)
+from typing import TYPE_CHECKING, Any
+
+from .batch import _chat_batch
+from .client import CodexClient, ThreadHandle
+from .codec import JsonCodec
+from .errors import CodexTurnInactiveError
+from .models import (
+    ApprovalRequest,
+    CancelResult,
+    ChatBatchItem,
+    ChatContinuation,
+    ChatResult,
+    CommandApprovalDecision,
+    ConversationStep,
+    FileChangeApprovalDecision,
+    ThreadConfig,
+    TurnOverrides,
+    TurnSchedule,
+)
+
+if TYPE_CHECKING:
+    from .scheduling import TurnScheduler
+
+
+class CodexClientPool:
+    """Spread threads over several app-server connections.
+
+    Each member is an independent `CodexClient` (typically one
+    `codex app-server` subprocess each). New threads go to the least-loaded
+    member; every later call for a thread is routed to the member that owns
+    it, because thread state lives inside that app-server process. Handles
+    returned by the pool are ordinary `ThreadHandle` objects bound to the
+    owning member.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[CodexClient],
+        *,
+        max_pinned_threads: int = 10_000,
+    ) -> None:
+        """Create a pool over existing clients.
+
+        Args:
+            clients: Member clients. They may be started or unstarted;
+                `start()` starts all of them.
+            max_pinned_threads: Maximum number of thread-to-member pins kept.
+                The least recently used pin is dropped when the cap is
+                exceeded; later calls for that thread then go to the
+                least-loaded member, so set it above the number of threads
+                still in use.
+
+        Raises:
+            ValueError: If `clients` is empty or `max_pinned_threads` is
+                smaller than 1.
+        """
+        if not clients:
+            raise ValueError("pool requires at least one client")
+        if max_pinned_threads < 1:
+            raise ValueError("max_pinned_threads must be at least 1")
+        self._members = tuple(clients)
+        self._max_pinned_threads = max_pinned_threads
+        # Owning member index by thread id, least recently used first.
+        self._thread_owner: OrderedDict[str, int] = OrderedDict()
+        self._thread_counts = [0] * len(self._members)
+        self._in_flight = [0] * len(self._members)
+
+    @classmethod
+    def connect_stdio(
+        cls,
+        size: int | None = None,
+        *,
+        command: Sequence[str] | None = None,
+        cwd: str | None = None,
+        env: Mapping[str, str] | None = None,
+        connect_timeout: float = 30.0,
+        codec: JsonCodec | None = None,
+        request_timeout: float = 30.0,
+        inactivity_timeout: float | None = 180.0,
+        strict: bool = False,
+        max_pinned_threads: int = 10_000,
+    ) -> CodexClientPool:
+        """Create an unstarted pool of stdio clients.
+
+        Args:
+            size: Number of app-server processes. Defaults to the CPU count.
+            command: Optional command argv. Defaults to `CODEX_APP_SERVER_CMD`
+                or `["codex", "app-server"]`.
+            cwd: Optional subprocess working directory.
+            env: Optional subprocess environment overrides.
+            connect_timeout: Subprocess spawn timeout in seconds.
+            codec: Optional JSON codec for every member transport.
+            request_timeout: Default request/response timeout in seconds.
+            inactivity_timeout: Default turn inactivity timeout in seconds.
+            strict: Enable strict protocol behavior for ambiguous cases.
+            max_pinned_threads: Cap on remembered thread-to-member pins.
+
+        Returns:
+            Unstarted `CodexClientPool`.
+
+        Raises:
+            ValueError: If `size` is smaller than 1.
+        """
+        resolved_size = size if size is not None else (os.cpu_count() or 1)
+        if resolved_size < 1:
+            raise ValueError("pool size must be at least 1")
+        return cls(
+            [
+                CodexClient.connect_stdio(
+                    command=command,
+                    cwd=cwd,
+                    env=env,
+                    connect_timeout=connect_timeout,
+                    codec=codec,
+                    request_timeout=request_timeout,
+                    inactivity_timeout=inactivity_timeout,
+                    strict=strict,
+                )
+                for _ in range(resolved_size)
+            ],
+            max_pinned_threads=max_pinned_threads,
+        )
+
+    @property
+    def members(self) -> tuple[CodexClient, ...]:
+        """Member clients in pool order."""
+        return self._members
+
+    async def start(self) -> CodexClientPool:
+        """Start every member concurrently.
+
+        Returns:
+            `self` for fluent usage.
+
+        Raises:
+            CodexTransportError: If any member fails to start. Members that did
+                start are closed again.
+        """
+        results = await asyncio.gather(
+            *(member.start() for member in self._members),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                await self.close()
+                raise result
+        return self
+
+    async def __aenter__(self) -> CodexClientPool:
+        """Support `async with CodexClientPool(...)` usage."""
+        return await self.start()
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        """Close pool on context-manager exit."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close every member and forget thread ownership."""
+        await asyncio.gather(
+            *(member.close() for member in self._members),
+            return_exceptions=True,
+        )
+        self._thread_owner.clear()
+        self._thread_counts = [0] * len(self._members)
+
+    def client_for_thread(self, thread_id: str) -> CodexClient | None:
+        """Return the member that owns `thread_id`, if the pool has seen it."""
+        index = self._thread_owner.get(thread_id)
+        return self._members[index] if index is not None else None
+
+    def set_approval_handler(
+        self,
+        handler: (
+            Callable[
+                [ApprovalRequest],
+                Awaitable[CommandApprovalDecision | FileChangeApprovalDecision],
+            ]
+            | None
+        ),
+    ) -> None:
+        """Set or clear the approval handler on every member."""
+        for member in self._members:
+            member.set_approval_handler(handler)
+
+    def set_turn_scheduler(self, scheduler: TurnScheduler | None) -> None:
+        """Set or clear one shared `TurnScheduler` on every member.
+
+        Sharing the scheduler caps the number of turns running across the
+        whole pool, not per member.
+        """
+        for member in self._members:
+            member.set_turn_scheduler(scheduler)
+
+    async def start_thread(self, config: ThreadConfig | None = None) -> ThreadHandle:
+        """Create a thread on the least-loaded member.
+
+        Args:
+            config: Optional thread-level configuration for `thread/start`.
+
+        Returns:
+            `ThreadHandle` bound to the owning member.
+        """
+        index = self._least_loaded()
+        self._in_flight[index] += 1
+        try:
+            handle = await self._members[index].start_thread(config)
+        finally:
+            self._in_flight[index] -= 1
+        self._pin(handle.thread_id, index)
+        return handle
+
+    async def resume_thread(
+        self,
+        thread_id: str,
+        *,
+        overrides: ThreadConfig | None = None,
+    ) -> ThreadHandle:
+        """Resume a thread on its owner, or on the least-loaded member if unknown.
+
+        Args:
+            thread_id: Existing thread id to resume.
+            overrides: Optional thread-level overrides applied on resume.
+
+        Returns:
+            `ThreadHandle` bound to the owning member.
+        """
+        index = self._index_for(thread_id)
+        handle = await self._members[index].resume_thread(thread_id, overrides=overrides)
+        self._pin(handle.thread_id, index)
+        return handle
+
+    async def fork_thread(
+        self,
+        thread_id: str,
+        *,
+        overrides: ThreadConfig | None = None,
+    ) -> ThreadHandle:
+        """Fork a thread on the member that owns the source thread.
+
+        Args:
+            thread_id: Source thread id to fork from.
+            overrides: Optional thread-level overrides for the forked thread.
+
+        Returns:
+            `ThreadHandle` for the fork, owned by the same member.
+        """
+        index = self._index_for(thread_id)
+        self._pin(thread_id, index)
+        handle = await self._members[index].fork_thread(thread_id, overrides=overrides)
+        self._pin(handle.thread_id, index)
+        return handle
+
+    async def archive_thread(self, thread_id: str) -> None:
+        """Archive a thread on its owner and release the pool's pin."""
+        index = self._index_for(thread_id)
+        await self._members[index].archive_thread(thread_id)
+        self._unpin(thread_id)
+
+    async def chat_once(
+        self,
+        text: str | None = None,
+        thread_id: str | None = None,
+        *,
+        user: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        thread_config: ThreadConfig | None = None,
+        turn_overrides: TurnOverrides | None = None,
+        inactivity_timeout: float | None = None,
+        continuation: ChatContinuation | None = None,
+        schedule: TurnSchedule | None = None,
+    ) -> ChatResult:
+        """Run `CodexClient.chat_once(...)` on the member that owns the thread.
+
+        New threads (`thread_id` omitted) are started on the least-loaded
+        member. Arguments and errors are the same as `CodexClient.chat_once`.
+        """
+        index = self._index_for(continuation.thread_id if continuation else thread_id)
+        self._in_flight[index] += 1
+        try:
+            result = await self._members[index].chat_once(
+                text,
+                thread_id,
+                user=user,
+                metadata=metadata,
+                thread_config=thread_config,
+                turn_overrides=turn_overrides,
+                inactivity_timeout=inactivity_timeout,
+                continuation=continuation,
+                schedule=schedule,
+            )
+        except CodexTurnInactiveError as exc:
+            # The turn keeps running on this member; pin its thread so the
+            # continuation and `cancel()` are routed back here.
+            self._pin(exc.continuation.thread_id, index)
+            raise
+        finally:
+            self._in_flight[index] -= 1
+        self._pin(result.thread_id, index)
+        return result
+
+    async def chat(
+        self,
+        text: str | None = None,
+        thread_id: str | None = None,
+        *,
+        user: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        thread_config: ThreadConfig | None = None,
+        turn_overrides: TurnOverrides | None = None,
+        inactivity_timeout: float | None = None,
+        continuation: ChatContinuation | None = None,
+        schedule: TurnSchedule | None = None,
+    ) -> AsyncIterator[ConversationStep]:
+        """Run `CodexClient.chat(...)` on the member that owns the thread.
+
+        New threads (`thread_id` omitted) are started on the least-loaded
+        member. Arguments and errors are the same as `CodexClient.chat`.
+        """
+        index = self._index_for(continuation.thread_id if continuation else thread_id)
+        self._in_flight[index] += 1
+        try:
+            async for step in self._members[index].chat(
+                text,
+                thread_id,
+                user=user,
+                metadata=metadata,
+                thread_config=thread_config,
+                turn_overrides=turn_overrides,
+                inactivity_timeout=inactivity_timeout,
+                continuation=continuation,
+                schedule=schedule,
+            ):
+                self._pin(step.thread_id, index)
+                yield step
+        except CodexTurnInactiveError as exc:
+            self._pin(exc.continuation.thread_id, index)
+            raise
+        finally:
+            self._in_flight[index] -= 1
+
+    def chat_batch(
+        self,
+        prompts: Iterable[str],
+        *,
+        concurrency: int = 8,
+        thread_config: ThreadConfig | None = None,
+        turn_overrides: TurnOverrides | None = None,
+        inactivity_timeout: float | None = None,
+        max_continuations: int = 3,
+        retries: int = 0,
+        schedule: TurnSchedule | None = None,
+    ) -> AsyncIterator[ChatBatchItem]:
+        """Run `CodexClient.chat_batch(...)` semantics across all members.
+
+        Each prompt starts a new thread on the least-loaded member, so
+        `concurrency` is the total across the pool. Arguments, results and
+        errors are the same as `CodexClient.chat_batch`.
+        """
+        return _chat_batch(
+            self.chat_once,
+            self.cancel,
+            prompts,
+            concurrency=concurrency,
+            max_continuations=max_continuations,
+            retries=retries,
+            inactivity_timeout=inactivity_timeout,
+            chat_kwargs={
+                "thread_config": thread_config,
+                "turn_overrides": turn_overrides,
+                "schedule": schedule,
+            },
+        )
+
+    async def cancel(
+        self,
+        continuation: ChatContinuation,
+        *,
+        timeout: float | None = None,
+    ) -> CancelResult:
+        """Run `CodexClient.cancel(...)` on the member that owns the turn's thread."""
+        index = self._index_for(continuation.thread_id)
+        return await self._members[index].cancel(continuation, timeout=timeout)
+
+    def _index_for(self, thread_id: str | None) -> int:
+        if thread_id is not None:
+            index = self._thread_owner.get(thread_id)
+            if index is not None:
+                self._thread_owner.move_to_end(thread_id)
+                return index
+        return self._least_loaded()
+
+    def _least_loaded(self) -> int:
+        # Pool calls in flight (counted from before the thread exists, so
+        # concurrent new threads spread out) plus live turns, then thread
+        # count as a tie-breaker so idle members fill evenly.
+        return min(
+            range(len(self._members)),
+            key=lambda index: (
+                self._members[index].active_turns + self._in_flight[index],
+                self._thread_counts[index],
+            ),
+        )
+
+    def _pin(self, thread_id: str, index: int) -> None:
+        previous = self._thread_owner.get(thread_id)
+        if previous == index:
+            self._thread_owner.move_to_end(thread_id)
+            return
+        if previous is not None:
+            self._thread_counts[previous] -= 1
+        self._thread_owner[thread_id] = index
+        self._thread_owner.move_to_end(thread_id)
+        self._thread_counts[index] += 1
+        while len(self._thread_owner) > self._max_pinned_threads:
+            _, evicted = self._thread_owner.popitem(last=False)
+            self._thread_counts[evicted] -= 1
+
+    def _unpin(self, thread_id: str) -> None:
+        index = self._thread_owner.pop(thread_id, None)
+        if index is not None:
+            self._thread_counts[index] -= 1
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from typing import Any, Protocol
+
+from ._params import _params_fingerprint, _thread_config_to_params
+from .errors import CodexError
+from .models import ThreadConfig, ThreadPrefetchStats
+
+
+def _config_fingerprint(config: ThreadConfig | None) -> str:
+    """Stable key for configs that produce identical `thread/start` params."""
+    return _params_fingerprint(_thread_config_to_params(config))
+
+
+class ThreadPrefetchHost(Protocol):
+    """Client surface a prefetcher attaches to; `CodexClient` implements it."""
+
+    @property
+    def closed(self) -> bool:
+        """Whether the client was closed."""
+        ...
+
+    @property
+    def thread_prefetcher(self) -> ThreadPrefetcher | None:
+        """The attached prefetcher, if any."""
+        ...
+
+    def set_thread_prefetcher(self, prefetcher: ThreadPrefetcher | None) -> None:
+        """Attach or detach a prefetcher."""
+        ...
+
+    async def create_thread(self, config: ThreadConfig | None = None) -> str:
+        """Send `thread/start` and return the new thread id."""
+        ...
+
+    async def archive_thread(self, thread_id: str) -> None:
+        """Archive one thread."""
+        ...
+
+
+class ThreadPrefetcher:
+    """Keep threads pre-created per `ThreadConfig` so new conversations skip `thread/start`.
+
+    Threads are keyed by the `thread/start` params their config produces, so
+    two configs that differ only in unset fields share a bucket. A config is
+    kept warm once it is listed in `configs`, passed to `prefetch()`, or first
+    requested. Every hand-out schedules a background refill back to
+    `per_config` ready threads, never exceeding `max_threads` ready plus
+    starting threads in total.
+
+    When a refill needs room, or more than `max_threads` configs are known,
+    the least recently used configs are dropped and their ready threads
+    archived, so one-off configs cannot crowd out the ones in use.
+
+    `start()` attaches the prefetcher to the client, after which
+    `start_thread()` and `chat_once()`/`chat()` without a `thread_id` use it.
+    """
+
+    def __init__(
+        self,
+        client: ThreadPrefetchHost,
+        *,
+        per_config: int = 2,
+        max_threads: int = 16,
+        configs: Sequence[ThreadConfig | None] = (),
+    ) -> None:
+        """Configure the prefetcher.
+
+        Args:
+            client: Client the threads are created on.
+            per_config: Ready threads to keep for each known config.
+            max_threads: Cap on ready plus starting threads across all configs.
+            configs: Configs to keep warm from `start()` on.
+
+        Raises:
+            ValueError: If `per_config` or `max_threads` is smaller than 1.
+        """
+        if per_config < 1:
+            raise ValueError("per_config must be at least 1")
+        if max_threads < 1:
+            raise ValueError("max_threads must be at least 1")
+        self._client = client
+        self._per_config = per_config
+        self._max_threads = max_threads
+        # Known configs by fingerprint, least recently used first.
+        self._configs: OrderedDict[str, ThreadConfig | None] = OrderedDict()
+        self._ready: dict[str, deque[str]] = {}
+        self._starting: dict[str, int] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._hits = 0
+        self._misses = 0
+        self._failed_starts = 0
+        self._evicted_configs = 0
+        self._last_error: BaseException | None = None
+        self._started = False
+        self._closed = False
+        for config in configs:
+            self._register(config)
+
+    @property
+    def last_error(self) -> BaseException | None:
+        """Most recent failure seen by a background `thread/start`."""
+        return self._last_error
+
+    def ready(self, config: ThreadConfig | None = None) -> int:
+        """Number of pre-created threads ready for `config`."""
+        return len(self._ready.get(_config_fingerprint(config), ()))
+
+    def stats(self) -> ThreadPrefetchStats:
+        """Return a snapshot of hit/miss and refill counters."""
+        return ThreadPrefetchStats(
+            hits=self._hits,
+            misses=self._misses,
+            ready=sum(len(ready) for ready in self._ready.values()),
+            starting=sum(self._starting.values()),
+            failed_starts=self._failed_starts,
+            configs=len(self._configs),
+            evicted_configs=self._evicted_configs,
+        )
+
+    async def start(self) -> ThreadPrefetcher:
+        """Attach to the client and fill every known config.
+
+        Returns:
+            `self` for fluent usage.
+
+        Raises:
+            CodexError: If no thread could be created and a refill failed.
+        """
+        self._started = True
+        self._client.set_thread_prefetcher(self)
+        for key in list(self._configs):
+            self._refill(key)
+        await self.wait_ready()
+        return self
+
+    async def wait_ready(self) -> None:
+        """Wait for in-flight refills; re-raise the last failure if none succeeded."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if not any(self._ready.values()) and self._last_error is not None:
+            raise self._last_error
+
+    async def __aenter__(self) -> ThreadPrefetcher:
+        """Support `async with ThreadPrefetcher(...)` usage."""
+        return await self.start()
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        """Close prefetcher on context-manager exit."""
+        await self.close()
+
+    async def close(self, *, archive: bool = True) -> None:
+        """Detach from the client, stop refilling and release unused threads.
+
+        Args:
+            archive: Archive threads that were never handed out. With `False`
+                they are only forgotten.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._client.thread_prefetcher is self:
+            self._client.set_thread_prefetcher(None)
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        unused = [thread_id for ready in self._ready.values() for thread_id in ready]
+        self._ready.clear()
+        if archive and unused and not self._client.closed:
+            await asyncio.gather(
+                *(self._client.archive_thread(thread_id) for thread_id in unused),
+                return_exceptions=True,
+            )
+
+    def prefetch(self, config: ThreadConfig | None = None) -> None:
+        """Start keeping threads ready for `config`."""
+        self._refill(self._register(config))
+
+    def acquire_nowait(self, config: ThreadConfig | None = None) -> str | None:
+        """Take a pre-created thread id for `config` without waiting.
+
+        Returns:
+            A thread id created with `config`'s params, or `None` when none is
+            ready. Either way a background refill is scheduled.
+        """
+        if self._closed:
+            return None
+        key = self._register(config)
+        ready = self._ready[key]
+        thread_id = ready.popleft() if ready else None
+        if thread_id is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        self._refill(key)
+        return thread_id
+
+    def _register(self, config: ThreadConfig | None) -> str:
+        key = _config_fingerprint(config)
+        if key in self._configs:
+            self._configs.move_to_end(key)
+            return key
+        self._configs[key] = config
+        self._ready[key] = deque()
+        self._starting[key] = 0
+        for cold in list(self._configs):
+            if len(self._configs) <= self._max_threads:
+                break
+            if cold != key:
+                self._evict(cold)
+        return key
+
+    def _refill(self, key: str) -> None:
+        if not self._started or self._closed:
+            return
+        wanted = self._per_config - len(self._ready[key]) - self._starting[key]
+        if wanted <= 0:
+            return
+        total = sum(len(ready) for ready in self._ready.values()) + sum(self._starting.values())
+        for cold in list(self._configs):
+            if total + wanted <= self._max_threads:
+                break
+            if cold != key and self._ready[cold]:
+                total -= self._evict(cold)
+        for _ in range(min(wanted, self._max_threads - total)):
+            self._starting[key] += 1
+            task = asyncio.create_task(self._start_one(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _evict(self, key: str) -> int:
+        """Drop an idle config and archive its ready threads; return how many."""
+        if self._starting[key]:
+            return 0
+        del self._configs[key], self._starting[key]
+        unused = self._ready.pop(key)
+        self._evicted_configs += 1
+        if unused and not self._client.closed:
+            task = asyncio.create_task(self._archive(list(unused)))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return len(unused)
+
+    async def _archive(self, thread_ids: list[str]) -> None:
+        await asyncio.gather(
+            *(self._client.archive_thread(thread_id) for thread_id in thread_ids),
+            return_exceptions=True,
+        )
+
+    async def _start_one(self, key: str) -> None:
+        try:
+            thread_id = await self._client.create_thread(self._configs[key])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._failed_starts += 1
+            self._last_error = exc
+            return
+        finally:
+            self._starting[key] -= 1
+        if self._closed:
+            with contextlib.suppress(CodexError):
+                await self._client.archive_thread(thread_id)
+            return
+        self._ready[key].append(thread_id)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any
+import re
+from typing import Any, NamedTuple
 
 # JSON-RPC protocol version used by Codex app-server envelopes.
 JSONRPC_VERSION = "2.0"
@@ -20,6 +21,7 @@ THREAD_READ_METHOD = "thread/read"
 TURN_START_METHOD = "turn/start"
 TURN_STEER_METHOD = "turn/steer"
 TURN_INTERRUPT_METHOD = "turn/interrupt"
+TURN_STARTED_METHOD = "turn/started"
 REVIEW_START_METHOD = "review/start"
 MODEL_LIST_METHOD = "model/list"
 COMMAND_EXEC_METHOD = "command/exec"
@@ -27,7 +29,10 @@ CONFIG_READ_METHOD = "config/read"
 CONFIG_VALUE_WRITE_METHOD = "config/value/write"
 CONFIG_BATCH_WRITE_METHOD = "config/batchWrite"
 CONFIG_REQUIREMENTS_READ_METHOD = "configRequirements/read"
+ITEM_STARTED_METHOD = "item/started"
 ITEM_COMPLETED_METHOD = "item/completed"
+ITEM_AGENT_MESSAGE_DELTA_METHOD = "item/agentMessage/delta"
+ITEM_COMMAND_EXECUTION_OUTPUT_DELTA_METHOD = "item/commandExecution/outputDelta"
 ITEM_COMMAND_EXECUTION_REQUEST_APPROVAL_METHOD = "item/commandExecution/requestApproval"
 ITEM_FILE_CHANGE_REQUEST_APPROVAL_METHOD = "item/fileChange/requestApproval"
 
@@ -127,3 +132,68 @@ def is_turn_completed(method: str) -> bool:
 def is_turn_failed(method: str) -> bool:
     """Return True when method name indicates turn failure."""
     return method in TURN_FAILED_METHODS
+
+
+class MessageHead(NamedTuple):
+    """Top-level fields read from the start of an undecoded message.
+
+    Attributes:
+        id: Request/response id, if it appears before the first nested value.
+        method: Method name, if it appears before the first nested value.
+        has_result: True when a top-level `result` key was reached.
+    """
+
+    id: int | str | None
+    method: str | None
+    has_result: bool
+
+
+_HEAD_OPEN = re.compile(rb"\s*\{")
+_HEAD_KEY = re.compile(rb'\s*"([A-Za-z_]+)"\s*:\s*')
+_HEAD_SCALAR = re.compile(rb'"([^"\\]*)"|(-?\d+)(?![\d.eE])|null|true|false')
+_HEAD_SEPARATOR = re.compile(rb"\s*,")
+
+
+def peek_message_head(data: bytes | bytearray | memoryview) -> MessageHead | None:
+    """Read `id`, `method` and `result` presence without parsing the whole message.
+
+    Top-level keys are scanned in order until the first object/array value
+    (usually `params` or `result`), so the cost does not depend on message
+    size. Escaped strings, floats and other unusual shapes are not handled.
+
+    Returns:
+        `MessageHead`, or `None` when the prefix cannot be read cheaply and the
+        caller should fully decode the message.
+    """
+    match = _HEAD_OPEN.match(data)
+    if match is None:
+        return None
+    pos = match.end()
+    message_id: int | str | None = None
+    method: str | None = None
+    while True:
+        key_match = _HEAD_KEY.match(data, pos)
+        if key_match is None:
+            return None
+        key = key_match.group(1)
+        pos = key_match.end()
+        if key == b"result":
+            return MessageHead(message_id, method, True)
+        value_match = _HEAD_SCALAR.match(data, pos)
+        if value_match is None:
+            # Nested value (or something this scan does not handle): stop here.
+            return MessageHead(message_id, method, False)
+        if key == b"id":
+            if value_match.group(1) is not None:
+                message_id = value_match.group(1).decode("utf-8")
+            elif value_match.group(2) is not None:
+                message_id = int(value_match.group(2))
+        elif key == b"method":
+            if value_match.group(1) is None:
+                return None
+            method = value_match.group(1).decode("utf-8")
+        pos = value_match.end()
+        separator = _HEAD_SEPARATOR.match(data, pos)
+        if separator is None:
+            return MessageHead(message_id, method, False)
+        pos = separator.end()
@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass, field
+
+from .errors import CodexTimeoutError
+from .models import (
+    AimdStats,
+    TurnPriority,
+    TurnSample,
+    TurnSchedule,
+    TurnSchedulerStats,
+)
+
+_PRIORITIES: tuple[TurnPriority, ...] = ("high", "normal", "low")
+# JSON-RPC "implementation-defined server error" codes (overload, rate limits).
+_SERVER_ERROR_CODES = range(-32099, -31999)
+
+
+@dataclass(order=True, slots=True)
+class _Waiter:
+    """One turn waiting for admission; heap-ordered by deadline, then arrival."""
+
+    deadline: float
+    seq: int
+    future: asyncio.Future[None] = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    expiry: asyncio.TimerHandle | None = field(default=None, compare=False)
+
+
+@dataclass(slots=True)
+class TurnAdmission:
+    """Permit for one admitted turn; give it back with `release()` when it finishes."""
+
+    scheduler: TurnScheduler = field(repr=False)
+    admitted_at: float
+    in_flight: int = 1
+    first_event_at: float | None = None
+    released: bool = False
+
+    def observe_event(self) -> None:
+        """Record that the turn produced a notification."""
+        if self.first_event_at is None:
+            self.first_event_at = asyncio.get_running_loop().time()
+
+    def release(self, *, error_code: int | None = None, failed: bool = False) -> None:
+        """Return the slot to the scheduler. Releasing twice is a no-op.
+
+        Args:
+            error_code: JSON-RPC code of the error that rejected the turn.
+            failed: Whether the turn did not complete successfully.
+        """
+        if self.released:
+            return
+        self.released = True
+        now = asyncio.get_running_loop().time()
+        self.scheduler._release(
+            TurnSample(
+                admitted_at=self.admitted_at,
+                in_flight=self.in_flight,
+                first_event_seconds=(
+                    self.first_event_at - self.admitted_at
+                    if self.first_event_at is not None
+                    else None
+                ),
+                duration_seconds=now - self.admitted_at,
+                error_code=error_code,
+                failed=failed or error_code is not None,
+            )
+        )
+
+
+class TurnScheduler:
+    """Limit concurrently running turns and order the ones that wait.
+
+    Waiting turns are admitted by priority class first. Within a class, the
+    fairness keys with waiting turns share admissions by smooth weighted
+    round robin. Within a key, the earliest deadline goes first, then arrival
+    order.
+
+    Attach to a client with `CodexClient.set_turn_scheduler()`. One scheduler
+    may be shared by several clients to cap their combined concurrency.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        *,
+        weights: Mapping[str, int] | None = None,
+        controller: AimdController | None = None,
+    ) -> None:
+        """Configure the scheduler.
+
+        Args:
+            max_in_flight: Maximum number of turns running at once. With a
+                `controller`, this is the starting limit.
+            weights: Optional round-robin weight per fairness key. Keys not
+                listed have weight 1.
+            controller: Optional `AimdController` that adjusts
+                `max_in_flight` from every finished turn.
+
+        Raises:
+            ValueError: If `max_in_flight` or any weight is smaller than 1.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if weights and min(weights.values()) < 1:
+            raise ValueError("weights must be at least 1")
+        self._max_in_flight = max_in_flight
+        self._controller = controller
+        self._weights = dict(weights) if weights is not None else {}
+        self._in_flight = 0
+        self._queues: dict[TurnPriority, dict[str, list[_Waiter]]] = {
+            priority: {} for priority in _PRIORITIES
+        }
+        # Smooth weighted round-robin state per class, for keys with waiters.
+        self._current_weights: dict[TurnPriority, dict[str, int]] = {
+            priority: {} for priority in _PRIORITIES
+        }
+        self._queued: dict[TurnPriority, int] = dict.fromkeys(_PRIORITIES, 0)
+        self._seq = itertools.count()
+        self._admitted = 0
+        self._expired = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def max_in_flight(self) -> int:
+        """Current concurrency limit."""
+        return self._max_in_flight
+
+    @max_in_flight.setter
+    def max_in_flight(self, value: int) -> None:
+        if value < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self._max_in_flight = value
+        self._dispatch()
+
+    @property
+    def in_flight(self) -> int:
+        """Turns admitted and not yet released."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Turns waiting for admission."""
+        return sum(self._queued.values())
+
+    @property
+    def controller(self) -> AimdController | None:
+        """Controller adjusting `max_in_flight`, if any."""
+        return self._controller
+
+    def stats(self) -> TurnSchedulerStats:
+        """Return a snapshot of admission counters."""
+        return TurnSchedulerStats(
+            max_in_flight=self._max_in_flight,
+            in_flight=self._in_flight,
+            queued=self.queued,
+            queued_by_priority=dict(self._queued),
+            admitted=self._admitted,
+            expired=self._expired,
+            mean_wait_seconds=self._total_wait / self._admitted if self._admitted else 0.0,
+            max_wait_seconds=self._max_wait,
+        )
+
+    async def acquire(
+        self,
+        schedule: TurnSchedule | None = None,
+        *,
+        default_key: str = "",
+    ) -> TurnAdmission:
+        """Wait until a turn may start.
+
+        Args:
+            schedule: Priority, fairness key and deadline of the turn.
+            default_key: Fairness key used when `schedule.key` is not set.
+
+        Returns:
+            `TurnAdmission` to release when the turn finishes.
+
+        Raises:
+            CodexTimeoutError: If `schedule.deadline` passes before admission.
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        priority: TurnPriority = schedule.priority if schedule is not None else "normal"
+        key = schedule.key if schedule is not None and schedule.key is not None else default_key
+        deadline = schedule.deadline if schedule is not None else None
+
+        if self._in_flight < self._max_in_flight and not any(self._queued.values()):
+            return self._admit(now, now)
+
+        waiter = _Waiter(
+            deadline=now + deadline if deadline is not None else math.inf,
+            seq=next(self._seq),
+            future=loop.create_future(),
+            enqueued_at=now,
+        )
+        if deadline is not None:
+            waiter.expiry = loop.call_at(waiter.deadline, self._expire, waiter, priority, deadline)
+        heapq.heappush(self._queues[priority].setdefault(key, []), waiter)
+        self._queued[priority] += 1
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if not waiter.future.done() or waiter.future.cancelled():
+                # Still queued; `_next_waiter` skips the cancelled future.
+                waiter.future.cancel()
+                self._queued[priority] -= 1
+            elif waiter.future.exception() is None:
+                # Admitted just as the caller gave up; hand the slot back.
+                self._in_flight -= 1
+                self._dispatch()
+            if waiter.expiry is not None:
+                waiter.expiry.cancel()
+            raise
+        return TurnAdmission(self, admitted_at=loop.time(), in_flight=self._in_flight)
+
+    def _release(self, sample: TurnSample) -> None:
+        self._in_flight -= 1
+        if self._controller is not None:
+            self._controller.observe(self, sample)
+        self._dispatch()
+
+    def _admit(self, enqueued_at: float, now: float) -> TurnAdmission:
+        self._in_flight += 1
+        self._record_admission(now - enqueued_at)
+        return TurnAdmission(self, admitted_at=now, in_flight=self._in_flight)
+
+    def _record_admission(self, wait: float) -> None:
+        self._admitted += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+    def _expire(self, waiter: _Waiter, priority: TurnPriority, deadline: float) -> None:
+        if waiter.future.done():
+            return
+        self._queued[priority] -= 1
+        self._expired += 1
+        waiter.future.set_exception(
+            CodexTimeoutError(f"turn was not admitted within its {deadline:.1f}s deadline")
+        )
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self._max_in_flight:
+            picked = self._next_waiter()
+            if picked is None:
+                return
+            waiter, priority = picked
+            self._queued[priority] -= 1
+            if waiter.expiry is not None:
+                waiter.expiry.cancel()
+            self._in_flight += 1
+            self._record_admission(asyncio.get_running_loop().time() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _next_waiter(self) -> tuple[_Waiter, TurnPriority] | None:
+        for priority in _PRIORITIES:
+            keys = self._queues[priority]
+            while keys:
+                key = self._pick_key(priority)
+                heap = keys[key]
+                waiter = heapq.heappop(heap)
+                if not heap:
+                    del keys[key]
+                    self._current_weights[priority].pop(key, None)
+                if not waiter.future.done():
+                    return waiter, priority
+        return None
+
+    def _pick_key(self, priority: TurnPriority) -> str:
+        current = self._current_weights[priority]
+        keys = self._queues[priority]
+        total = 0
+        for key in keys:
+            weight = self._weights.get(key, 1)
+            total += weight
+            current[key] = current.get(key, 0) + weight
+        # Ties go to the key queued first.
+        best_key = max(keys, key=current.__getitem__)
+        current[best_key] -= total
+        return best_key
+
+
+class AimdController:
+    """Adjust a `TurnScheduler`'s limit by additive increase, multiplicative decrease.
+
+    Every released turn is one sample. A sample signals congestion when
+    `turn/start` was rejected with one of `backoff_codes`, or when the turn's
+    first notification or total duration exceeded its target. Congestion
+    multiplies the limit by `decrease`, at most once per burst: samples from
+    turns admitted before the last cut are ignored. Otherwise a successful
+    turn that ran while the scheduler was saturated adds `increase / limit`,
+    so the limit grows by about `increase` per full window of turns.
+
+    Pass it as `TurnScheduler(controller=...)`; the scheduler's starting
+    `max_in_flight` is the initial limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_in_flight: int = 1,
+        max_in_flight: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        first_event_target: float | None = None,
+        duration_target: float | None = None,
+        backoff_codes: Collection[int] = _SERVER_ERROR_CODES,
+    ) -> None:
+        """Configure the controller.
+
+        Args:
+            min_in_flight: Lowest limit the controller applies.
+            max_in_flight: Highest limit the controller applies.
+            increase: Limit added per window of successful saturated turns.
+            decrease: Factor applied to the limit on congestion, in (0, 1).
+            first_event_target: Seconds from admission to the first
+                notification above which a turn counts as congested.
+            duration_target: Seconds from admission to completion above
+                which a turn counts as congested.
+            backoff_codes: `CodexProtocolError` codes on `turn/start` that
+                count as congestion. Defaults to the JSON-RPC server error
+                range (-32099 to -32000).
+
+        Raises:
+            ValueError: If the bounds or factors are out of range.
+        """
+        if not 1 <= min_in_flight <= max_in_flight:
+            raise ValueError("expected 1 <= min_in_flight <= max_in_flight")
+        if increase <= 0:
+            raise ValueError("increase must be positive")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self._min = min_in_flight
+        self._max = max_in_flight
+        self._increase = increase
+        self._decrease = decrease
+        self._first_event_target = first_event_target
+        self._duration_target = duration_target
+        self._backoff_codes = backoff_codes
+        self._window: float | None = None
+        self._last_decrease_at = -math.inf
+        self._samples = 0
+        self._increases = 0
+        self._decreases = 0
+        self._last_decrease_reason: str | None = None
+        self._limit = 0
+
+    def stats(self) -> AimdStats:
+        """Return a snapshot of controller counters."""
+        return AimdStats(
+            limit=self._limit,
+            samples=self._samples,
+            increases=self._increases,
+            decreases=self._decreases,
+            last_decrease_reason=self._last_decrease_reason,
+        )
+
+    def observe(self, scheduler: TurnScheduler, sample: TurnSample) -> None:
+        """Update the limit of `scheduler` from one finished turn."""
+        self._samples += 1
+        if self._window is None:
+            self._window = float(min(max(scheduler.max_in_flight, self._min), self._max))
+        reason = self._congestion(sample)
+        if reason is not None:
+            if sample.admitted_at <= self._last_decrease_at:
+                # Already cut for the burst this turn belonged to.
+                return
+            self._window = max(float(self._min), self._window * self._decrease)
+            self._last_decrease_at = asyncio.get_running_loop().time()
+            self._decreases += 1
+            self._last_decrease_reason = reason
+        elif sample.failed:
+            return
+        elif sample.in_flight >= scheduler.max_in_flight or scheduler.queued:
+            self._window = min(float(self._max), self._window + self._increase / self._window)
+            self._increases += 1
+        self._limit = int(self._window)
+        if self._limit != scheduler.max_in_flight:
+            scheduler.max_in_flight = self._limit
+
+    def _congestion(self, sample: TurnSample) -> str | None:
+        if sample.error_code is not None and sample.error_code in self._backoff_codes:
+            return "error"
+        if (
+            self._first_event_target is not None
+            and sample.first_event_seconds is not None
+            and sample.first_event_seconds > self._first_event_target
+        ):
+            return "first_event"
+        if self._duration_target is not None and sample.duration_seconds > self._duration_target:
+            return "duration"
+        return None
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Literal
+
+from pydantic import TypeAdapter
+
+from .errors import CodexProtocolError
+from .models import AgentMessageDelta, StructuredOutputItem
+
+# Characters that can change nesting or string state outside a string.
+_STRUCTURAL = re.compile(r'[{}\[\]",]')
+# Characters that can end a string or escape the next one inside a string.
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class StructuredOutputParser:
+    """Incrementally parse a streamed JSON answer, e.g. from a turn with `output_schema`.
+
+    Feed it the agent message text as it arrives (`feed_delta()` with the
+    `AgentMessageDelta`s from `chat_deltas()`, or `feed()` with raw text).
+    Each call returns the top-level object fields or array elements that
+    became complete, so downstream work can start before the turn ends.
+    `result()` parses the whole answer once it is done and validates it
+    against `output_type`.
+
+    Only the part of the text after the last completed field is kept for
+    scanning, so each chunk is scanned once. A message that does not start
+    with `{` or `[` is not treated as structured and yields no items.
+    """
+
+    def __init__(self, output_type: Any = None) -> None:
+        """Configure the parser.
+
+        Args:
+            output_type: Optional type for `result()`, for example a pydantic
+                model or `list[Finding]`. `None` returns the decoded JSON.
+        """
+        self._adapter: TypeAdapter[Any] | None = (
+            None if output_type is None else TypeAdapter(output_type)
+        )
+        self._item_id: str | None = None
+        self.reset()
+
+    @property
+    def text(self) -> str:
+        """Message text fed so far."""
+        return "".join(self._parts)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the top-level JSON value has been closed."""
+        return self._state == "done"
+
+    def reset(self) -> None:
+        """Forget all text fed so far and start over with a new message."""
+        self._parts: list[str] = []
+        self._state: Literal["start", "scanning", "done", "skipped", "invalid"] = "start"
+        self._root: str | None = None
+        # Unscanned text from the start of the current top-level member.
+        self._window = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._member_done = False
+        self._count = 0
+
+    def feed_delta(self, delta: AgentMessageDelta) -> list[StructuredOutputItem]:
+        """Feed one agent message delta; a new message id restarts the parser.
+
+        Only the latest agent message of a turn carries the structured
+        answer, so deltas of a different message reset the parser first.
+        """
+        if delta.item_id != self._item_id:
+            if self._parts:
+                self.reset()
+            self._item_id = delta.item_id
+        return self.feed(delta.delta)
+
+    def feed(self, chunk: str) -> list[StructuredOutputItem]:
+        """Feed raw answer text and return the parts completed by it."""
+        self._parts.append(chunk)
+        if self._state == "start":
+            chunk = chunk.lstrip()
+            if not chunk:
+                return []
+            if chunk[0] not in "{[":
+                self._state = "skipped"
+                return []
+            self._state = "scanning"
+            self._root = chunk[0]
+            self._depth = 1
+            chunk = chunk[1:]
+        elif self._state != "scanning":
+            return []
+
+        items: list[StructuredOutputItem] = []
+        window = self._window + chunk
+        pos = self._pos
+        depth = self._depth
+        while pos < len(window):
+            if self._in_string:
+                match = _STRING_SPECIAL.search(window, pos)
+                if match is None:
+                    pos = len(window)
+                elif match.group() == '"':
+                    self._in_string = False
+                    pos = match.end()
+                elif match.end() < len(window):
+                    pos = match.end() + 1
+                else:
+                    # Wait for the escaped character in the next chunk.
+                    pos = match.start()
+                    break
+                continue
+
+            match = _STRUCTURAL.search(window, pos)
+            if match is None:
+                pos = len(window)
+                break
+            char = match.group()
+            pos = match.end()
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 1:
+                    # A nested value just closed; emit it without waiting for `,`.
+                    self._emit(window[:pos], items)
+                    self._member_done = True
+                elif depth == 0:
+                    if not self._member_done:
+                        self._emit(window[: pos - 1], items)
+                    if self._state == "scanning":
+                        self._state = "done"
+                    window, pos = "", 0
+                    break
+            elif depth == 1:
+                if not self._member_done:
+                    self._emit(window[: pos - 1], items)
+                window, pos = window[pos:], 0
+                self._member_done = False
+            if self._state == "invalid":
+                break
+
+        self._window = window
+        self._pos = pos
+        self._depth = depth
+        return items
+
+    def result(self, text: str | None = None) -> Any:
+        """Parse and validate the complete answer.
+
+        Args:
+            text: Final answer text, for example `ChatResult.final_text`.
+                Defaults to the text fed so far.
+
+        Returns:
+            The decoded JSON, validated as `output_type` when one was given.
+
+        Raises:
+            CodexProtocolError: If the answer is not valid JSON.
+            pydantic.ValidationError: If it does not match `output_type`.
+        """
+        source = self.text if text is None else text
+        try:
+            value = json.loads(source)
+        except ValueError as exc:
+            raise CodexProtocolError(f"structured output is not valid JSON: {exc}") from exc
+        if self._adapter is None:
+            return value
+        return self._adapter.validate_python(value)
+
+    def _emit(self, member: str, items: list[StructuredOutputItem]) -> None:
+        if not member.strip():
+            return
+        try:
+            if self._root == "{":
+                ((key, value),) = json.loads("{" + member + "}").items()
+                items.append(StructuredOutputItem(value=value, key=key))
+            else:
+                items.append(StructuredOutputItem(value=json.loads(member), index=self._count))
+        except ValueError:
+            # Malformed output; `result()` reports the error.
+            self._state = "invalid"
+            return
+        self._count += 1
@@ -1,18 +1,34 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import os
+import shlex
 from abc import ABC, abstractmethod
 from collections.abc import Mapping, Sequence
 from typing import Any
 
 import websockets
 
+from .codec import JsonCodec, StdlibJsonCodec, default_codec
 from .errors import CodexTransportError
 
+# Seconds `StdioTransport.close()` waits for each shutdown step.
+_CLOSE_TIMEOUT = 2.0
+
 
 class Transport(ABC):
-    """Abstract transport interface for JSON-RPC message exchange."""
+    """Abstract transport interface for JSON-RPC message exchange.
+
+    Attributes:
+        codec: JSON codec used to encode/decode message bytes. Built-in
+            transports default to `default_codec()`.
+        supports_raw_messages: True when `recv_raw_many()` hands out received
+            bytes directly. The client then decodes lazily and skips messages
+            nobody consumes; otherwise it uses `recv_many()`.
+    """
+
+    codec: JsonCodec = StdlibJsonCodec()
+    supports_raw_messages: bool = False
 
     @abstractmethod
     async def connect(self) -> None:
@@ -24,20 +40,118 @@ class Transport(ABC):
         """Send one JSON-serializable message."""
         raise NotImplementedError
 
+    async def send_many(self, payloads: Sequence[Mapping[str, Any]]) -> None:
+        """Send several messages in order.
+
+        The default implementation calls `send()` once per payload. Transports
+        that can flush a batch with fewer system calls should override it.
+        """
+        for payload in payloads:
+            await self.send(payload)
+
+    async def send_raw_many(self, messages: Sequence[bytes]) -> None:
+        """Send several messages already encoded with `codec`, in order.
+
+        The client's writer task encodes each message on its own, so a payload
+        that cannot be serialized fails only its own caller. The default
+        implementation decodes the bytes and calls `send_many()`; transports
+        that write bytes should override it.
+        """
+        decode = self.codec.decode
+        await self.send_many([decode(data) for data in messages])
+
     @abstractmethod
     async def recv(self) -> dict[str, Any]:
         """Receive one JSON message as a dictionary."""
         raise NotImplementedError
 
+    async def recv_many(self) -> list[dict[str, Any]]:
+        """Receive at least one message plus any others already buffered.
+
+        The default implementation returns a single `recv()` result.
+        Transports that buffer incoming data should override it to return
+        every complete message they hold without waiting for more.
+        """
+        return [await self.recv()]
+
+    async def recv_raw_many(self) -> list[bytes]:
+        """Like `recv_many()`, but return each message as undecoded JSON bytes.
+
+        The default implementation re-encodes `recv_many()` results with
+        `codec`; transports that read bytes should override it and set
+        `supports_raw_messages`.
+        """
+        encode = self.codec.encode
+        return [encode(payload) for payload in await self.recv_many()]
+
     @abstractmethod
     async def close(self) -> None:
         """Close transport resources."""
         raise NotImplementedError
 
 
+# Upper bound on messages returned by one `recv_many()` call, so the receiver
+# yields to other tasks periodically during very long bursts.
+_MAX_RECV_BATCH = 1024
+
+
+class _LineBuffer:
+    """Growable byte buffer that splits newline-delimited frames.
+
+    Incoming chunks are appended in place and the newline search resumes where
+    the previous search stopped, so a multi-megabyte line costs one scan over
+    its bytes regardless of how many chunks it arrives in.
+    """
+
+    __slots__ = ("_buffer", "_max_line_bytes", "_scan_from")
+
+    def __init__(self, *, max_line_bytes: int | None = None) -> None:
+        self._buffer = bytearray()
+        self._scan_from = 0
+        self._max_line_bytes = max_line_bytes
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, chunk: bytes) -> None:
+        """Append one chunk read from the stream."""
+        self._buffer += chunk
+
+    def next_line(self) -> bytes | None:
+        """Pop the next complete line without its newline, if one is buffered.
+
+        Raises:
+            CodexTransportError: If a line exceeds `max_line_bytes`.
+        """
+        end = self._buffer.find(b"\n", self._scan_from)
+        if end < 0:
+            self._scan_from = len(self._buffer)
+            if self._max_line_bytes is not None and self._scan_from > self._max_line_bytes:
+                raise CodexTransportError(
+                    f"stdio line exceeds max_line_bytes={self._max_line_bytes}"
+                )
+            return None
+        if self._max_line_bytes is not None and end > self._max_line_bytes:
+            raise CodexTransportError(f"stdio line exceeds max_line_bytes={self._max_line_bytes}")
+        with memoryview(self._buffer) as view:
+            line = bytes(view[:end])
+        del self._buffer[: end + 1]
+        self._scan_from = 0
+        return line
+
+    def take_rest(self) -> bytes:
+        """Pop whatever is buffered, used for a final line without newline at EOF."""
+        rest = bytes(self._buffer)
+        self._buffer.clear()
+        self._scan_from = 0
+        return rest
+
+
 class StdioTransport(Transport):
     """JSON-RPC transport over a subprocess stdin/stdout pipe."""
 
+    supports_raw_messages = True
+
     def __init__(
         self,
         command: Sequence[str],
@@ -45,6 +159,9 @@ class StdioTransport(Transport):
         cwd: str | None = None,
         env: Mapping[str, str] | None = None,
         connect_timeout: float = 30.0,
+        codec: JsonCodec | None = None,
+        max_line_bytes: int | None = None,
+        read_chunk_size: int = 256 * 1024,
     ) -> None:
         """Configure stdio transport.
 
@@ -53,19 +170,35 @@ class StdioTransport(Transport):
             cwd: Optional subprocess working directory.
             env: Optional environment overrides for subprocess.
             connect_timeout: Timeout for subprocess creation.
+            codec: Optional JSON codec. Defaults to `default_codec()`.
+            max_line_bytes: Optional upper bound for one JSON line. `None`
+                (default) accepts lines of any size.
+            read_chunk_size: Number of bytes requested from stdout per read.
         """
         if not command:
             raise ValueError("stdio command must not be empty")
+        if read_chunk_size <= 0:
+            raise ValueError("read_chunk_size must be positive")
         self._command = list(command)
         self._cwd = cwd
         self._env = dict(env) if env is not None else None
         self._connect_timeout = connect_timeout
+        self.codec = codec if codec is not None else default_codec()
+        self._max_line_bytes = max_line_bytes
+        self._read_chunk_size = read_chunk_size
+        self._lines = _LineBuffer(max_line_bytes=max_line_bytes)
         self._proc: asyncio.subprocess.Process | None = None
 
+    @property
+    def is_alive(self) -> bool:
+        """Whether the subprocess was started and has not exited."""
+        return self._proc is not None and self._proc.returncode is None
+
     async def connect(self) -> None:
         """Start subprocess if not already running."""
         if self._proc is not None:
             return
+        self._lines = _LineBuffer(max_line_bytes=self._max_line_bytes)
         try:
             self._proc = await asyncio.wait_for(
                 asyncio.create_subprocess_exec(
@@ -75,6 +208,7 @@ class StdioTransport(Transport):
                     stderr=asyncio.subprocess.DEVNULL,
                     cwd=self._cwd,
                     env=self._env,
+                    limit=self._read_chunk_size,
                 ),
                 timeout=self._connect_timeout,
             )
@@ -94,9 +228,39 @@ class StdioTransport(Transport):
         """
         if self._proc is None or self._proc.stdin is None:
             raise CodexTransportError("stdio transport is not connected")
-        line = json.dumps(dict(payload), separators=(",", ":")) + "\n"
+        line = self.codec.encode(payload) + b"\n"
+        try:
+            self._proc.stdin.write(line)
+            await self._proc.stdin.drain()
+        except Exception as exc:
+            raise CodexTransportError("failed writing to stdio transport") from exc
+
+    async def send_many(self, payloads: Sequence[Mapping[str, Any]]) -> None:
+        """Write several JSON lines with one `write()` and one `drain()`.
+
+        Args:
+            payloads: JSON-serializable payloads, written in order.
+
+        Raises:
+            CodexTransportError: If transport is disconnected or write fails.
+        """
+        encode = self.codec.encode
+        await self.send_raw_many([encode(payload) for payload in payloads])
+
+    async def send_raw_many(self, messages: Sequence[bytes]) -> None:
+        """Write several encoded messages as JSON lines with one `write()`.
+
+        Args:
+            messages: Encoded payloads without trailing newlines, in order.
+
+        Raises:
+            CodexTransportError: If transport is disconnected or write fails.
+        """
+        if self._proc is None or self._proc.stdin is None:
+            raise CodexTransportError("stdio transport is not connected")
+        data = b"".join([message + b"\n" for message in messages])
         try:
-            self._proc.stdin.write(line.encode("utf-8"))
+            self._proc.stdin.write(data)
             await self._proc.stdin.drain()
         except Exception as exc:
             raise CodexTransportError("failed writing to stdio transport") from exc
@@ -104,26 +268,76 @@ class StdioTransport(Transport):
     async def recv(self) -> dict[str, Any]:
         """Read one JSON line from subprocess stdout.
 
+        Lines are framed by the transport itself rather than
+        `StreamReader.readline()`, so they are not limited by the stream
+        buffer size.
+
         Returns:
             Parsed JSON payload.
 
         Raises:
-            CodexTransportError: If transport is disconnected, closed, or emits
-                invalid JSON.
+            CodexTransportError: If transport is disconnected, closed, emits
+                invalid JSON, or exceeds `max_line_bytes`.
         """
-        if self._proc is None or self._proc.stdout is None:
-            raise CodexTransportError("stdio transport is not connected")
+        line = await self._read_line()
         try:
-            line = await self._proc.stdout.readline()
-        except Exception as exc:
-            raise CodexTransportError("failed reading from stdio transport") from exc
-        if not line:
-            raise CodexTransportError("stdio transport closed")
+            return self.codec.decode(line)
+        except ValueError as exc:
+            raise CodexTransportError("received invalid JSON from stdio transport") from exc
+
+    async def recv_many(self) -> list[dict[str, Any]]:
+        """Read one JSON line, waiting if needed, plus every complete line buffered.
+
+        Returns:
+            Parsed JSON payloads in arrival order.
+
+        Raises:
+            CodexTransportError: If transport is disconnected, closed, emits
+                invalid JSON, or exceeds `max_line_bytes`.
+        """
+        decode = self.codec.decode
+        lines = await self.recv_raw_many()
         try:
-            return json.loads(line.decode("utf-8"))
-        except json.JSONDecodeError as exc:
+            return [decode(line) for line in lines]
+        except ValueError as exc:
             raise CodexTransportError("received invalid JSON from stdio transport") from exc
 
+    async def recv_raw_many(self) -> list[bytes]:
+        """Return complete lines as bytes without decoding them.
+
+        Raises:
+            CodexTransportError: If transport is disconnected, closed, or a
+                line exceeds `max_line_bytes`.
+        """
+        lines = [await self._read_line()]
+        buffered = self._lines
+        while len(lines) < _MAX_RECV_BATCH:
+            line = buffered.next_line()
+            if line is None:
+                break
+            lines.append(line)
+        return lines
+
+    async def _read_line(self) -> bytes:
+        if self._proc is None or self._proc.stdout is None:
+            raise CodexTransportError("stdio transport is not connected")
+        stdout = self._proc.stdout
+        lines = self._lines
+        while True:
+            line = lines.next_line()
+            if line is not None:
+                return line
+            try:
+                chunk = await stdout.read(self._read_chunk_size)
+            except Exception as exc:
+                raise CodexTransportError("failed reading from stdio transport") from exc
+            if not chunk:
+                rest = lines.take_rest()
+                if rest.strip():
+                    return rest
+                raise CodexTransportError("stdio transport closed")
+            lines.feed(chunk)
+
     async def close(self) -> None:
         """Terminate subprocess and release handles."""
         if self._proc is None:
@@ -138,21 +352,39 @@ class StdioTransport(Transport):
         if proc.returncode is None:
             proc.terminate()
             try:
-                await asyncio.wait_for(proc.wait(), timeout=2.0)
+                await asyncio.wait_for(proc.wait(), timeout=_CLOSE_TIMEOUT)
             except asyncio.TimeoutError:
                 proc.kill()
                 await proc.wait()
 
+        # Discard whatever the exited process left in the pipe so the
+        # subprocess transport sees EOF and closes before the loop does.
+        # A leftover child can keep the pipe open, so the drain is bounded.
+        if proc.stdout is not None:
+            try:
+                await asyncio.wait_for(self._drain(proc.stdout), timeout=_CLOSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+
+    async def _drain(self, stdout: asyncio.StreamReader) -> None:
+        while await stdout.read(self._read_chunk_size):
+            pass
+
 
 class WebSocketTransport(Transport):
     """JSON-RPC transport over a websocket connection."""
 
+    supports_raw_messages = True
+
     def __init__(
         self,
         url: str,
         *,
         headers: Mapping[str, str] | None = None,
         connect_timeout: float = 30.0,
+        codec: JsonCodec | None = None,
     ) -> None:
         """Configure websocket transport.
 
@@ -160,10 +392,12 @@ class WebSocketTransport(Transport):
             url: Websocket endpoint URL.
             headers: Optional request headers, including auth.
             connect_timeout: Timeout for websocket handshake.
+            codec: Optional JSON codec. Defaults to `default_codec()`.
         """
         self._url = url
         self._headers = dict(headers) if headers is not None else None
         self._connect_timeout = connect_timeout
+        self.codec = codec if codec is not None else default_codec()
         self._socket: Any = None
 
     async def connect(self) -> None:
@@ -197,7 +431,21 @@ class WebSocketTransport(Transport):
         if self._socket is None:
             raise CodexTransportError("websocket transport is not connected")
         try:
-            await self._socket.send(json.dumps(dict(payload), separators=(",", ":")))
+            await self._socket.send(self.codec.encode(payload), text=True)
+        except Exception as exc:
+            raise CodexTransportError("failed writing to websocket transport") from exc
+
+    async def send_raw_many(self, messages: Sequence[bytes]) -> None:
+        """Send each encoded message as one JSON text frame, in order.
+
+        Raises:
+            CodexTransportError: If transport is disconnected or write fails.
+        """
+        if self._socket is None:
+            raise CodexTransportError("websocket transport is not connected")
+        try:
+            for message in messages:
+                await self._socket.send(message, text=True)
         except Exception as exc:
             raise CodexTransportError("failed writing to websocket transport") from exc
 
@@ -211,22 +459,58 @@ class WebSocketTransport(Transport):
             CodexTransportError: If transport is disconnected, read fails, or
                 frame payload is invalid JSON.
         """
+        message = await self._recv_frame()
+        try:
+            return self.codec.decode(message)
+        except ValueError as exc:
+            raise CodexTransportError("received invalid JSON from websocket transport") from exc
+
+    async def recv_many(self) -> list[dict[str, Any]]:
+        """Receive one frame, waiting if needed, plus every frame already queued.
+
+        Returns:
+            Parsed JSON payloads in arrival order.
+
+        Raises:
+            CodexTransportError: If transport is disconnected, the first read
+                fails, or a frame payload is invalid JSON.
+        """
+        decode = self.codec.decode
+        frames = await self.recv_raw_many()
+        try:
+            return [decode(frame) for frame in frames]
+        except ValueError as exc:
+            raise CodexTransportError("received invalid JSON from websocket transport") from exc
+
+    async def recv_raw_many(self) -> list[bytes]:
+        """Return queued frames as bytes without decoding them.
+
+        Raises:
+            CodexTransportError: If transport is disconnected or the first read
+                fails.
+        """
+        frames = [await self._recv_frame()]
+        socket = self._socket
+        while socket is not None and len(frames) < _MAX_RECV_BATCH:
+            # A zero timeout only fires if `recv()` has to wait, i.e. when no
+            # complete frame is queued; cancelling `recv()` is safe. Connection
+            # errors are left for the next call so frames already read here
+            # are still delivered.
+            try:
+                async with asyncio.timeout(0):
+                    frames.append(await socket.recv(decode=False))
+            except Exception:
+                break
+        return frames
+
+    async def _recv_frame(self) -> bytes:
         if self._socket is None:
             raise CodexTransportError("websocket transport is not connected")
         try:
-            message = await self._socket.recv()
+            return await self._socket.recv(decode=False)
         except Exception as exc:
             raise CodexTransportError("failed reading from websocket transport") from exc
 
-        if isinstance(message, (bytes, bytearray)):
-            text = message.decode("utf-8")
-        else:
-            text = str(message)
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError as exc:
-            raise CodexTransportError("received invalid JSON from websocket transport") from exc
-
     async def close(self) -> None:
         """Close websocket connection."""
         if self._socket is None:
@@ -237,3 +521,11 @@ class WebSocketTransport(Transport):
             await socket.close()
         except Exception:
             pass
+
+
+def _default_stdio_command() -> list[str]:
+    """Return default app-server command for stdio mode."""
+    from_env = os.getenv("CODEX_APP_SERVER_CMD")
+    if from_env:
+        return shlex.split(from_env)
+    return ["codex", "app-server"]
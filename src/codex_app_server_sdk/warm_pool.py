@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Mapping, Sequence
+from typing import Any, NamedTuple
+
+from ._params import _parse_initialize_result, _prepare_initialize_params
+from .codec import JsonCodec
+from .errors import CodexProtocolError, CodexTimeoutError
+from .models import InitializeResult
+from .protocol import (
+    INITIALIZE_METHOD,
+    extract_error,
+    is_response_message,
+    make_request,
+)
+from .transport import StdioTransport, _default_stdio_command
+
+# Request id used for the pool's own initialize handshake. Client request ids
+# start at 1, so the response can never be confused with a client request.
+_WARM_INITIALIZE_ID = 0
+
+
+class WarmLease(NamedTuple):
+    """One leased process from a `StdioWarmPool`.
+
+    Attributes:
+        transport: Connected transport whose process completed `initialize`.
+        initialize_result: Parsed result of that handshake.
+    """
+
+    transport: StdioTransport
+    initialize_result: InitializeResult
+
+
+class StdioWarmPool:
+    """Keep spawned and initialized stdio app-server processes ready to lease.
+
+    Each idle process has already completed the `initialize` handshake, so a
+    client built on a leased transport skips both the subprocess spawn and the
+    initialize round trip. Every lease schedules a background refill back to
+    `size` idle processes.
+
+    Lease with `CodexClient.connect_stdio(warm_pool=pool)`.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        command: Sequence[str] | None = None,
+        cwd: str | None = None,
+        env: Mapping[str, str] | None = None,
+        connect_timeout: float = 30.0,
+        codec: JsonCodec | None = None,
+        initialize_params: Mapping[str, Any] | None = None,
+        initialize_timeout: float = 30.0,
+    ) -> None:
+        """Configure the pool.
+
+        Args:
+            size: Number of idle initialized processes to keep ready.
+            command: Optional command argv. Defaults to `CODEX_APP_SERVER_CMD`
+                or `["codex", "app-server"]`.
+            cwd: Optional subprocess working directory.
+            env: Optional subprocess environment overrides.
+            connect_timeout: Subprocess spawn timeout in seconds.
+            codec: Optional JSON codec for every transport.
+            initialize_params: Optional initialize payload, merged with library
+                defaults exactly as `CodexClient.initialize()` does.
+            initialize_timeout: Timeout in seconds for each handshake.
+
+        Raises:
+            ValueError: If `size` is smaller than 1.
+        """
+        if size < 1:
+            raise ValueError("warm pool size must be at least 1")
+        self._size = size
+        self._command = list(command) if command is not None else _default_stdio_command()
+        self._cwd = cwd
+        self._env = dict(env) if env is not None else None
+        self._connect_timeout = connect_timeout
+        self._codec = codec
+        self._initialize_params = _prepare_initialize_params(initialize_params)
+        self._initialize_timeout = initialize_timeout
+        # Idle processes with the result of their initialize handshake.
+        self._idle: deque[WarmLease] = deque()
+        self._spawning: set[asyncio.Task[None]] = set()
+        self._closing: set[asyncio.Task[None]] = set()
+        self._last_error: BaseException | None = None
+        self._started = False
+        self._closed = False
+
+    @property
+    def initialize_params(self) -> dict[str, Any]:
+        """Initialize payload every pooled process was started with."""
+        return self._initialize_params
+
+    @property
+    def ready(self) -> int:
+        """Number of idle initialized processes available right now."""
+        return len(self._idle)
+
+    @property
+    def last_error(self) -> BaseException | None:
+        """Most recent spawn or handshake failure seen by background refills."""
+        return self._last_error
+
+    async def start(self) -> StdioWarmPool:
+        """Spawn and initialize processes until `size` are ready.
+
+        Returns:
+            `self` for fluent usage.
+
+        Raises:
+            CodexTransportError: If a process cannot be spawned.
+            CodexProtocolError: If a handshake fails.
+            CodexTimeoutError: If a handshake times out.
+        """
+        self._started = True
+        self._refill()
+        await self.wait_ready()
+        return self
+
+    async def wait_ready(self) -> None:
+        """Wait for in-flight refills; re-raise the last failure if none succeeded."""
+        while self._spawning:
+            await asyncio.gather(*self._spawning, return_exceptions=True)
+        if not self._idle and self._last_error is not None:
+            raise self._last_error
+
+    async def __aenter__(self) -> StdioWarmPool:
+        """Support `async with StdioWarmPool(...)` usage."""
+        return await self.start()
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        """Close pool on context-manager exit."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Stop refilling and terminate idle processes. Leased ones are unaffected."""
+        if self._closed:
+            return
+        self._closed = True
+        for task in list(self._spawning):
+            task.cancel()
+        if self._spawning:
+            await asyncio.gather(*self._spawning, return_exceptions=True)
+        idle = [transport for transport, _ in self._idle]
+        self._idle.clear()
+        await asyncio.gather(
+            *(transport.close() for transport in idle),
+            *self._closing,
+            return_exceptions=True,
+        )
+
+    def acquire_nowait(self) -> StdioTransport | None:
+        """Lease one initialized transport without waiting.
+
+        Returns:
+            A connected, initialized `StdioTransport`, or `None` when no idle
+            process is ready. Either way a background refill is scheduled.
+        """
+        lease = self.lease_nowait()
+        return lease.transport if lease is not None else None
+
+    def lease_nowait(self) -> WarmLease | None:
+        """Like `acquire_nowait()`, plus the result of the process's handshake.
+
+        Returns:
+            The leased transport and its `InitializeResult`, or `None` when no
+            idle process is ready. Either way a background refill is scheduled.
+        """
+        lease: WarmLease | None = None
+        while self._idle:
+            candidate = self._idle.popleft()
+            if candidate.transport.is_alive:
+                lease = candidate
+                break
+            self._discard(candidate.transport)
+        self._refill()
+        return lease
+
+    def create_transport(self) -> StdioTransport:
+        """Return a new, unconnected transport with this pool's settings."""
+        return StdioTransport(
+            self._command,
+            cwd=self._cwd,
+            env=self._env,
+            connect_timeout=self._connect_timeout,
+            codec=self._codec,
+        )
+
+    def _refill(self) -> None:
+        if not self._started or self._closed:
+            return
+        missing = self._size - len(self._idle) - len(self._spawning)
+        for _ in range(missing):
+            task = asyncio.create_task(self._spawn_one())
+            self._spawning.add(task)
+            task.add_done_callback(self._spawning.discard)
+
+    async def _spawn_one(self) -> None:
+        transport = self.create_transport()
+        try:
+            await transport.connect()
+            result = await asyncio.wait_for(
+                self._handshake(transport),
+                timeout=self._initialize_timeout,
+            )
+        except asyncio.CancelledError:
+            await transport.close()
+            raise
+        except asyncio.TimeoutError:
+            await transport.close()
+            self._last_error = CodexTimeoutError(
+                f"initialize timed out after {self._initialize_timeout:.1f}s"
+            )
+            return
+        except Exception as exc:
+            await transport.close()
+            self._last_error = exc
+            return
+        if self._closed:
+            await transport.close()
+            return
+        self._idle.append(WarmLease(transport, result))
+
+    async def _handshake(self, transport: StdioTransport) -> InitializeResult:
+        await transport.send(
+            make_request(_WARM_INITIALIZE_ID, INITIALIZE_METHOD, self._initialize_params)
+        )
+        while True:
+            message = await transport.recv()
+            if not is_response_message(message) or message.get("id") != _WARM_INITIALIZE_ID:
+                continue
+            error = extract_error(message)
+            if error is not None:
+                code = error.get("code")
+                raise CodexProtocolError(
+                    f"{INITIALIZE_METHOD} failed: {error.get('message', 'JSON-RPC error')}",
+                    code=code if isinstance(code, int) else None,
+                    data=error.get("data"),
+                )
+            return _parse_initialize_result(message.get("result"))
+
+    def _discard(self, transport: StdioTransport) -> None:
+        task = asyncio.create_task(transport.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
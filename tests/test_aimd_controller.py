@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexProtocolError
+from codex_app_server_sdk.models import TurnSample
+from codex_app_server_sdk.scheduling import AimdController, TurnScheduler
+from codex_app_server_sdk.transport import Transport
+
+OVERLOADED = -32001
+
+
+class ScriptedLatencyTransport(Transport):
+    """Fake app-server that slows down past `knee` running turns and rejects past `limit`."""
+
+    def __init__(self, *, knee: int, limit: int, step: float, eager: bool = False) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        # Eager turns finish at once, in the same `recv_many()` batch as their reply.
+        self._eager = eager
+        self._knee = knee
+        self._limit = limit
+        self._step = step
+        self._turns = 0
+        self.running = 0
+        self.peak_running = 0
+        self.rejected = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        method = message.get("method")
+        reply: dict[str, Any] = {"jsonrpc": "2.0", "id": message.get("id"), "result": {}}
+        if method == "thread/start":
+            reply["result"] = {"thread": {"id": "thr_1"}}
+        elif method == "turn/start" and self.running >= self._limit:
+            self.rejected += 1
+            del reply["result"]
+            reply["error"] = {"code": OVERLOADED, "message": "server overloaded"}
+        elif method == "turn/start":
+            self._turns += 1
+            turn_id = f"turn_{self._turns}"
+            self.running += 1
+            self.peak_running = max(self.peak_running, self.running)
+            reply["result"] = {"turn": {"id": turn_id, "status": "inProgress"}}
+            if self._eager:
+                await self._incoming.put(reply)
+                await self._finish(message["params"]["threadId"], turn_id, 0.0)
+                return
+            # Every turn beyond the knee adds `step` seconds of latency.
+            delay = self._step * max(1, self.running - self._knee + 1)
+            task = asyncio.create_task(self._finish(message["params"]["threadId"], turn_id, delay))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        await self._incoming.put(reply)
+
+    async def _finish(self, thread_id: str, turn_id: str, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        self.running -= 1
+        for notification in (
+            {
+                "method": "item/completed",
+                "params": {
+                    "threadId": thread_id,
+                    "turnId": turn_id,
+                    "item": {"id": f"msg_{turn_id}", "type": "agentMessage", "text": "ok"},
+                },
+            },
+            {
+                "method": "turn/completed",
+                "params": {"threadId": thread_id, "turn": {"id": turn_id, "status": "completed"}},
+            },
+        ):
+            await self._incoming.put({"jsonrpc": "2.0", **notification})
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def recv_many(self) -> list[dict[str, Any]]:
+        batch = [await self._incoming.get()]
+        while not self._incoming.empty():
+            batch.append(self._incoming.get_nowait())
+        return batch
+
+    async def close(self) -> None:
+        return None
+
+
+def _sample(admitted_at: float, **kwargs: Any) -> TurnSample:
+    fields: dict[str, Any] = {
+        "admitted_at": admitted_at,
+        "in_flight": 4,
+        "first_event_seconds": 0.01,
+        "duration_seconds": 0.1,
+    }
+    fields.update(kwargs)
+    return TurnSample(**fields)
+
+
+def test_controller_grows_per_window_and_cuts_once_per_burst() -> None:
+    async def _run() -> None:
+        controller = AimdController(max_in_flight=8, first_event_target=0.5)
+        scheduler = TurnScheduler(4, controller=controller)
+        now = asyncio.get_running_loop().time()
+
+        for _ in range(4):
+            controller.observe(scheduler, _sample(now))
+        assert scheduler.max_in_flight == 4
+        controller.observe(scheduler, _sample(now))
+        assert scheduler.max_in_flight == 5
+
+        controller.observe(scheduler, _sample(now, first_event_seconds=1.0))
+        assert scheduler.max_in_flight == 2
+        # Turns admitted before the cut do not cut again.
+        controller.observe(scheduler, _sample(now, error_code=OVERLOADED, failed=True))
+        assert scheduler.max_in_flight == 2
+        # Errors outside the backoff codes only stop growth.
+        later = asyncio.get_running_loop().time() + 1
+        controller.observe(scheduler, _sample(later, error_code=-32602, failed=True))
+        assert scheduler.max_in_flight == 2
+        controller.observe(scheduler, _sample(later, error_code=OVERLOADED, failed=True))
+        assert scheduler.max_in_flight == 1
+
+        stats = controller.stats()
+        assert (stats.limit, stats.decreases, stats.last_decrease_reason) == (1, 2, "error")
+        assert (stats.samples, stats.increases) == (9, 5)
+
+    asyncio.run(_run())
+
+
+async def _simulate(
+    transport: ScriptedLatencyTransport,
+    controller: AimdController,
+    *,
+    callers: int = 16,
+    turns_per_caller: int = 8,
+) -> tuple[list[int], int]:
+    scheduler = TurnScheduler(1, controller=controller)
+    limits: list[int] = []
+    rejected = 0
+    async with CodexClient(transport, request_timeout=1.0) as client:
+        client.set_turn_scheduler(scheduler)
+        thread = await client.start_thread()
+
+        async def _caller() -> None:
+            nonlocal rejected
+            for _ in range(turns_per_caller):
+                try:
+                    await client.chat_once("go", thread_id=thread.thread_id)
+                except CodexProtocolError:
+                    rejected += 1
+                limits.append(scheduler.max_in_flight)
+
+        await asyncio.gather(*(_caller() for _ in range(callers)))
+    return limits, rejected
+
+
+def test_latency_target_holds_the_limit_near_the_knee() -> None:
+    async def _run() -> None:
+        transport = ScriptedLatencyTransport(knee=4, limit=100, step=0.02)
+        controller = AimdController(max_in_flight=32, duration_target=0.05)
+        limits, rejected = await _simulate(transport, controller)
+
+        stats = controller.stats()
+        assert stats.increases > 0 and stats.decreases > 0
+        assert stats.last_decrease_reason == "duration"
+        # Ramped up from 1, then held around the knee instead of the 16 callers.
+        assert max(limits) >= 4
+        assert max(limits[len(limits) // 2 :]) <= 8
+        assert transport.peak_running <= 9
+        assert rejected == 0
+
+    asyncio.run(_run())
+
+
+def test_overload_errors_back_off_without_a_latency_target() -> None:
+    async def _run() -> None:
+        transport = ScriptedLatencyTransport(knee=100, limit=6, step=0.01)
+        controller = AimdController(max_in_flight=32)
+        limits, rejected = await _simulate(transport, controller)
+
+        stats = controller.stats()
+        assert stats.last_decrease_reason == "error"
+        assert rejected == transport.rejected > 0
+        # Each burst of rejections costs one cut, so most turns still succeed.
+        assert rejected < len(limits) // 4
+        assert max(limits[len(limits) // 2 :]) <= 8
+
+    asyncio.run(_run())
+
+
+def test_turns_finished_with_their_start_reply_count_as_successes() -> None:
+    class RecordingController(AimdController):
+        def __init__(self, **kwargs: Any) -> None:
+            super().__init__(**kwargs)
+            self.samples: list[TurnSample] = []
+
+        def observe(self, scheduler: TurnScheduler, sample: TurnSample) -> None:
+            self.samples.append(sample)
+            super().observe(scheduler, sample)
+
+    async def _run() -> None:
+        transport = ScriptedLatencyTransport(knee=100, limit=100, step=0.0, eager=True)
+        controller = RecordingController(max_in_flight=8, first_event_target=0.5)
+        limits, rejected = await _simulate(transport, controller, callers=4)
+
+        assert rejected == 0 and len(controller.samples) == len(limits)
+        assert not any(sample.failed for sample in controller.samples)
+        assert all(sample.first_event_seconds is not None for sample in controller.samples)
+        stats = controller.stats()
+        assert stats.increases > 0 and stats.decreases == 0
+        assert max(limits) > 1
+
+    asyncio.run(_run())
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexProtocolError, CodexTurnInactiveError
+from codex_app_server_sdk.pool import CodexClientPool
+from codex_app_server_sdk.transport import Transport
+
+
+class ScriptedTurnTransport(Transport):
+    """Runs each prompt as a script: `<seconds>`, `reject`, `flaky` or `hang`."""
+
+    def __init__(self, prefix: str = "") -> None:
+        self._prefix = prefix
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.sent: list[dict[str, Any]] = []
+        self.running = 0
+        self.peak_running = 0
+        self._threads = 0
+        self._turns = 0
+        self._turn_threads: dict[str, str] = {}
+        self._flaky_seen = False
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        self.sent.append(message)
+        method = message.get("method")
+        params = message.get("params") or {}
+        reply: dict[str, Any] = {"jsonrpc": "2.0", "id": message.get("id"), "result": {}}
+        if method == "thread/start":
+            self._threads += 1
+            reply["result"] = {"thread": {"id": f"{self._prefix}thr_{self._threads}"}}
+        elif method == "turn/interrupt":
+            await self._incoming.put(reply)
+            await self._completed(self._turn_threads[params["turnId"]], params["turnId"])
+            return
+        elif method == "turn/start":
+            script = params["input"][0]["text"]
+            if script == "reject" or (script == "flaky" and not self._flaky_seen):
+                self._flaky_seen = True
+                del reply["result"]
+                reply["error"] = {"code": -32001, "message": "overloaded"}
+            else:
+                self._turns += 1
+                turn_id = f"{self._prefix}turn_{self._turns}"
+                self._turn_threads[turn_id] = params["threadId"]
+                reply["result"] = {"turn": {"id": turn_id, "status": "inProgress"}}
+                if script != "hang":
+                    delay = 0.0 if script == "flaky" else float(script)
+                    self._spawn(self._finish(params["threadId"], turn_id, delay))
+        await self._incoming.put(reply)
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _finish(self, thread_id: str, turn_id: str, delay: float) -> None:
+        self.running += 1
+        self.peak_running = max(self.peak_running, self.running)
+        await asyncio.sleep(delay)
+        self.running -= 1
+        await self._incoming.put(
+            {
+                "jsonrpc": "2.0",
+                "method": "item/completed",
+                "params": {
+                    "threadId": thread_id,
+                    "turnId": turn_id,
+                    "item": {"id": f"msg_{turn_id}", "type": "agentMessage", "text": turn_id},
+                },
+            }
+        )
+        await self._completed(thread_id, turn_id)
+
+    async def _completed(self, thread_id: str, turn_id: str) -> None:
+        await self._incoming.put(
+            {
+                "jsonrpc": "2.0",
+                "method": "turn/completed",
+                "params": {"threadId": thread_id, "turn": {"id": turn_id, "status": "completed"}},
+            }
+        )
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+    def calls(self, method: str) -> list[dict[str, Any]]:
+        return [message for message in self.sent if message.get("method") == method]
+
+
+def test_results_arrive_in_completion_order_with_bounded_concurrency() -> None:
+    async def _run() -> None:
+        transport = ScriptedTurnTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            prompts = ["0.06", "0.02", "0.04", "0.0", "0.0", "0.0"]
+            items = [item async for item in client.chat_batch(iter(prompts), concurrency=3)]
+
+            assert [item.index for item in items[:3]] == [1, 3, 4]
+            assert sorted(item.index for item in items) == list(range(6))
+            assert all(item.result is not None and item.error is None for item in items)
+            assert transport.peak_running <= 3
+            assert len(transport.calls("thread/start")) == 6
+
+    asyncio.run(_run())
+
+
+def test_failures_retries_and_inactivity_are_reported_per_item() -> None:
+    async def _run() -> None:
+        transport = ScriptedTurnTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            items = {
+                item.prompt: item
+                async for item in client.chat_batch(
+                    ["flaky", "reject", "0.15", "hang", "0.0"],
+                    inactivity_timeout=0.1,
+                    max_continuations=1,
+                    retries=1,
+                )
+            }
+
+            assert items["flaky"].result is not None and items["flaky"].attempts == 2
+            assert isinstance(items["reject"].error, CodexProtocolError)
+            assert items["reject"].attempts == 2
+            slow = items["0.15"]
+            assert slow.result is not None and slow.continuations == 1
+            hung = items["hang"]
+            assert isinstance(hung.error, CodexTurnInactiveError) and hung.continuations == 1
+            assert len(transport.calls("turn/interrupt")) == 1
+            assert items["0.0"].result is not None
+
+    asyncio.run(_run())
+
+
+def test_closing_early_cancels_the_rest_and_bad_arguments_fail_fast() -> None:
+    async def _run() -> None:
+        transport = ScriptedTurnTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            with pytest.raises(ValueError, match="concurrency"):
+                client.chat_batch(["0.0"], concurrency=0)
+
+            batch = client.chat_batch(["0.0", "hang", "hang", "hang"], concurrency=2)
+            first = await anext(batch)
+            assert first.index == 0
+            await batch.aclose()
+            started = len(transport.calls("turn/start"))
+            await asyncio.sleep(0.05)
+            # The fourth prompt is never sent once the batch is closed.
+            assert len(transport.calls("turn/start")) == started <= 3
+
+    asyncio.run(_run())
+
+
+def test_pool_batch_spreads_prompts_over_members() -> None:
+    async def _run() -> None:
+        transports = [ScriptedTurnTransport(), ScriptedTurnTransport()]
+        clients = [CodexClient(transport, request_timeout=1.0) for transport in transports]
+        async with CodexClientPool(clients) as pool:
+            items = [item async for item in pool.chat_batch(["0.02"] * 6, concurrency=4)]
+
+        assert all(item.result is not None for item in items)
+        assert all(len(transport.calls("turn/start")) >= 2 for transport in transports)
+
+    asyncio.run(_run())
+
+
+def test_pool_batch_continues_and_cancels_on_the_owning_member() -> None:
+    async def _run() -> None:
+        transports = [ScriptedTurnTransport("a_"), ScriptedTurnTransport("b_")]
+        clients = [CodexClient(transport, request_timeout=1.0) for transport in transports]
+        async with CodexClientPool(clients) as pool:
+            items = [
+                item
+                async for item in pool.chat_batch(
+                    ["0.15", "hang", "0.15", "hang"],
+                    inactivity_timeout=0.1,
+                    max_continuations=1,
+                )
+            ]
+
+        for item in items:
+            assert item.continuations == 1
+            if item.prompt == "hang":
+                assert isinstance(item.error, CodexTurnInactiveError)
+            else:
+                assert item.error is None and item.result is not None
+        interrupted = [
+            (transport._prefix, call["params"]["turnId"])
+            for transport in transports
+            for call in transport.calls("turn/interrupt")
+        ]
+        assert len(interrupted) == 2
+        assert all(turn_id.startswith(prefix) for prefix, turn_id in interrupted)
+
+    asyncio.run(_run())
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexProtocolError, CodexTurnInactiveError
+from codex_app_server_sdk.transport import Transport
+
+
+def _step(number: int) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "item/completed",
+        "params": {
+            "threadId": "thr_1",
+            "turnId": "turn_1",
+            "item": {"id": f"cmd-{number}", "type": "commandExecution", "command": "true"},
+        },
+    }
+
+
+def _turn_end(method: str = "turn/completed") -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": {
+            "threadId": "thr_1",
+            "turn": {"id": "turn_1", "status": "completed"},
+            "error": {"message": "boom"},
+        },
+    }
+
+
+class StepTransport(Transport):
+    """Answers `turn/start` and then sends whatever the test pushes."""
+
+    def __init__(self) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        method = message.get("method")
+        result: dict[str, Any] = {}
+        if method == "thread/start":
+            result = {"thread": {"id": "thr_1"}}
+        elif method == "turn/start":
+            result = {"turn": {"id": "turn_1", "status": "inProgress"}}
+        if "id" in message:
+            await self._incoming.put({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    async def push(self, *messages: dict[str, Any]) -> None:
+        for message in messages:
+            await self._incoming.put(message)
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+def _ids(batches: list[list[Any]]) -> list[list[str]]:
+    return [[step.item_id for step in batch] for batch in batches]
+
+
+def test_buffered_steps_are_yielded_together_up_to_max_batch() -> None:
+    async def _run() -> None:
+        transport = StepTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            with pytest.raises(ValueError, match="max_batch"):
+                await anext(client.chat_batches("go", max_batch=0))
+
+            stream = client.chat_batches("go", max_batch=3)
+            first = asyncio.create_task(anext(stream))
+            await asyncio.sleep(0.01)
+            await transport.push(*(_step(number) for number in range(5)), _turn_end())
+            batches = [await first] + [batch async for batch in stream]
+            assert _ids(batches) == [["cmd-0", "cmd-1", "cmd-2"], ["cmd-3", "cmd-4"]]
+            assert client._turn_sessions == {}
+
+    asyncio.run(_run())
+
+
+def test_max_delay_waits_for_stragglers_and_failures_flush_first() -> None:
+    async def _run() -> None:
+        for max_delay, expected in ((0.0, [["cmd-0"], ["cmd-1"]]), (0.2, [["cmd-0", "cmd-1"]])):
+            transport = StepTransport()
+            async with CodexClient(transport, request_timeout=1.0) as client:
+                stream = client.chat_batches("go", max_delay=max_delay)
+                first = asyncio.create_task(anext(stream))
+                await transport.push(_step(0))
+                await asyncio.sleep(0.05)
+                await transport.push(_step(1))
+                await asyncio.sleep(0.01)
+                await transport.push(_turn_end("turn/failed"))
+                batches = [await first]
+                with pytest.raises(CodexProtocolError, match="boom"):
+                    async for batch in stream:
+                        batches.append(batch)
+                assert _ids(batches) == expected
+
+    asyncio.run(_run())
+
+
+def test_continuations_resume_across_chat_and_chat_batches() -> None:
+    async def _run() -> None:
+        transport = StepTransport()
+        async with CodexClient(transport, request_timeout=1.0, inactivity_timeout=0.05) as client:
+            batches: list[list[Any]] = []
+            await transport.push(_step(0), _step(1))
+            with pytest.raises(CodexTurnInactiveError) as exc_info:
+                async for batch in client.chat_batches("go"):
+                    batches.append(batch)
+            assert _ids(batches) == [["cmd-0", "cmd-1"]]
+
+            await transport.push(_step(2))
+            continuation = exc_info.value.continuation
+            with pytest.raises(CodexTurnInactiveError) as exc_info:
+                async for step in client.chat(continuation=continuation):
+                    batches.append([step])
+
+            await transport.push(_step(3), _step(4), _turn_end())
+            async for batch in client.chat_batches(continuation=exc_info.value.continuation):
+                batches.append(batch)
+            assert _ids(batches) == [["cmd-0", "cmd-1"], ["cmd-2"], ["cmd-3", "cmd-4"]]
+
+    asyncio.run(_run())
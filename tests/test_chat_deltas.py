@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexTurnInactiveError
+from codex_app_server_sdk.models import AgentMessageDelta, ConversationStep
+from codex_app_server_sdk.transport import Transport
+
+
+def _delta(text: str, item_id: str = "msg-1") -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "item/agentMessage/delta",
+        "params": {"threadId": "thr_1", "turnId": "turn_1", "itemId": item_id, "delta": text},
+    }
+
+
+def _completed_item(item: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "item/completed",
+        "params": {"threadId": "thr_1", "turnId": "turn_1", "item": item},
+    }
+
+
+TURN_COMPLETED = {
+    "jsonrpc": "2.0",
+    "method": "turn/completed",
+    "params": {"threadId": "thr_1", "turn": {"id": "turn_1", "status": "completed"}},
+}
+
+
+class DeltaTransport(Transport):
+    """Answers `turn/start` and then sends whatever the test pushes."""
+
+    def __init__(self) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        method = message.get("method")
+        result: dict[str, Any] = {}
+        if method == "thread/start":
+            result = {"thread": {"id": "thr_1"}}
+        elif method == "turn/start":
+            result = {"turn": {"id": "turn_1", "status": "inProgress"}}
+        if "id" in message:
+            await self._incoming.put({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    async def push(self, *messages: dict[str, Any]) -> None:
+        for message in messages:
+            await self._incoming.put(message)
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+def test_deltas_arrive_before_the_message_completes() -> None:
+    async def _run() -> None:
+        transport = DeltaTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            stream = client.chat_deltas("hi")
+            await transport.push(_delta("Hel"), _delta("lo"))
+
+            first = await anext(stream)
+            second = await anext(stream)
+            assert first == AgentMessageDelta(
+                thread_id="thr_1", turn_id="turn_1", item_id="msg-1", delta="Hel"
+            )
+            assert second.delta == "lo"
+
+            await transport.push(
+                _completed_item({"id": "cmd-1", "type": "commandExecution", "command": "ls"}),
+                _completed_item({"id": "msg-1", "type": "agentMessage", "text": "Hello"}),
+                TURN_COMPLETED,
+            )
+            rest = [event async for event in stream]
+            assert all(isinstance(event, ConversationStep) for event in rest)
+            assert [(step.item_type, step.text) for step in rest][-1] == ("agentMessage", "Hello")
+            assert rest[0].item_type == "commandExecution"
+
+    asyncio.run(_run())
+
+
+def test_chat_skips_deltas_and_empty_completed_text_uses_buffer() -> None:
+    async def _run() -> None:
+        transport = DeltaTransport()
+        script = (
+            _delta("Par"),
+            _delta("tial"),
+            _completed_item({"id": "msg-1", "type": "agentMessage", "text": ""}),
+            TURN_COMPLETED,
+        )
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            await transport.push(*script)
+            events = [event async for event in client.chat_deltas("one")]
+            assert [type(event).__name__ for event in events] == [
+                "AgentMessageDelta",
+                "AgentMessageDelta",
+                "ConversationStep",
+            ]
+            assert events[-1].text == "Partial"
+
+        transport = DeltaTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            await transport.push(*script)
+            steps = [step async for step in client.chat("two")]
+            assert len(steps) == 1 and isinstance(steps[0], ConversationStep)
+
+    asyncio.run(_run())
+
+
+def test_delta_stream_resumes_from_continuation_without_duplicates() -> None:
+    async def _run() -> None:
+        transport = DeltaTransport()
+        async with CodexClient(transport, request_timeout=1.0, inactivity_timeout=0.05) as client:
+            seen: list[str] = []
+            await transport.push(_delta("a"))
+            with pytest.raises(CodexTurnInactiveError) as exc_info:
+                async for event in client.chat_deltas("hi"):
+                    seen.append(event.delta if isinstance(event, AgentMessageDelta) else "step")
+
+            await transport.push(
+                _delta("b"),
+                _completed_item({"id": "msg-1", "type": "agentMessage", "text": "ab"}),
+                TURN_COMPLETED,
+            )
+            async for event in client.chat_deltas(continuation=exc_info.value.continuation):
+                seen.append(event.delta if isinstance(event, AgentMessageDelta) else "step")
+            assert seen == ["a", "b", "step"]
+
+    asyncio.run(_run())
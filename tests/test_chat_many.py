@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexProtocolError, CodexTurnInactiveError
+from codex_app_server_sdk.models import ChatRequest, ConversationStep, TurnEnded
+from codex_app_server_sdk.transport import Transport
+
+
+def _message(turn_id: str, text: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "item/completed",
+        "params": {
+            "threadId": f"thr_{turn_id}",
+            "turnId": turn_id,
+            "item": {"id": f"msg_{turn_id}_{text}", "type": "agentMessage", "text": text},
+        },
+    }
+
+
+def _turn_end(turn_id: str, method: str = "turn/completed") -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": {
+            "threadId": f"thr_{turn_id}",
+            "turn": {"id": turn_id, "status": "completed"},
+            "error": {"message": f"{turn_id} broke"},
+        },
+    }
+
+
+class ManyTurnsTransport(Transport):
+    """Names each turn after its prompt and rejects the prompt `reject`."""
+
+    def __init__(self) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.started: list[str] = []
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        method = message.get("method")
+        params = message.get("params") or {}
+        reply: dict[str, Any] = {"jsonrpc": "2.0", "id": message.get("id"), "result": {}}
+        if method == "thread/start":
+            reply["result"] = {"thread": {"id": f"thr_pending_{len(self.started)}"}}
+        elif method == "turn/start":
+            text = params["input"][0]["text"]
+            if text == "reject":
+                del reply["result"]
+                reply["error"] = {"code": -32602, "message": "bad prompt"}
+            else:
+                self.started.append(text)
+                reply["result"] = {"turn": {"id": text, "status": "inProgress"}}
+        if "id" in message:
+            await self._incoming.put(reply)
+
+    async def push(self, *messages: dict[str, Any]) -> None:
+        for message in messages:
+            await self._incoming.put(message)
+
+    async def wait_started(self, count: int) -> None:
+        for _ in range(100):
+            if len(self.started) >= count:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"expected {count} turns, saw {self.started}")
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+def _label(event: ConversationStep | TurnEnded) -> str:
+    if isinstance(event, ConversationStep):
+        return event.text
+    if event.error is not None:
+        return f"error:{type(event.error).__name__}"
+    return f"done:{event.final_text}"
+
+
+def test_steps_from_many_turns_arrive_through_one_iterator() -> None:
+    async def _run() -> None:
+        transport = ManyTurnsTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            stream = client.chat_many(
+                {
+                    "a": "turn_a",
+                    "b": ChatRequest("turn_b", thread_id="thr_b"),
+                    "c": "turn_c",
+                    "bad": "reject",
+                }
+            )
+            first = await anext(stream)
+            assert first[0] == "bad"
+            assert isinstance(first[1], TurnEnded) and first[1].turn_id is None
+            assert isinstance(first[1].error, CodexProtocolError)
+
+            await transport.wait_started(3)
+            await transport.push(
+                _message("turn_b", "b1"),
+                _message("turn_a", "a1"),
+                _message("turn_b", "b2"),
+                _turn_end("turn_b"),
+                _turn_end("turn_c", method="turn/failed"),
+                _message("turn_a", "a2"),
+                _turn_end("turn_a"),
+            )
+            events = [(key, _label(event)) async for key, event in stream]
+            assert events == [
+                ("b", "b1"),
+                ("a", "a1"),
+                ("b", "b2"),
+                ("b", "done:b2"),
+                ("c", "error:CodexProtocolError"),
+                ("a", "a2"),
+                ("a", "done:a2"),
+            ]
+            assert client._turn_sessions == {}
+
+    asyncio.run(_run())
+
+
+def test_inactive_turn_ends_alone_and_resumes_through_chat() -> None:
+    async def _run() -> None:
+        transport = ManyTurnsTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            stream = client.chat_many({"quiet": "turn_q", "busy": "turn_b"}, inactivity_timeout=0.1)
+            # Turns start once iteration begins.
+            first = asyncio.create_task(anext(stream))
+            await transport.wait_started(2)
+            await transport.push(_message("turn_b", "b1"))
+            key, event = await first
+            assert (key, _label(event)) == ("busy", "b1")
+            await asyncio.sleep(0.05)
+            await transport.push(_message("turn_b", "b2"))
+            await anext(stream)
+
+            key, marker = await anext(stream)
+            assert key == "quiet" and isinstance(marker, TurnEnded)
+            assert isinstance(marker.error, CodexTurnInactiveError)
+            assert marker.turn_id == "turn_q"
+
+            await transport.push(_message("turn_q", "late"), _turn_end("turn_q"))
+            resumed = [
+                step.text async for step in client.chat(continuation=marker.error.continuation)
+            ]
+            assert resumed == ["late"]
+
+            # The busy turn kept streaming and times out on its own clock.
+            key, marker = await anext(stream)
+            assert key == "busy" and isinstance(marker.error, CodexTurnInactiveError)
+            await stream.aclose()
+
+    asyncio.run(_run())
+
+
+def test_closing_early_stops_tracking_unfinished_turns() -> None:
+    async def _run() -> None:
+        transport = ManyTurnsTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            stream = client.chat_many({index: f"turn_{index}" for index in range(3)})
+            first = asyncio.create_task(anext(stream))
+            await transport.wait_started(3)
+            await transport.push(_message("turn_1", "hi"))
+            key, event = await first
+            assert (key, _label(event)) == (1, "hi")
+            assert len(client._turn_sessions) == 3
+
+            await stream.aclose()
+            assert client._turn_sessions == {}
+
+    asyncio.run(_run())
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk import CodexClientPool
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexTurnInactiveError
+from codex_app_server_sdk.transport import Transport
+
+
+class MemberTransport(Transport):
+    """Fake app-server: threads are prefixed with the member name, turns finish at once."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.methods: list[str] = []
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.silent = False
+        self._threads = 0
+        self._turns = 0
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        method = message.get("method")
+        request_id = message.get("id")
+        if method is None:
+            return
+        self.methods.append(str(method))
+        result: dict[str, Any] = {}
+        if method == "thread/start":
+            self._threads += 1
+            result = {"thread": {"id": f"{self.name}-thread-{self._threads}"}}
+        elif method == "turn/start":
+            self._turns += 1
+            result = {"turn": {"id": f"{self.name}-turn-{self._turns}"}}
+        self._incoming.put_nowait({"jsonrpc": "2.0", "id": request_id, "result": result})
+        if method == "turn/start" and not self.silent:
+            thread_id = message["params"]["threadId"]
+            turn_id = result["turn"]["id"]
+            self._incoming.put_nowait(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "item/completed",
+                    "params": {
+                        "threadId": thread_id,
+                        "turnId": turn_id,
+                        "item": {"id": f"msg-{turn_id}", "type": "agentMessage", "text": self.name},
+                    },
+                }
+            )
+            self._incoming.put_nowait(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "turn/completed",
+                    "params": {"threadId": thread_id, "turn": {"id": turn_id}},
+                }
+            )
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+def _pool(size: int, **kwargs: Any) -> tuple[CodexClientPool, list[MemberTransport]]:
+    transports = [MemberTransport(f"m{idx}") for idx in range(size)]
+    clients = [CodexClient(transport, request_timeout=1.0) for transport in transports]
+    return CodexClientPool(clients, **kwargs), transports
+
+
+def test_pool_spreads_new_threads_and_pins_follow_up_turns() -> None:
+    async def _run() -> None:
+        pool, transports = _pool(2)
+        async with pool:
+            first, second = await asyncio.gather(pool.start_thread(), pool.start_thread())
+            assert {first.thread_id, second.thread_id} == {"m0-thread-1", "m1-thread-1"}
+
+            result = await pool.chat_once("hello", thread_id="m1-thread-1")
+            assert result.final_text == "m1"
+            assert pool.client_for_thread("m1-thread-1") is pool.members[1]
+            assert "turn/start" not in transports[0].methods
+
+            fresh = await pool.chat_once("new thread")
+            assert pool.client_for_thread(fresh.thread_id) is not None
+
+    asyncio.run(_run())
+
+
+def test_pool_streams_on_the_owning_member() -> None:
+    async def _run() -> None:
+        pool, transports = _pool(3)
+        async with pool:
+            handle = await pool.start_thread()
+            owner = pool.client_for_thread(handle.thread_id)
+            steps = [step async for step in pool.chat("stream", thread_id=handle.thread_id)]
+            assert [step.text for step in steps] == [handle.thread_id.split("-")[0]]
+            busy = [transport for transport in transports if "turn/start" in transport.methods]
+            assert len(busy) == 1
+            assert owner is not None and owner._transport is busy[0]
+
+    asyncio.run(_run())
+
+
+def test_pool_routes_continuation_and_cancel_after_inactivity_timeout() -> None:
+    async def _run() -> None:
+        pool, transports = _pool(2)
+        for transport in transports:
+            transport.silent = True
+        async with pool:
+            with pytest.raises(CodexTurnInactiveError) as first:
+                await pool.chat_once("slow", inactivity_timeout=0.05)
+            continuation = first.value.continuation
+            owner = pool.client_for_thread(continuation.thread_id)
+            assert owner is not None and owner.active_turns == 1
+
+            with pytest.raises(CodexTurnInactiveError) as second:
+                await pool.chat_once(continuation=continuation, inactivity_timeout=0.05)
+            assert second.value.continuation.turn_id == continuation.turn_id
+
+            cancelled = await pool.cancel(second.value.continuation, timeout=0.05)
+            assert cancelled.turn_id == continuation.turn_id and cancelled.was_interrupted
+            assert [transport.methods.count("turn/interrupt") for transport in transports] == [
+                int(owner._transport is transport) for transport in transports
+            ]
+            assert owner.active_turns == 0
+
+    asyncio.run(_run())
+
+
+def test_pool_forgets_least_recently_used_pins_beyond_the_cap() -> None:
+    async def _run() -> None:
+        pool, _ = _pool(2, max_pinned_threads=4)
+        async with pool:
+            results = [item async for item in pool.chat_batch([f"p{idx}" for idx in range(10)])]
+            assert all(item.result is not None for item in results)
+            assert len(pool._thread_owner) == 4
+            assert sum(pool._thread_counts) == 4
+
+            # A thread used again stays pinned while newer ones push others out.
+            kept = next(iter(pool._thread_owner))
+            await pool.chat_once("again", thread_id=kept)
+            for _ in range(3):
+                await pool.chat_once("fresh")
+            assert pool.client_for_thread(kept) is not None
+            assert len(pool._thread_owner) == 4
+
+    asyncio.run(_run())
+
+
+def test_pool_requires_members() -> None:
+    with pytest.raises(ValueError):
+        CodexClientPool([])
+    with pytest.raises(ValueError):
+        CodexClientPool(_pool(1)[0].members, max_pinned_threads=0)
+    with pytest.raises(ValueError):
+        CodexClientPool.connect_stdio(0)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+
+import codex_app_server_sdk.codec as codec_module
+from codex_app_server_sdk.codec import (
+    JsonCodec,
+    MsgspecJsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    default_codec,
+)
+
+
+def _available_codecs() -> list[JsonCodec]:
+    codecs: list[JsonCodec] = [StdlibJsonCodec()]
+    for codec_cls in (OrjsonCodec, MsgspecJsonCodec):
+        try:
+            codecs.append(codec_cls())
+        except ImportError:
+            continue
+    return codecs
+
+
+@pytest.mark.parametrize("codec", _available_codecs(), ids=lambda codec: codec.name)
+def test_codec_round_trips_messages_as_bytes(codec: JsonCodec) -> None:
+    message = {
+        "jsonrpc": "2.0",
+        "method": "item/completed",
+        "params": {"item": {"type": "agentMessage", "text": "zażółć ✓"}},
+    }
+    encoded = codec.encode(message)
+    assert isinstance(encoded, bytes)
+    assert b"\n" not in encoded
+    assert codec.decode(encoded) == message
+    assert codec.decode(bytearray(encoded)) == message
+
+
+@pytest.mark.parametrize("codec", _available_codecs(), ids=lambda codec: codec.name)
+def test_codec_rejects_invalid_json_with_value_error(codec: JsonCodec) -> None:
+    with pytest.raises(ValueError):
+        codec.decode(b'{"jsonrpc": ')
+    with pytest.raises(ValueError):
+        codec.decode(b"\xff\xfe")
+
+
+def test_default_codec_falls_back_to_stdlib(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(codec_module, "orjson", None)
+    monkeypatch.setattr(codec_module, "msgspec", None)
+    assert isinstance(default_codec(), StdlibJsonCodec)
+    with pytest.raises(ImportError):
+        OrjsonCodec()
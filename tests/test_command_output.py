@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.command_output import (
+    CommandOutputMonitor,
+    CommandOutputStream,
+)
+from codex_app_server_sdk.transport import Transport
+
+
+def _output(text: str, item_id: str = "cmd-1", turn_id: str = "turn_1") -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "item/commandExecution/outputDelta",
+        "params": {"threadId": "thr_1", "turnId": turn_id, "itemId": item_id, "delta": text},
+    }
+
+
+def _completed_item(item: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "item/completed",
+        "params": {"threadId": "thr_1", "turnId": "turn_1", "item": item},
+    }
+
+
+TURN_COMPLETED = {
+    "jsonrpc": "2.0",
+    "method": "turn/completed",
+    "params": {"threadId": "thr_1", "turn": {"id": "turn_1", "status": "completed"}},
+}
+
+
+class OutputTransport(Transport):
+    """Answers `turn/start` and then sends whatever the test pushes."""
+
+    def __init__(self) -> None:
+        self.incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        method = message.get("method")
+        result: dict[str, Any] = {}
+        if method == "thread/start":
+            result = {"thread": {"id": "thr_1"}}
+        elif method == "turn/start":
+            result = {"turn": {"id": "turn_1", "status": "inProgress"}}
+        if "id" in message:
+            await self.incoming.put({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    async def push(self, *messages: dict[str, Any]) -> None:
+        for message in messages:
+            await self.incoming.put(message)
+
+    async def recv(self) -> dict[str, Any]:
+        return await self.incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+async def _settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_output_streams_per_item_while_the_turn_runs() -> None:
+    async def _run() -> None:
+        transport = OutputTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            async with CommandOutputMonitor(client) as monitor:
+                opened = monitor.streams()
+                turn = asyncio.create_task(client.chat_once("build"))
+                await transport.push(_output("compiling\n"), _output("a", item_id="cmd-2"))
+
+                first = await anext(opened)
+                second = await anext(opened)
+                assert (first.item_id, first.turn_id) == ("cmd-1", "turn_1")
+                assert await anext(first) == "compiling\n"
+                assert monitor.get("cmd-2") is second
+
+                await transport.push(
+                    _output("done\n"),
+                    _completed_item({"id": "cmd-1", "type": "commandExecution", "command": "make"}),
+                )
+                assert await first.read() == "done\n"
+                assert first.closed and monitor.get("cmd-1") is None
+
+                await transport.push(
+                    _completed_item({"id": "msg-1", "type": "agentMessage", "text": "ok"}),
+                    TURN_COMPLETED,
+                )
+                result = await turn
+                # The turn's own events are unaffected and the turn end closes the rest.
+                assert result.final_text == "ok"
+                methods = [event["method"] for event in result.raw_events]
+                assert methods.count("item/commandExecution/outputDelta") == 3
+                assert await second.read() == "a"
+                assert monitor.stats().model_dump() == {
+                    "open_streams": 0,
+                    "streams": 2,
+                    "chars": 16,
+                    "dropped_chars": 0,
+                    "pauses": 0,
+                    "sink_errors": 0,
+                }
+            assert client.command_output_monitor is None
+            assert [stream async for stream in opened] == []
+
+    asyncio.run(_run())
+
+
+class RecordingSink(io.StringIO):
+    def close(self) -> None:
+        self.final = self.getvalue()
+        super().close()
+
+
+def test_drop_oldest_bounds_memory_and_sink_bypasses_the_buffer() -> None:
+    async def _run() -> None:
+        transport = OutputTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            monitor = await CommandOutputMonitor(client, max_buffered_chars=6).start()
+            await transport.push(_output("aaaa"), _output("bbbb"), _output("cc"))
+            await _settle()
+            stream = monitor.get("cmd-1")
+            assert stream is not None
+            assert (stream.buffered_chars, stream.dropped_chars, stream.total_chars) == (6, 4, 10)
+            await monitor.close()
+            assert await stream.read() == "bbbbcc"
+
+        sinks: dict[str, RecordingSink] = {}
+
+        def _open_sink(stream: CommandOutputStream) -> RecordingSink:
+            sinks[stream.item_id] = RecordingSink()
+            return sinks[stream.item_id]
+
+        transport = OutputTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            monitor = CommandOutputMonitor(client, max_buffered_chars=1, sink=_open_sink)
+            async with monitor:
+                await transport.push(
+                    _output("line 1\n"),
+                    _output("line 2\n"),
+                    _completed_item({"id": "cmd-1", "type": "commandExecution"}),
+                )
+                await _settle()
+                assert sinks["cmd-1"].final == "line 1\nline 2\n"
+                assert monitor.stats().dropped_chars == 0
+
+        with pytest.raises(ValueError, match="overflow"):
+            CommandOutputMonitor(client, overflow="grow")  # type: ignore[arg-type]
+
+    asyncio.run(_run())
+
+
+def test_block_overflow_pauses_the_receiver_until_the_consumer_reads() -> None:
+    async def _run() -> None:
+        transport = OutputTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            async with CommandOutputMonitor(
+                client, max_buffered_chars=5, overflow="block"
+            ) as monitor:
+                await transport.push(_output("aaaa"), _output("bbbb"), _output("cccc"))
+                await _settle()
+                stream = monitor.get("cmd-1")
+                assert stream is not None
+                # The second chunk overfilled the buffer, so the third is still unread.
+                assert (stream.buffered_chars, transport.incoming.qsize()) == (8, 1)
+                assert monitor.stats().pauses == 1
+
+                assert await anext(stream) == "aaaa"
+                await _settle()
+                assert (stream.buffered_chars, transport.incoming.qsize()) == (8, 0)
+                assert monitor.stats().pauses == 2
+
+                # Closing a full stream releases the connection.
+                await transport.push(TURN_COMPLETED)
+                await monitor.close()
+                assert await stream.read() == "bbbbcccc"
+                await _settle()
+                assert transport.incoming.qsize() == 0
+                assert client._receive_pauses == 0
+
+    asyncio.run(_run())
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexProtocolError
+from codex_app_server_sdk.transport import Transport
+
+
+class RawTransport(Transport):
+    """Hands the client undecoded bytes; replies are scripted per method."""
+
+    supports_raw_messages = True
+
+    def __init__(self, replies: Mapping[str, list[bytes]]) -> None:
+        self._replies = replies
+        self._incoming: asyncio.Queue[bytes] = asyncio.Queue()
+        self.sent: list[dict[str, Any]] = []
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        self.sent.append(message)
+        request_id = message.get("id")
+        for template in self._replies.get(str(message.get("method")), []):
+            self._incoming.put_nowait(template.replace(b"$ID", str(request_id).encode()))
+        if str(message.get("method")) not in self._replies and request_id is not None:
+            self._incoming.put_nowait(b'{"jsonrpc":"2.0","id":%d,"result":{}}' % request_id)
+
+    async def recv(self) -> dict[str, Any]:
+        return json.loads(await self._incoming.get())
+
+    async def recv_raw_many(self) -> list[bytes]:
+        batch = [await self._incoming.get()]
+        while not self._incoming.empty():
+            batch.append(self._incoming.get_nowait())
+        return batch
+
+    async def close(self) -> None:
+        return None
+
+
+def test_ignored_notifications_and_discarded_results_are_not_decoded() -> None:
+    async def _run() -> None:
+        transport = RawTransport(
+            {
+                "thread/archive": [
+                    b'{"jsonrpc":"2.0","method":"codex/event/item_completed","params":{"x":1}}',
+                    b'{"jsonrpc":"2.0","id":$ID,"result":{"not":"json"',
+                ],
+                "thread/name/set": [
+                    b'{"jsonrpc":"2.0","id":$ID,"error":{"code":-32600,"message":"bad name"}}',
+                ],
+            }
+        )
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        try:
+            assert await client.archive_thread("thread-1") is None
+            stats = client.stats()
+            assert stats.skipped_notifications == 1
+            assert stats.skipped_results == 1
+
+            with pytest.raises(CodexProtocolError, match="bad name"):
+                await client.set_thread_name("thread-1", "x")
+            assert client._discarded_results == set()
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_explicit_opt_out_list_controls_ignored_notifications() -> None:
+    async def _run() -> None:
+        transport = RawTransport(
+            {
+                "initialize": [
+                    b'{"jsonrpc":"2.0","method":"codex/event/task_started","params":{}}',
+                    b'{"jsonrpc":"2.0","id":$ID,"result":{}}',
+                ],
+            }
+        )
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        try:
+            await client.initialize({"capabilities": {"optOutNotificationMethods": []}})
+            assert client.stats().skipped_notifications == 0
+            assert client.stats().dropped_notifications == 1
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_server_requests_on_the_opt_out_list_are_still_answered() -> None:
+    async def _run() -> None:
+        transport = RawTransport(
+            {
+                "thread/archive": [
+                    b'{"jsonrpc":"2.0","id":"srv-1","method":"codex/event/item_completed",'
+                    b'"params":{}}',
+                    b'{"jsonrpc":"2.0","id":$ID,"result":{}}',
+                ],
+            }
+        )
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        try:
+            await client.archive_thread("thread-1")
+            await client.archive_thread("thread-1")
+            replies = [message for message in transport.sent if message.get("id") == "srv-1"]
+            assert [reply["error"]["code"] for reply in replies] == [-32601]
+            assert client.stats().skipped_notifications == 0
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexProtocolError
+from codex_app_server_sdk.models import ThreadConfig
+from codex_app_server_sdk.transport import Transport
+
+
+class ConversationTransport(Transport):
+    """Answers thread requests and completes every turn with one agent message."""
+
+    def __init__(self) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.sent: list[dict[str, Any]] = []
+        self.reject_turns = False
+        self._turns = 0
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        self.sent.append(message)
+        method = message.get("method")
+        params = message.get("params") or {}
+        reply: dict[str, Any] = {"jsonrpc": "2.0", "id": message.get("id"), "result": {}}
+        if method == "thread/start":
+            reply["result"] = {"thread": {"id": "thr_1"}}
+        elif method == "thread/fork":
+            reply["result"] = {"thread": {"id": "thr_fork"}}
+        elif method == "turn/start" and self.reject_turns:
+            del reply["result"]
+            reply["error"] = {"code": -32600, "message": "thread not loaded"}
+        elif method == "turn/start":
+            self._turns += 1
+            turn_id = f"turn_{self._turns}"
+            reply["result"] = {"turn": {"id": turn_id, "status": "inProgress"}}
+            await self._incoming.put(reply)
+            await self._incoming.put(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "item/completed",
+                    "params": {
+                        "threadId": params["threadId"],
+                        "turnId": turn_id,
+                        "item": {"id": f"msg_{turn_id}", "type": "agentMessage", "text": "ok"},
+                    },
+                }
+            )
+            await self._incoming.put(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "turn/completed",
+                    "params": {
+                        "threadId": params["threadId"],
+                        "turn": {"id": turn_id, "status": "completed"},
+                    },
+                }
+            )
+            return
+        await self._incoming.put(reply)
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+    def resumes(self) -> list[dict[str, Any]]:
+        return [
+            message["params"] for message in self.sent if message.get("method") == "thread/resume"
+        ]
+
+
+def test_turns_on_live_thread_skip_resume_until_config_changes() -> None:
+    async def _run() -> None:
+        transport = ConversationTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            gpt_a = ThreadConfig(model="gpt-a")
+            gpt_b = ThreadConfig(model="gpt-b")
+            thread = await client.start_thread(gpt_a)
+            await thread.chat_once("one")
+            await client.chat_once("two", thread_id="thr_1", thread_config=gpt_a)
+            assert transport.resumes() == []
+
+            await client.chat_once("three", thread_id="thr_1", thread_config=gpt_b)
+            await client.chat_once("four", thread_id="thr_1", thread_config=gpt_b)
+            assert transport.resumes() == [{"threadId": "thr_1", "model": "gpt-b"}]
+
+            fork = await thread.fork()
+            await fork.chat_once("five")
+            assert len(transport.resumes()) == 1
+            assert client.stats().skipped_resumes == 4
+
+    asyncio.run(_run())
+
+
+def test_archive_and_turn_failure_forget_live_thread() -> None:
+    async def _run() -> None:
+        transport = ConversationTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            await client.start_thread()
+            await client.archive_thread("thr_1")
+            await client.chat_once("after archive", thread_id="thr_1")
+            assert transport.resumes() == [{"threadId": "thr_1"}]
+
+            transport.reject_turns = True
+            with pytest.raises(CodexProtocolError, match="thread not loaded"):
+                await client.chat_once("rejected", thread_id="thr_1")
+            transport.reject_turns = False
+            await client.chat_once("retry", thread_id="thr_1")
+            assert len(transport.resumes()) == 2
+
+    asyncio.run(_run())
+
+
+def test_unknown_thread_is_resumed_on_a_new_connection() -> None:
+    async def _run() -> None:
+        first = ConversationTransport()
+        async with CodexClient(first, request_timeout=1.0) as client:
+            await client.start_thread()
+        second = ConversationTransport()
+        async with CodexClient(second, request_timeout=1.0) as client:
+            await client.chat_once("hi", thread_id="thr_1")
+        assert second.resumes() == [{"threadId": "thr_1"}]
+
+    asyncio.run(_run())
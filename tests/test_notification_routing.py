@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexTransportError
+from codex_app_server_sdk.transport import Transport
+
+
+def _agent_message(turn_id: str, text: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "item/completed",
+        "params": {
+            "threadId": "thread-1",
+            "turnId": turn_id,
+            "item": {"id": f"msg-{turn_id}", "type": "agentMessage", "text": text},
+        },
+    }
+
+
+def _turn_completed(turn_id: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "turn/completed",
+        "params": {"threadId": "thread-1", "turn": {"id": turn_id}},
+    }
+
+
+class ScriptedTransport(Transport):
+    """Answers requests immediately; turn notifications are pushed by the test."""
+
+    def __init__(self, *, early_events: bool = False) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._early_events = early_events
+        self._turn_count = 0
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        method = message.get("method")
+        request_id = message.get("id")
+
+        if method == "thread/start":
+            await self.push(
+                {"jsonrpc": "2.0", "id": request_id, "result": {"threadId": "thread-1"}}
+            )
+            return
+
+        if method == "turn/start":
+            self._turn_count += 1
+            turn_id = f"turn-{self._turn_count}"
+            await self.push(
+                {"jsonrpc": "2.0", "id": request_id, "result": {"turn": {"id": turn_id}}}
+            )
+            if self._early_events:
+                await self.push(_agent_message(turn_id, f"early {turn_id}"))
+                await self.push(_turn_completed(turn_id))
+            return
+
+        await self.push({"jsonrpc": "2.0", "id": request_id, "result": {}})
+
+    async def push(self, message: dict[str, Any]) -> None:
+        await self._incoming.put(message)
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+async def _wait_for_turns(client: CodexClient, count: int) -> None:
+    while len(client._turn_sessions) < count:
+        await asyncio.sleep(0)
+
+
+def test_concurrent_turns_receive_only_their_own_events() -> None:
+    async def _run() -> None:
+        transport = ScriptedTransport()
+        client = await CodexClient(transport, request_timeout=1.0, inactivity_timeout=1.0).start()
+        try:
+            tasks = [
+                asyncio.create_task(client.chat_once(f"prompt {idx}", thread_id="thread-1"))
+                for idx in range(3)
+            ]
+            await _wait_for_turns(client, 3)
+
+            for turn_id in ("turn-3", "turn-1", "turn-2"):
+                await transport.push(_agent_message(turn_id, f"answer for {turn_id}"))
+            for turn_id in ("turn-2", "turn-3", "turn-1"):
+                await transport.push(_turn_completed(turn_id))
+
+            results = await asyncio.gather(*tasks)
+            by_turn = {result.turn_id: result for result in results}
+            assert set(by_turn) == {"turn-1", "turn-2", "turn-3"}
+            for turn_id, result in by_turn.items():
+                assert result.final_text == f"answer for {turn_id}"
+                assert len(result.raw_events) == 2
+            assert len(client._deferred_notifications) == 0
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_events_arriving_before_turn_registration_are_claimed() -> None:
+    async def _run() -> None:
+        transport = ScriptedTransport(early_events=True)
+        client = await CodexClient(transport, request_timeout=1.0, inactivity_timeout=1.0).start()
+        try:
+            result = await client.chat_once("hello", thread_id="thread-1")
+            assert result.turn_id == "turn-1"
+            assert result.final_text == "early turn-1"
+            assert len(client._deferred_notifications) == 0
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_thread_level_notifications_are_not_retained() -> None:
+    async def _run() -> None:
+        transport = ScriptedTransport()
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        try:
+            await transport.push(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "thread/started",
+                    "params": {"thread": {"id": "thread-9"}},
+                }
+            )
+            await client.request("model/list")
+            assert len(client._deferred_notifications) == 0
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_close_wakes_waiting_turns_with_transport_error() -> None:
+    async def _run() -> None:
+        transport = ScriptedTransport()
+        client = await CodexClient(transport, request_timeout=1.0, inactivity_timeout=None).start()
+        task = asyncio.create_task(client.chat_once("hello", thread_id="thread-1"))
+        await _wait_for_turns(client, 1)
+        await client.close()
+        with pytest.raises(CodexTransportError):
+            await task
+
+    asyncio.run(_run())
+
+
+def test_known_shapes_use_fast_path_and_unknown_shapes_fall_back() -> None:
+    async def _run() -> None:
+        transport = ScriptedTransport()
+        client = await CodexClient(transport, request_timeout=1.0, inactivity_timeout=1.0).start()
+        try:
+            task = asyncio.create_task(client.chat_once("hello", thread_id="thread-1"))
+            await _wait_for_turns(client, 1)
+            before = client.stats()
+
+            await transport.push(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "custom/progress",
+                    "params": {"payload": {"turn_id": "turn-1", "note": "working"}},
+                }
+            )
+            await transport.push(_agent_message("turn-1", "done"))
+            await transport.push(_turn_completed("turn-1"))
+            result = await task
+
+            after = client.stats()
+            assert result.final_text == "done"
+            assert [event["method"] for event in result.raw_events] == [
+                "custom/progress",
+                "item/completed",
+                "turn/completed",
+            ]
+            assert after.id_fallback_scans - before.id_fallback_scans == 1
+            assert after.id_fast_path_hits > before.id_fast_path_hits
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_orphan_buffer_is_bounded_and_reports_drops() -> None:
+    async def _run() -> None:
+        transport = ScriptedTransport()
+        client = await CodexClient(
+            transport,
+            request_timeout=1.0,
+            inactivity_timeout=1.0,
+            max_orphan_notifications=2,
+        ).start()
+        dropped: list[tuple[str, str]] = []
+        client.set_orphan_handler(
+            lambda event, reason: dropped.append((event["method"], reason))
+        )
+        try:
+            for turn_id in ("raw-1", "raw-2", "raw-3"):
+                await transport.push(_agent_message(turn_id, "unclaimed"))
+            await transport.push(
+                {"jsonrpc": "2.0", "method": "thread/started", "params": {"thread": {}}}
+            )
+            await client.request("model/list")
+
+            stats = client.stats()
+            assert stats.orphaned_notifications == 3
+            assert stats.buffered_notifications == 2
+            assert dropped == [("item/completed", "evicted"), ("thread/started", "unroutable")]
+
+            task = asyncio.create_task(client.chat_once("hello", thread_id="thread-1"))
+            await _wait_for_turns(client, 1)
+            await transport.push(_agent_message("turn-1", "done"))
+            await transport.push(_turn_completed("turn-1"))
+            await task
+
+            await transport.push(_agent_message("turn-1", "straggler"))
+            await client.request("model/list")
+            assert dropped[-1] == ("item/completed", "late")
+            assert client.stats().buffered_notifications == 2
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_orphan_buffer_expires_untouched_turns() -> None:
+    async def _run() -> None:
+        transport = ScriptedTransport()
+        client = await CodexClient(
+            transport,
+            request_timeout=1.0,
+            orphan_notification_ttl=0.0,
+        ).start()
+        try:
+            await transport.push(_agent_message("raw-1", "old"))
+            await transport.push(_agent_message("raw-2", "new"))
+            await client.request("model/list")
+            stats = client.stats()
+            assert stats.buffered_notifications == 1
+            assert stats.dropped_notifications == 1
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexTransportError
+from codex_app_server_sdk.transport import Transport
+
+
+class BatchRecordingTransport(Transport):
+    """Answers every request; records how outgoing messages were batched."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[dict[str, Any]]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        await self.send_many([payload])
+
+    async def send_many(self, payloads: Sequence[Mapping[str, Any]]) -> None:
+        await self.release.wait()
+        batch = [dict(payload) for payload in payloads]
+        self.batches.append(batch)
+        for message in batch:
+            if "method" in message and message.get("id") is not None:
+                self._incoming.put_nowait(
+                    {"jsonrpc": "2.0", "id": message["id"], "result": {"echo": message["method"]}}
+                )
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+def test_concurrent_requests_are_coalesced_into_one_write() -> None:
+    async def _run() -> None:
+        transport = BatchRecordingTransport()
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        try:
+            results = await asyncio.gather(
+                *(client.request(f"method/{idx}") for idx in range(50))
+            )
+            assert [result["echo"] for result in results] == [f"method/{idx}" for idx in range(50)]
+            assert len(transport.batches) == 1
+            assert [message["id"] for message in transport.batches[0]] == list(range(1, 51))
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_write_failure_is_reported_to_every_caller_in_the_batch() -> None:
+    class FailingTransport(BatchRecordingTransport):
+        async def send_many(self, payloads: Sequence[Mapping[str, Any]]) -> None:
+            raise CodexTransportError("pipe closed")
+
+    async def _run() -> None:
+        client = await CodexClient(FailingTransport(), request_timeout=1.0).start()
+        try:
+            results = await asyncio.gather(
+                client.request("a"),
+                client.request("b"),
+                return_exceptions=True,
+            )
+            assert all(isinstance(result, CodexTransportError) for result in results)
+            assert client._pending == {}
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_close_fails_messages_still_waiting_for_flush() -> None:
+    async def _run() -> None:
+        transport = BatchRecordingTransport()
+        transport.release.clear()
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        first = asyncio.create_task(client.request("blocked"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(client.request("queued"))
+        await asyncio.sleep(0)
+
+        await client.close()
+        for task in (first, second):
+            with pytest.raises(CodexTransportError):
+                await task
+        assert transport.batches == []
+
+    asyncio.run(_run())
+
+
+def test_priority_lanes_flush_control_before_normal_and_bulk() -> None:
+    async def _run() -> None:
+        transport = BatchRecordingTransport()
+        transport.release.clear()
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        try:
+            blocked = asyncio.create_task(client.request("model/list"))
+            await asyncio.sleep(0)
+            queued = [
+                asyncio.create_task(client.request(method))
+                for method in ("thread/read", "model/list", "config/batchWrite", "turn/interrupt")
+            ]
+            await asyncio.sleep(0)
+            transport.release.set()
+            await asyncio.gather(blocked, *queued)
+
+            methods = [[message["method"] for message in batch] for batch in transport.batches]
+            assert methods == [
+                ["model/list"],
+                ["turn/interrupt"],
+                ["model/list", "thread/read", "config/batchWrite"],
+            ]
+
+            lanes = client.stats().send_lanes
+            assert lanes["control"].sent == 1
+            assert lanes["normal"].sent == 2
+            assert lanes["bulk"].sent == 2
+            assert lanes["approval"].sent == 0
+            assert all(lane.queued == 0 for lane in lanes.values())
+            assert lanes["bulk"].max_wait_seconds >= lanes["bulk"].mean_wait_seconds > 0
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_error_replies_to_server_requests_use_the_control_lane() -> None:
+    async def _run() -> None:
+        transport = BatchRecordingTransport()
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        try:
+            transport._incoming.put_nowait(
+                {"jsonrpc": "2.0", "id": "srv-1", "method": "custom/serverRequest", "params": {}}
+            )
+            await client.request("model/list")
+            await client.request("model/list")
+            error_batches = [batch for batch in transport.batches if batch[0].get("id") == "srv-1"]
+            assert error_batches[0][0]["error"]["code"] == -32601
+            assert client.stats().send_lanes["control"].sent == 1
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_unserializable_payload_fails_only_its_own_request() -> None:
+    async def _run() -> None:
+        transport = BatchRecordingTransport()
+        transport.release.clear()
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        try:
+            blocked = asyncio.create_task(client.request("model/list"))
+            await asyncio.sleep(0)
+            results = asyncio.gather(
+                client.request("a"),
+                client.request("bad", {"tags": {"x"}}),
+                client.request("b"),
+                return_exceptions=True,
+            )
+            await asyncio.sleep(0)
+            transport.release.set()
+            await blocked
+            good_a, bad, good_b = await results
+
+            assert good_a == {"echo": "a"} and good_b == {"echo": "b"}
+            assert isinstance(bad, TypeError)
+            assert [message["method"] for message in transport.batches[1]] == ["a", "b"]
+            assert client._pending == {}
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexProtocolError
+from codex_app_server_sdk.transport import Transport
+
+
+class HandshakeGatedTransport(Transport):
+    """Answers `initialize` only after the next request has been written.
+
+    A client that waits for the handshake before sending anything else never
+    gets an `initialize` response from this transport.
+    """
+
+    def __init__(self, *, fail_initialize: bool = False) -> None:
+        self.batches: list[list[dict[str, Any]]] = []
+        self.fail_initialize = fail_initialize
+        self._held_initialize: dict[str, Any] | None = None
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        await self.send_many([payload])
+
+    async def send_many(self, payloads: Sequence[Mapping[str, Any]]) -> None:
+        batch = [dict(payload) for payload in payloads]
+        self.batches.append(batch)
+        for message in batch:
+            method = message.get("method")
+            if method == "initialize":
+                self._held_initialize = message
+                continue
+            if self._held_initialize is not None:
+                self._incoming.put_nowait(self._initialize_reply(self._held_initialize))
+                self._held_initialize = None
+            if self.fail_initialize:
+                self._incoming.put_nowait(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": message["id"],
+                        "error": {"code": -32600, "message": "Not initialized"},
+                    }
+                )
+            else:
+                result = {"thread": {"id": "thr_1"}} if method == "thread/start" else {}
+                self._incoming.put_nowait({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    def _initialize_reply(self, message: dict[str, Any]) -> dict[str, Any]:
+        if self.fail_initialize:
+            return {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32602, "message": "unsupported client"},
+            }
+        return {"jsonrpc": "2.0", "id": message["id"], "result": {"userAgent": "test"}}
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+def test_thread_start_is_written_behind_initialize_without_waiting() -> None:
+    async def _run() -> None:
+        transport = HandshakeGatedTransport()
+        client = await CodexClient(transport, request_timeout=1.0, pipeline_startup=True).start()
+        try:
+            thread = await client.start_thread()
+            assert thread.thread_id == "thr_1"
+            assert client._initialized
+            methods = [message["method"] for message in transport.batches[0]]
+            assert methods == ["initialize", "thread/start"]
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_start_sends_initialize_and_initialize_awaits_it() -> None:
+    async def _run() -> None:
+        transport = HandshakeGatedTransport()
+        client = await CodexClient(transport, request_timeout=1.0, pipeline_startup=True).start()
+        try:
+            await asyncio.sleep(0.01)
+            assert [message["method"] for message in transport.batches[0]] == ["initialize"]
+            await client.request("model/list")
+            result = await client.initialize()
+            assert result.raw == {"userAgent": "test"}
+            initialize_count = sum(
+                message["method"] == "initialize"
+                for batch in transport.batches
+                for message in batch
+            )
+            assert initialize_count == 1
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
+
+
+def test_handshake_failure_is_raised_instead_of_thread_error() -> None:
+    async def _run() -> None:
+        transport = HandshakeGatedTransport(fail_initialize=True)
+        client = await CodexClient(transport, request_timeout=1.0, pipeline_startup=True).start()
+        try:
+            with pytest.raises(CodexProtocolError, match="initialize failed: unsupported client"):
+                await client.start_thread()
+            with pytest.raises(CodexProtocolError, match="initialize failed"):
+                await client.chat_once("hi", thread_id="thr_1")
+            assert not client._initialized
+        finally:
+            await client.close()
+
+    asyncio.run(_run())
@@ -2,6 +2,7 @@ from codex_app_server_sdk.protocol import (
     extract_error,
     make_error_response,
     make_request,
+    peek_message_head,
 )
 
 
@@ -19,3 +20,24 @@ def test_extract_error_reads_error_payload() -> None:
     assert error is not None
     assert error["code"] == -32000
     assert error["message"] == "boom"
+
+
+def test_peek_message_head_reads_scalar_prefix() -> None:
+    response = peek_message_head(b'{"jsonrpc":"2.0","id":12,"result":{"thread":{}}}')
+    assert response is not None
+    assert (response.id, response.method, response.has_result) == (12, None, True)
+
+    request = peek_message_head(b'{ "id" : "srv-1", "method": "item/x", "params": {} }')
+    assert request is not None
+    assert (request.id, request.method, request.has_result) == ("srv-1", "item/x", False)
+
+    error = peek_message_head(b'{"id":3,"error":{"code":-1}}')
+    assert error is not None
+    assert (error.id, error.has_result) == (3, False)
+
+
+def test_peek_message_head_gives_up_on_unusual_shapes() -> None:
+    assert peek_message_head(b"[1, 2]") is None
+    assert peek_message_head(b'{"method":1}') is None
+    escaped = peek_message_head(b'{"method":"a\\"b","params":{}}')
+    assert escaped is not None and escaped.method is None
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from codex_app_server_sdk.errors import CodexProtocolError
+from codex_app_server_sdk.models import AgentMessageDelta, StructuredOutputItem
+from codex_app_server_sdk.structured import StructuredOutputParser
+
+
+class Finding(BaseModel):
+    path: str
+    line: int
+
+
+class Report(BaseModel):
+    summary: str
+    findings: list[Finding]
+    score: float
+
+
+def _delta(text: str, item_id: str = "msg-1") -> AgentMessageDelta:
+    return AgentMessageDelta(thread_id="thr_1", turn_id="turn_1", item_id=item_id, delta=text)
+
+
+def test_object_fields_are_emitted_as_soon_as_they_complete() -> None:
+    answer = {
+        "summary": 'braces } and "quotes" \\ inside',
+        "findings": [{"path": "a.py", "line": 3}, {"path": "b[1].py", "line": 7}],
+        "score": 0.5,
+    }
+    text = json.dumps(answer, indent=2)
+    parser = StructuredOutputParser(Report)
+
+    seen: list[tuple[int, str | None]] = []
+    emitted: list[StructuredOutputItem] = []
+    for position, char in enumerate(text):
+        for item in parser.feed(char):
+            seen.append((position, item.key))
+            emitted.append(item)
+
+    assert [(item.key, item.value) for item in emitted] == list(answer.items())
+    # `findings` is emitted on its closing bracket, before the next comma.
+    findings_at = dict((key, position) for position, key in seen)["findings"]
+    assert text[findings_at] == "]"
+    assert parser.complete
+    report = parser.result()
+    assert isinstance(report, Report) and report.findings[1].path == "b[1].py"
+
+
+def test_array_elements_stream_from_the_latest_agent_message() -> None:
+    parser = StructuredOutputParser(list[Finding])
+    assert parser.feed_delta(_delta("Let me check.", item_id="msg-0")) == []
+
+    chunks = ['[{"path": "a.py", ', '"line": 1}, {"pa', 'th": "b.py", "line": 2}', ", 3]"]
+    items = [item for chunk in chunks for item in parser.feed_delta(_delta(chunk))]
+    assert [(item.index, item.value) for item in items] == [
+        (0, {"path": "a.py", "line": 1}),
+        (1, {"path": "b.py", "line": 2}),
+        (2, 3),
+    ]
+    assert parser.text == "".join(chunks)
+    with pytest.raises(ValidationError):
+        parser.result()
+    assert parser.result('[{"path": "c.py", "line": 4}]') == [Finding(path="c.py", line=4)]
+
+
+def test_malformed_output_stops_emitting_and_fails_on_result() -> None:
+    parser = StructuredOutputParser()
+    assert parser.feed('{"a": 1, "b": tru') == [StructuredOutputItem(value=1, key="a")]
+    assert parser.feed('ly, "c": 2}') == []
+    assert not parser.complete
+    with pytest.raises(CodexProtocolError, match="not valid JSON"):
+        parser.result()
+
+    parser.reset()
+    assert [item.value for item in parser.feed('  {"a": "\\')] == []
+    assert [item.value for item in parser.feed('"x"}')] == ['"x']
+    assert parser.result() == {"a": '"x'}
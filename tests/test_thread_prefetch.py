@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.models import ThreadConfig
+from codex_app_server_sdk.prefetch import ThreadPrefetcher, _config_fingerprint
+from codex_app_server_sdk.transport import Transport
+
+
+class ThreadFactoryTransport(Transport):
+    """Creates a new thread id for every `thread/start` and records requests."""
+
+    def __init__(self) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.sent: list[dict[str, Any]] = []
+        self._threads = 0
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        self.sent.append(message)
+        method = message.get("method")
+        result: dict[str, Any] = {}
+        if method == "thread/start":
+            self._threads += 1
+            result = {"thread": {"id": f"thr_{self._threads}"}}
+        elif method == "turn/start":
+            result = {"turn": {"id": "turn_1", "status": "inProgress"}}
+            await self._incoming.put({"jsonrpc": "2.0", "id": message["id"], "result": result})
+            await self._incoming.put(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "item/completed",
+                    "params": {
+                        "threadId": message["params"]["threadId"],
+                        "turnId": "turn_1",
+                        "item": {"id": "msg_1", "type": "agentMessage", "text": "hello"},
+                    },
+                }
+            )
+            await self._incoming.put(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "turn/completed",
+                    "params": {
+                        "threadId": message["params"]["threadId"],
+                        "turn": {"id": "turn_1", "status": "completed"},
+                    },
+                }
+            )
+            return
+        await self._incoming.put({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+    def calls(self, method: str) -> list[dict[str, Any]]:
+        return [message for message in self.sent if message.get("method") == method]
+
+
+def test_fingerprint_ignores_unset_fields() -> None:
+    assert _config_fingerprint(None) == _config_fingerprint(ThreadConfig())
+    assert _config_fingerprint(ThreadConfig(model="a", cwd="/x")) == _config_fingerprint(
+        ThreadConfig(cwd="/x", model="a")
+    )
+    assert _config_fingerprint(ThreadConfig(model="a")) != _config_fingerprint(
+        ThreadConfig(model="b")
+    )
+
+
+def test_new_threads_come_from_the_prefetcher_and_are_refilled() -> None:
+    async def _run() -> None:
+        transport = ThreadFactoryTransport()
+        config = ThreadConfig(model="gpt-test")
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            prefetcher = await ThreadPrefetcher(client, per_config=2, configs=[config]).start()
+            assert prefetcher.ready(config) == 2
+
+            handle = await client.start_thread(config)
+            result = await client.chat_once("hi", thread_config=config)
+
+            assert {handle.thread_id, result.thread_id} == {"thr_1", "thr_2"}
+            await prefetcher.wait_ready()
+            assert prefetcher.ready(config) == 2
+            stats = prefetcher.stats()
+            assert (stats.hits, stats.misses, stats.ready) == (2, 0, 2)
+
+            # A different config misses, then is kept warm.
+            other = await client.start_thread(ThreadConfig(model="other"))
+            assert other.thread_id == "thr_5"
+            await prefetcher.wait_ready()
+            assert prefetcher.ready(ThreadConfig(model="other")) == 2
+            assert transport.calls("thread/start")[4]["params"] == {"model": "other"}
+
+            await prefetcher.close()
+            archived = {
+                message["params"]["threadId"] for message in transport.calls("thread/archive")
+            }
+            assert archived == {"thr_3", "thr_4", "thr_6", "thr_7"}
+            assert client.thread_prefetcher is None
+
+    asyncio.run(_run())
+
+
+def test_refill_respects_max_threads() -> None:
+    async def _run() -> None:
+        transport = ThreadFactoryTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            configs = [ThreadConfig(model=f"m{idx}") for idx in range(3)]
+            async with ThreadPrefetcher(
+                client,
+                per_config=2,
+                max_threads=3,
+                configs=configs,
+            ) as prefetcher:
+                assert prefetcher.stats().ready == 3
+                assert len(transport.calls("thread/start")) == 3
+
+    asyncio.run(_run())
+
+
+def test_one_off_configs_are_evicted_least_recently_used_first() -> None:
+    async def _run() -> None:
+        transport = ThreadFactoryTransport()
+        hot = ThreadConfig(model="hot")
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            async with ThreadPrefetcher(
+                client,
+                per_config=1,
+                max_threads=4,
+                configs=[hot],
+            ) as prefetcher:
+                for idx in range(20):
+                    await client.start_thread(hot)
+                    await client.start_thread(ThreadConfig(model=f"once-{idx}"))
+                    await prefetcher.wait_ready()
+                    stats = prefetcher.stats()
+                    assert stats.configs <= 4 and stats.ready + stats.starting <= 4
+
+                assert prefetcher.ready(hot) == 1
+                assert prefetcher.stats().evicted_configs >= 16
+                # Every pre-created thread was handed out, is still ready, or
+                # was archived with its evicted config.
+                archived = transport.calls("thread/archive")
+                handed_out, ready = 40, prefetcher.stats().ready
+                assert len(archived) == len(transport.calls("thread/start")) - handed_out - ready
+
+    asyncio.run(_run())
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexProtocolError
+from codex_app_server_sdk.models import ThreadConfig, ThreadTemplate
+from codex_app_server_sdk.transport import Transport
+
+
+class TemplateServerTransport(Transport):
+    """Creates threads and forks, and completes every turn immediately."""
+
+    def __init__(self) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.sent: list[dict[str, Any]] = []
+        self.lost_threads: set[str] = set()
+        self._threads = 0
+        self._forks = 0
+        self._turns = 0
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        self.sent.append(message)
+        method = message.get("method")
+        params = message.get("params") or {}
+        reply: dict[str, Any] = {"jsonrpc": "2.0", "id": message.get("id"), "result": {}}
+        if method == "thread/start":
+            self._threads += 1
+            reply["result"] = {"thread": {"id": f"thr_{self._threads}"}}
+        elif method == "thread/fork":
+            if params["threadId"] in self.lost_threads:
+                del reply["result"]
+                reply["error"] = {"code": -32600, "message": "thread not found"}
+            elif params.get("model") == "missing-model":
+                del reply["result"]
+                reply["error"] = {"code": -32602, "message": "unsupported model: missing-model"}
+            else:
+                self._forks += 1
+                reply["result"] = {"thread": {"id": f"fork_{self._forks}"}}
+        elif method == "turn/start":
+            self._turns += 1
+            turn_id = f"turn_{self._turns}"
+            reply["result"] = {"turn": {"id": turn_id, "status": "inProgress"}}
+            await self._incoming.put(reply)
+            for notification in (
+                {
+                    "method": "item/completed",
+                    "params": {
+                        "threadId": params["threadId"],
+                        "turnId": turn_id,
+                        "item": {"id": f"msg_{turn_id}", "type": "agentMessage", "text": "ok"},
+                    },
+                },
+                {
+                    "method": "turn/completed",
+                    "params": {
+                        "threadId": params["threadId"],
+                        "turn": {"id": turn_id, "status": "completed"},
+                    },
+                },
+            ):
+                await self._incoming.put({"jsonrpc": "2.0", **notification})
+            return
+        await self._incoming.put(reply)
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+    def calls(self, method: str) -> list[dict[str, Any]]:
+        return [message for message in self.sent if message.get("method") == method]
+
+
+TEMPLATE = ThreadTemplate(
+    name="repo",
+    config=ThreadConfig(developer_instructions="Be brief"),
+    priming_prompts=("Read README.md", "Read CONTRIBUTING.md"),
+)
+
+
+def test_template_is_primed_once_and_forked_per_call() -> None:
+    async def _run() -> None:
+        transport = TemplateServerTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            forks = await asyncio.gather(*(client.fork_template(TEMPLATE) for _ in range(3)))
+
+            assert sorted(handle.thread_id for handle in forks) == ["fork_1", "fork_2", "fork_3"]
+            assert len(transport.calls("thread/start")) == 1
+            prompts = [call["params"]["input"][0]["text"] for call in transport.calls("turn/start")]
+            assert prompts == ["Read README.md", "Read CONTRIBUTING.md"]
+            assert {call["params"]["threadId"] for call in transport.calls("thread/fork")} == {
+                "thr_1"
+            }
+            assert forks[0].defaults.developer_instructions == "Be brief"
+            stats = client.stats()
+            assert (stats.template_primes, stats.primed_templates) == (1, 1)
+
+    asyncio.run(_run())
+
+
+def test_changed_inputs_and_eviction_archive_old_template_threads() -> None:
+    async def _run() -> None:
+        transport = TemplateServerTransport()
+        async with CodexClient(transport, request_timeout=1.0, max_primed_templates=1) as client:
+            await client.fork_template(TEMPLATE)
+            changed = ThreadTemplate(name="repo", priming_prompts=("Read docs/",))
+            await client.fork_template(changed)
+            await client.fork_template(ThreadTemplate(name="other"))
+            await asyncio.sleep(0)
+
+            archived = [call["params"]["threadId"] for call in transport.calls("thread/archive")]
+            assert archived == ["thr_1", "thr_2"]
+            assert client.stats().template_primes == 3
+
+            await client.invalidate_template()
+            archived = [call["params"]["threadId"] for call in transport.calls("thread/archive")]
+            assert archived == ["thr_1", "thr_2", "thr_3"]
+            assert client.stats().primed_templates == 0
+
+    asyncio.run(_run())
+
+
+def test_lost_template_thread_is_primed_again() -> None:
+    async def _run() -> None:
+        transport = TemplateServerTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            await client.fork_template(TEMPLATE)
+            transport.lost_threads.add("thr_1")
+
+            handle = await client.fork_template(TEMPLATE)
+
+            assert handle.thread_id == "fork_2"
+            assert transport.calls("thread/fork")[-1]["params"]["threadId"] == "thr_2"
+
+            transport.lost_threads.add("thr_2")
+            transport.lost_threads.add("thr_3")
+            with pytest.raises(CodexProtocolError, match="thread not found"):
+                await client.fork_template(TEMPLATE)
+
+    asyncio.run(_run())
+
+
+def test_fork_errors_other_than_a_lost_template_are_raised_unchanged() -> None:
+    async def _run() -> None:
+        transport = TemplateServerTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            await client.fork_template(TEMPLATE)
+
+            with pytest.raises(CodexProtocolError, match="unsupported model") as exc_info:
+                await client.fork_template(TEMPLATE, overrides=ThreadConfig(model="missing-model"))
+
+            assert exc_info.value.code == -32602
+            assert len(transport.calls("thread/start")) == 1
+            assert transport.calls("thread/archive") == []
+            stats = client.stats()
+            assert (stats.template_primes, stats.primed_templates) == (1, 1)
+            assert (await client.fork_template(TEMPLATE)).thread_id == "fork_2"
+
+    asyncio.run(_run())
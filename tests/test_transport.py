@@ -1,8 +1,10 @@
 import asyncio
+import sys
 from types import SimpleNamespace
 
 import pytest
 
+from codex_app_server_sdk.codec import StdlibJsonCodec
 from codex_app_server_sdk.errors import CodexTransportError
 from codex_app_server_sdk.transport import StdioTransport, WebSocketTransport
 import codex_app_server_sdk.transport as transport_module
@@ -80,3 +82,205 @@ def test_websocket_transport_connect_wraps_original_exception(
         assert "boom" in message
 
     asyncio.run(_run())
+
+
+_ECHO_SERVER = (
+    "import sys\n"
+    "for line in sys.stdin.buffer:\n"
+    "    sys.stdout.buffer.write(line)\n"
+    "    sys.stdout.buffer.flush()\n"
+)
+
+
+def test_stdio_transport_round_trips_through_codec() -> None:
+    async def _run() -> None:
+        transport = StdioTransport(
+            [sys.executable, "-c", _ECHO_SERVER],
+            codec=StdlibJsonCodec(),
+        )
+        await transport.connect()
+        try:
+            message = {"jsonrpc": "2.0", "id": 1, "method": "ping", "params": {"text": "ok ✓"}}
+            await transport.send(message)
+            assert await transport.recv() == message
+        finally:
+            await transport.close()
+
+    asyncio.run(_run())
+
+
+def test_stdio_transport_send_many_writes_one_batch() -> None:
+    async def _run() -> None:
+        transport = StdioTransport(
+            [sys.executable, "-c", _ECHO_SERVER],
+            codec=StdlibJsonCodec(),
+        )
+        await transport.connect()
+        try:
+            assert transport._proc is not None and transport._proc.stdin is not None
+            stdin = transport._proc.stdin
+            writes: list[bytes] = []
+            original_write = stdin.write
+
+            def _recording_write(data: bytes) -> None:
+                writes.append(data)
+                original_write(data)
+
+            stdin.write = _recording_write  # type: ignore[method-assign]
+            messages = [{"jsonrpc": "2.0", "id": idx, "method": "ping"} for idx in range(5)]
+            await transport.send_many(messages)
+            assert len(writes) == 1
+            assert [await transport.recv() for _ in messages] == messages
+        finally:
+            await transport.close()
+
+    asyncio.run(_run())
+
+
+def test_websocket_transport_sends_encoded_text_frames() -> None:
+    sent: list[tuple[object, object]] = []
+
+    class DummySocket:
+        async def send(self, message: object, text: object = None) -> None:
+            sent.append((message, text))
+
+        async def recv(self, decode: object = None) -> bytes:
+            assert decode is False
+            return b'{"jsonrpc":"2.0","id":1,"result":{}}'
+
+    async def _run() -> None:
+        transport = WebSocketTransport("ws://127.0.0.1:8765", codec=StdlibJsonCodec())
+        transport._socket = DummySocket()
+        await transport.send({"jsonrpc": "2.0", "id": 1, "method": "ping"})
+        assert await transport.recv() == {"jsonrpc": "2.0", "id": 1, "result": {}}
+
+    asyncio.run(_run())
+    assert sent == [(b'{"jsonrpc":"2.0","id":1,"method":"ping"}', True)]
+
+
+_BURST_SERVER = (
+    "import sys\n"
+    "lines = [b'{\"jsonrpc\":\"2.0\",\"method\":\"tick\",\"params\":{\"n\":%d}}\\n' % n"
+    " for n in range(5)]\n"
+    "sys.stdout.buffer.write(b''.join(lines))\n"
+    "sys.stdout.buffer.flush()\n"
+    "sys.stdin.buffer.read()\n"
+)
+
+
+def test_stdio_transport_recv_many_returns_all_buffered_lines() -> None:
+    async def _run() -> None:
+        transport = StdioTransport([sys.executable, "-c", _BURST_SERVER], codec=StdlibJsonCodec())
+        await transport.connect()
+        try:
+            messages = await asyncio.wait_for(transport.recv_many(), timeout=5.0)
+            assert [message["params"]["n"] for message in messages] == list(range(5))
+        finally:
+            await transport.close()
+
+    asyncio.run(_run())
+
+
+def test_websocket_transport_recv_many_drains_queued_frames() -> None:
+    class QueuedSocket:
+        def __init__(self) -> None:
+            self.frames: asyncio.Queue[bytes] = asyncio.Queue()
+
+        async def recv(self, decode: object = None) -> bytes:
+            assert decode is False
+            return await self.frames.get()
+
+    async def _run() -> None:
+        transport = WebSocketTransport("ws://127.0.0.1:8765", codec=StdlibJsonCodec())
+        socket = QueuedSocket()
+        transport._socket = socket
+        for idx in range(3):
+            socket.frames.put_nowait(b'{"jsonrpc":"2.0","id":%d,"result":{}}' % idx)
+
+        messages = await asyncio.wait_for(transport.recv_many(), timeout=1.0)
+        assert [message["id"] for message in messages] == [0, 1, 2]
+
+        socket.frames.put_nowait(b'{"jsonrpc":"2.0","id":3,"result":{}}')
+        assert await transport.recv_many() == [{"jsonrpc": "2.0", "id": 3, "result": {}}]
+
+    asyncio.run(_run())
+
+
+_LARGE_LINE_SERVER = (
+    "import sys\n"
+    "size = int(sys.argv[1])\n"
+    "out = sys.stdout.buffer\n"
+    "out.write(b'{\"jsonrpc\":\"2.0\",\"method\":\"big\",\"params\":{\"blob\":\"')\n"
+    "out.write(b'a' * size)\n"
+    "out.write(b'\"}}\\n{\"jsonrpc\":\"2.0\",\"method\":\"after\"}\\n')\n"
+    "out.flush()\n"
+)
+
+
+def test_stdio_transport_reads_50_mb_lines() -> None:
+    size = 50 * 1024 * 1024
+
+    async def _run() -> None:
+        transport = StdioTransport(
+            [sys.executable, "-c", _LARGE_LINE_SERVER, str(size)],
+            codec=StdlibJsonCodec(),
+        )
+        await transport.connect()
+        try:
+            big = await asyncio.wait_for(transport.recv(), timeout=60.0)
+            assert big["method"] == "big"
+            assert len(big["params"]["blob"]) == size
+            after = await asyncio.wait_for(transport.recv(), timeout=5.0)
+            assert after == {"jsonrpc": "2.0", "method": "after"}
+        finally:
+            await transport.close()
+
+    asyncio.run(_run())
+
+
+def test_stdio_transport_enforces_optional_line_limit() -> None:
+    async def _run() -> None:
+        transport = StdioTransport(
+            [sys.executable, "-c", _LARGE_LINE_SERVER, str(4096)],
+            codec=StdlibJsonCodec(),
+            max_line_bytes=1024,
+            read_chunk_size=512,
+        )
+        await transport.connect()
+        try:
+            with pytest.raises(CodexTransportError, match="max_line_bytes"):
+                await asyncio.wait_for(transport.recv(), timeout=5.0)
+        finally:
+            await transport.close()
+
+    asyncio.run(_run())
+
+
+_PIPE_HOLDING_SERVER = r"""
+import subprocess
+import sys
+import time
+
+subprocess.Popen([sys.executable, "-c", "import time; time.sleep(1)"])
+time.sleep(5)
+"""
+
+
+def test_stdio_transport_close_bounds_drain_when_child_holds_stdout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(transport_module, "_CLOSE_TIMEOUT", 0.2)
+
+    async def _run() -> None:
+        transport = StdioTransport(
+            [sys.executable, "-c", _PIPE_HOLDING_SERVER], codec=StdlibJsonCodec()
+        )
+        await transport.connect()
+        await asyncio.sleep(0.2)
+        started = asyncio.get_running_loop().time()
+        await asyncio.wait_for(transport.close(), timeout=2.0)
+        assert asyncio.get_running_loop().time() - started < 0.8
+        # Let the leftover child exit so the pipe closes before the loop does.
+        await asyncio.sleep(1.0)
+
+    asyncio.run(_run())
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexProtocolError, CodexTransportError
+from codex_app_server_sdk.transport import Transport
+
+
+class ManualTurnTransport(Transport):
+    """Starts turns immediately but completes them only when the test says so."""
+
+    def __init__(self) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.turn_texts: list[str] = []
+        self.turn_started = asyncio.Event()
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        method = message.get("method")
+        params = message.get("params") or {}
+        result: dict[str, Any] = {}
+        if method == "thread/start":
+            result = {"thread": {"id": "thr_1"}}
+        elif method == "turn/start":
+            self.turn_texts.append(params["input"][0]["text"])
+            result = {"turn": {"id": f"turn_{len(self.turn_texts)}", "status": "inProgress"}}
+            self.turn_started.set()
+        if "id" in message:
+            await self._incoming.put({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    async def complete(self, number: int, *, failed: bool = False) -> None:
+        turn_id = f"turn_{number}"
+        if failed:
+            await self._incoming.put(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "turn/completed",
+                    "params": {
+                        "threadId": "thr_1",
+                        "turn": {"id": turn_id, "status": "failed", "error": {"message": "boom"}},
+                    },
+                }
+            )
+            return
+        await self._incoming.put(
+            {
+                "jsonrpc": "2.0",
+                "method": "item/completed",
+                "params": {
+                    "threadId": "thr_1",
+                    "turnId": turn_id,
+                    "item": {
+                        "id": f"msg_{number}",
+                        "type": "agentMessage",
+                        "text": f"reply {number}",
+                    },
+                },
+            }
+        )
+        await self._incoming.put(
+            {
+                "jsonrpc": "2.0",
+                "method": "turn/completed",
+                "params": {"threadId": "thr_1", "turn": {"id": turn_id, "status": "completed"}},
+            }
+        )
+
+    async def wait_for_turns(self, count: int) -> None:
+        while len(self.turn_texts) < count:
+            self.turn_started.clear()
+            await asyncio.wait_for(self.turn_started.wait(), timeout=1.0)
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+def test_submitted_prompts_run_in_order_without_waiting_for_callers() -> None:
+    async def _run() -> None:
+        transport = ManualTurnTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            thread = await client.start_thread()
+            turns = [thread.submit(f"prompt {idx}") for idx in range(1, 4)]
+            assert thread.queued_turns == 3
+
+            await transport.wait_for_turns(1)
+            assert transport.turn_texts == ["prompt 1"]
+            assert client.stats().queued_turns == 2
+            assert turns[0].started and not turns[1].started
+
+            # Nobody awaits turn 1; turn 2 still starts when it completes.
+            await transport.complete(1)
+            await transport.wait_for_turns(2)
+            assert transport.turn_texts == ["prompt 1", "prompt 2"]
+            await transport.complete(2)
+            await transport.wait_for_turns(3)
+            await transport.complete(3)
+
+            results = [await turn for turn in turns]
+            assert [result.final_text for result in results] == ["reply 1", "reply 2", "reply 3"]
+            assert [result.turn_id for result in results] == ["turn_1", "turn_2", "turn_3"]
+            assert thread.queued_turns == 0
+
+    asyncio.run(_run())
+
+
+def test_steps_cancel_and_failures_do_not_stall_the_queue() -> None:
+    async def _run() -> None:
+        transport = ManualTurnTransport()
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            thread = await client.start_thread()
+            failing = thread.submit("fails")
+            withdrawn = thread.submit("never sent")
+            streamed = thread.submit("streamed")
+            assert withdrawn.cancel()
+
+            await transport.wait_for_turns(1)
+            await transport.complete(1, failed=True)
+            with pytest.raises(CodexProtocolError):
+                await failing
+
+            await transport.wait_for_turns(2)
+            assert not streamed.cancel()
+            await transport.complete(2)
+            steps = [step async for step in streamed.steps()]
+            assert [step.text for step in steps] == ["reply 2"]
+            assert transport.turn_texts == ["fails", "streamed"]
+            with pytest.raises(asyncio.CancelledError):
+                await withdrawn
+
+    asyncio.run(_run())
+
+
+def test_close_fails_queued_turns() -> None:
+    async def _run() -> None:
+        transport = ManualTurnTransport()
+        client = await CodexClient(transport, request_timeout=1.0).start()
+        thread = await client.start_thread()
+        running = thread.submit("running")
+        waiting = thread.submit("waiting")
+        await transport.wait_for_turns(1)
+        await client.close()
+        for turn in (running, waiting):
+            with pytest.raises(CodexTransportError):
+                await turn
+
+    asyncio.run(_run())
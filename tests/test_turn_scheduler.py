@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+from codex_app_server_sdk.client import CodexClient
+from codex_app_server_sdk.errors import CodexTimeoutError
+from codex_app_server_sdk.models import TurnSchedule
+from codex_app_server_sdk.scheduling import TurnAdmission, TurnScheduler
+from codex_app_server_sdk.transport import Transport
+
+
+async def _queue(
+    scheduler: TurnScheduler,
+    admitted: list[str],
+    label: str,
+    schedule: TurnSchedule | None = None,
+) -> TurnAdmission:
+    admission = await scheduler.acquire(schedule)
+    admitted.append(label)
+    return admission
+
+
+async def _drain(scheduler: TurnScheduler, held: TurnAdmission, tasks: list[asyncio.Task]) -> None:
+    held.release()
+    for _ in tasks:
+        await asyncio.sleep(0)
+        for task in tasks:
+            if task.done() and not task.result().released:
+                task.result().release()
+                break
+
+
+def test_priorities_are_admitted_before_arrival_order() -> None:
+    async def _run() -> None:
+        scheduler = TurnScheduler(max_in_flight=1)
+        held = await scheduler.acquire()
+        admitted: list[str] = []
+        tasks = [
+            asyncio.create_task(_queue(scheduler, admitted, name, TurnSchedule(priority=name)))
+            for name in ("low", "normal", "high")
+        ]
+        await asyncio.sleep(0)
+        stats = scheduler.stats()
+        assert (stats.in_flight, stats.queued) == (1, 3)
+        assert stats.queued_by_priority == {"high": 1, "normal": 1, "low": 1}
+
+        await _drain(scheduler, held, tasks)
+        assert admitted == ["high", "normal", "low"]
+        assert scheduler.stats().admitted == 4
+
+    asyncio.run(_run())
+
+
+def test_keys_share_admissions_by_weight() -> None:
+    async def _run() -> None:
+        scheduler = TurnScheduler(max_in_flight=1, weights={"a": 2})
+        held = await scheduler.acquire()
+        admitted: list[str] = []
+        tasks = [
+            asyncio.create_task(_queue(scheduler, admitted, key, TurnSchedule(key=key)))
+            for key in ("b", "b", "b", "a", "a", "a")
+        ]
+        await asyncio.sleep(0)
+
+        await _drain(scheduler, held, tasks)
+        assert admitted == ["a", "b", "a", "a", "b", "b"]
+
+    asyncio.run(_run())
+
+
+def test_deadlines_order_waiters_and_expire() -> None:
+    async def _run() -> None:
+        scheduler = TurnScheduler(max_in_flight=1)
+        held = await scheduler.acquire()
+        with pytest.raises(CodexTimeoutError, match="not admitted"):
+            await scheduler.acquire(TurnSchedule(deadline=0.01))
+        assert (scheduler.stats().expired, scheduler.stats().queued) == (1, 0)
+
+        admitted: list[str] = []
+        tasks = [
+            asyncio.create_task(_queue(scheduler, admitted, "none")),
+            asyncio.create_task(_queue(scheduler, admitted, "late", TurnSchedule(deadline=10))),
+            asyncio.create_task(_queue(scheduler, admitted, "soon", TurnSchedule(deadline=5))),
+        ]
+        await asyncio.sleep(0)
+        await _drain(scheduler, held, tasks)
+        assert admitted == ["soon", "late", "none"]
+
+    asyncio.run(_run())
+
+
+def test_cancelled_waiter_does_not_take_a_slot() -> None:
+    async def _run() -> None:
+        scheduler = TurnScheduler(max_in_flight=1)
+        held = await scheduler.acquire()
+        waiter = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.stats().queued == 0
+
+        held.release()
+        held.release()
+        assert scheduler.in_flight == 0
+        assert (await scheduler.acquire()).admitted_at >= held.admitted_at
+
+    asyncio.run(_run())
+
+
+class ManualTurnTransport(Transport):
+    """Starts turns immediately but completes them only when the test says so."""
+
+    def __init__(self) -> None:
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.turn_texts: list[str] = []
+
+    async def connect(self) -> None:
+        return None
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        message = dict(payload)
+        method = message.get("method")
+        params = message.get("params") or {}
+        result: dict[str, Any] = {}
+        if method == "thread/start":
+            result = {"thread": {"id": "thr_1"}}
+        elif method == "turn/start":
+            self.turn_texts.append(params["input"][0]["text"])
+            result = {"turn": {"id": f"turn_{len(self.turn_texts)}", "status": "inProgress"}}
+        if "id" in message:
+            await self._incoming.put({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    async def complete(self, number: int) -> None:
+        turn_id = f"turn_{number}"
+        for notification in (
+            {
+                "method": "item/completed",
+                "params": {
+                    "threadId": "thr_1",
+                    "turnId": turn_id,
+                    "item": {"id": f"msg_{number}", "type": "agentMessage", "text": "ok"},
+                },
+            },
+            {
+                "method": "turn/completed",
+                "params": {"threadId": "thr_1", "turn": {"id": turn_id, "status": "completed"}},
+            },
+        ):
+            await self._incoming.put({"jsonrpc": "2.0", **notification})
+
+    async def wait_for_turns(self, count: int) -> None:
+        for _ in range(100):
+            if len(self.turn_texts) >= count:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"expected {count} turns, saw {self.turn_texts}")
+
+    async def recv(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        return None
+
+
+def test_client_turns_wait_for_admission() -> None:
+    async def _run() -> None:
+        transport = ManualTurnTransport()
+        scheduler = TurnScheduler(max_in_flight=1)
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            client.set_turn_scheduler(scheduler)
+            thread = await client.start_thread()
+            first = asyncio.create_task(thread.chat_once("first"))
+            await transport.wait_for_turns(1)
+            low = asyncio.create_task(thread.chat_once("low", schedule=TurnSchedule("low")))
+            high = asyncio.create_task(thread.chat_once("high", schedule=TurnSchedule("high")))
+            await asyncio.sleep(0.02)
+            assert transport.turn_texts == ["first"]
+            assert scheduler.stats().queued == 2
+
+            await transport.complete(1)
+            await transport.wait_for_turns(2)
+            await transport.complete(2)
+            await transport.wait_for_turns(3)
+            await transport.complete(3)
+            await asyncio.gather(first, low, high)
+
+            assert transport.turn_texts == ["first", "high", "low"]
+            stats = scheduler.stats()
+            assert (stats.admitted, stats.in_flight) == (3, 0)
+            assert stats.max_wait_seconds > 0
+
+    asyncio.run(_run())
+
+
+class EagerTurnTransport(ManualTurnTransport):
+    """Sends each turn's events in the same `recv_many()` batch as its turn/start reply."""
+
+    async def send(self, payload: Mapping[str, Any]) -> None:
+        await super().send(payload)
+        if payload.get("method") == "turn/start":
+            await self.complete(len(self.turn_texts))
+
+    async def recv_many(self) -> list[dict[str, Any]]:
+        batch = [await self._incoming.get()]
+        while not self._incoming.empty():
+            batch.append(self._incoming.get_nowait())
+        return batch
+
+
+def test_events_batched_with_the_turn_start_reply_release_the_slot() -> None:
+    async def _run() -> None:
+        transport = EagerTurnTransport()
+        scheduler = TurnScheduler(max_in_flight=1)
+        async with CodexClient(transport, request_timeout=1.0) as client:
+            client.set_turn_scheduler(scheduler)
+            thread = await client.start_thread()
+            stream = thread.chat("first")
+            step = await anext(stream)
+            assert step.text == "ok"
+            # The turn/completed parked with the reply released the slot
+            # before anyone read it from the mailbox.
+            assert scheduler.in_flight == 0
+            second = await thread.chat_once("second")
+            assert second.final_text == "ok"
+            await stream.aclose()
+            assert (scheduler.stats().admitted, scheduler.in_flight) == (2, 0)
+
+    asyncio.run(_run())
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+
+import pytest
+
+from codex_app_server_sdk import CodexClient, StdioWarmPool, StdlibJsonCodec
+from codex_app_server_sdk.errors import CodexProtocolError
+
+_RESPONDER = (
+    "import json, sys\n"
+    "for line in sys.stdin:\n"
+    "    message = json.loads(line)\n"
+    "    if message.get('id') is None:\n"
+    "        continue\n"
+    "    if message['method'] == 'initialize' and sys.argv[1] == 'reject':\n"
+    "        reply = {'id': message['id'], 'error': {'code': -1, 'message': 'nope'}}\n"
+    "    else:\n"
+    "        reply = {'id': message['id'], 'result': {'method': message['method']}}\n"
+    "    sys.stdout.write(json.dumps(reply) + '\\n')\n"
+    "    sys.stdout.flush()\n"
+)
+
+
+def _pool(size: int, mode: str = "accept") -> StdioWarmPool:
+    return StdioWarmPool(
+        size,
+        command=[sys.executable, "-c", _RESPONDER, mode],
+        codec=StdlibJsonCodec(),
+        initialize_timeout=5.0,
+    )
+
+
+def test_leased_client_is_initialized_and_pool_refills() -> None:
+    async def _run() -> None:
+        async with _pool(2) as pool:
+            assert pool.ready == 2
+            client = CodexClient.connect_stdio(warm_pool=pool)
+            assert client._initialized
+            assert pool.ready == 1
+            async with client:
+                # The pool's handshake result is reused; no second initialize.
+                result = await client.initialize()
+                assert result.raw == {"method": "initialize"}
+                assert await client.request("model/list") == {"method": "model/list"}
+                assert client._next_request_id == 2
+            await pool.wait_ready()
+            assert pool.ready == 2
+
+    asyncio.run(_run())
+
+
+def test_empty_pool_falls_back_to_a_cold_transport() -> None:
+    async def _run() -> None:
+        async with _pool(1) as pool:
+            warm = CodexClient.connect_stdio(warm_pool=pool)
+            cold = CodexClient.connect_stdio(warm_pool=pool)
+            assert warm._initialized
+            assert not cold._initialized
+            async with cold:
+                result = await cold.initialize()
+                assert result.raw == {"method": "initialize"}
+            await warm.close()
+
+    asyncio.run(_run())
+
+
+def test_pool_start_reports_handshake_failures() -> None:
+    async def _run() -> None:
+        pool = _pool(1, mode="reject")
+        with pytest.raises(CodexProtocolError, match="nope"):
+            await pool.start()
+        await pool.close()
+        assert pool.ready == 0
+
+    asyncio.run(_run())
+
+
+def test_lease_skips_processes_that_exited_while_idle() -> None:
+    async def _run() -> None:
+        async with _pool(2) as pool:
+            dead, alive = (lease.transport for lease in list(pool._idle))
+            await dead.close()
+            assert not dead.is_alive
+
+            lease = pool.lease_nowait()
+            assert lease is not None
+            assert lease.transport is alive and alive.is_alive
+            assert lease.initialize_result.raw == {"method": "initialize"}
+            await alive.close()
+
+    asyncio.run(_run())